@@ -0,0 +1,92 @@
+"""Benchmark of the compiled scoring artifact against the pickled classifier_model: cold start of a scoring worker
+(a fresh interpreter importing the scorer, loading the model and scoring one row) and per-batch latency on the
+feature engineered test dataset, using the artifacts written by `kedro run`. Tree ensembles are faster to score with
+the compiled model in small batches, as served online; LightGBM's native predictor remains faster on large batches.
+
+Usage:
+    python benchmarks/bench_compiled_model.py --batch-sizes 1 10 100 1000 10000
+"""
+import argparse
+import json
+import os
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from bank_loan_defaulter_prediction.compiled_model import CompiledModel
+from bank_loan_defaulter_prediction.datasets import ArrowIPCDataset
+
+PROJECT_PATH = os.path.join(os.path.dirname(__file__), "..")
+
+# Run in a fresh interpreter: imports, model load and one row scored. The pipeline needs the row as a DataFrame, the
+# compiled model takes plain column lists
+COLD_START_SCRIPTS = {
+    "pickle": (
+        "import json, pickle, pandas as pd; row = pd.DataFrame(json.load(open({row!r}))); "
+        "m = pickle.load(open({pickle!r}, 'rb')); m.predict_scores(row)"
+    ),
+    "compiled": (
+        "import json; from bank_loan_defaulter_prediction.compiled_model import CompiledModel; "
+        "row = json.load(open({row!r})); m = CompiledModel.load({compiled!r}); m.predict_scores(row)"
+    ),
+}
+
+
+def _cold_start_seconds(script: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script], check=True, env={**os.environ, "PYTHONWARNINGS": "ignore"})
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _latency_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=os.path.join(PROJECT_PATH, "data/04_feature/feature_engineered_test_dataset.arrow"))
+    parser.add_argument("--classifier-model", default=os.path.join(PROJECT_PATH, "data/06_models/classifier_model.pickle"))
+    parser.add_argument("--compiled-model", default=os.path.join(PROJECT_PATH, "data/06_models/compiled_model.npz"))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.classifier_model, "rb") as f:
+        classifier_model = pickle.load(f)
+    compiled_model = CompiledModel.load(args.compiled_model)
+    data_df = ArrowIPCDataset(filepath=args.data).load()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({x: data_df[x].iloc[:1].tolist() for x in compiled_model.input_features}, f)
+    paths = {"row": f.name, "pickle": args.classifier_model, "compiled": args.compiled_model}
+    print(f"{'Cold start':>10} | {'Pickle (s)':>10} | {'Compiled (s)':>12} | {'Speedup':>7}")
+    pickle_seconds, compiled_seconds = (
+        _cold_start_seconds(COLD_START_SCRIPTS[x].format(**paths), repeat=5) for x in ("pickle", "compiled")
+    )
+    print(f"{'':>10} | {pickle_seconds:>10.3f} | {compiled_seconds:>12.3f} | {pickle_seconds / compiled_seconds:>6.1f}x")
+    os.unlink(f.name)
+
+    print(f"\n{'Batch size':>10} | {'Pickle (ms)':>11} | {'Compiled (ms)':>13} | {'Speedup':>7} | {'Max diff':>8}")
+    for batch_size in args.batch_sizes:
+        batch_df = data_df.iloc[:batch_size]
+        pickle_ms = _latency_ms(lambda: classifier_model.predict_scores(batch_df), args.repeat)
+        compiled_ms = _latency_ms(lambda: compiled_model.predict_scores(batch_df), args.repeat)
+        max_diff = np.abs(classifier_model.predict_scores(batch_df)[0] - compiled_model.predict_scores(batch_df)[0]).max()
+        print(f"{len(batch_df):>10,} | {pickle_ms:>11.2f} | {compiled_ms:>13.2f} | {pickle_ms / compiled_ms:>6.1f}x | {max_diff:>8.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark of the drift sketches, using the drift baseline and the feature engineered test dataset written by
+`kedro run`: throughput (rows/second) of sketching chunks of increasing total size in one process, the size of the
+sketch (which does not grow with the rows), and sketching the same rows as partitions in worker processes whose
+sketches are merged, checking that the merged counts are those of the single pass.
+
+Usage:
+    python benchmarks/bench_drift_sketch.py --rows 100000 1000000 10000000 --workers 2 4
+"""
+import argparse
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from bank_loan_defaulter_prediction.datasets import ArrowIPCDataset
+from bank_loan_defaulter_prediction.drift import DriftSketch, drift_report
+
+PROJECT_PATH = os.path.join(os.path.dirname(__file__), "..")
+
+
+def _sketch_rows(baseline: DriftSketch, data_df: pd.DataFrame, start: int, stop: int, chunk_size: int) -> DriftSketch:
+    """
+    Sketches the rows `start` to `stop` of the dataset repeated end to end, one chunk at a time as a scoring loop
+    would.
+    """
+    sketch = baseline.empty_like()
+    for chunk_start in range(start, stop, chunk_size):
+        sketch.update(data_df.take(np.arange(chunk_start, min(chunk_start + chunk_size, stop)) % len(data_df)))
+    return sketch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=os.path.join(PROJECT_PATH, "data/06_models/drift_baseline.pickle"))
+    parser.add_argument("--data", default=os.path.join(PROJECT_PATH, "data/04_feature/feature_engineered_test_dataset.arrow"))
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    args = parser.parse_args()
+
+    with open(args.baseline, "rb") as f:
+        baseline = pickle.load(f)
+    data_df = ArrowIPCDataset(filepath=args.data).load()
+
+    print(f"{'Rows':>12} | {'Seconds':>8} | {'Rows/second':>12} | {'Sketch (KB)':>11} | {'Largest PSI':>11}")
+    for n_rows in sorted(args.rows):
+        start = time.perf_counter()
+        sketch = _sketch_rows(baseline, data_df, 0, n_rows, args.chunk_size)
+        elapsed = time.perf_counter() - start
+        size_kb = len(pickle.dumps(sketch)) / 1024
+        largest_psi = drift_report(baseline, sketch)["psi"].max()
+        print(f"{n_rows:>12,} | {elapsed:>8.3f} | {n_rows / elapsed:>12,.0f} | {size_kb:>11.1f} | {largest_psi:>11.4f}")
+
+    # Sketch of the largest number of rows, in a single pass
+    expected = sketch
+    print(f"\n{'Workers':>8} | {'Rows':>12} | {'Seconds':>8} | {'Rows/second':>12} | {'Merged = single pass':>20}")
+    for n_workers in sorted(set(args.workers)):
+        bounds = np.linspace(0, n_rows, n_workers + 1).astype(int)
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            sketches = executor.map(
+                _sketch_rows, [baseline] * n_workers, [data_df] * n_workers, bounds[:-1], bounds[1:],
+                [args.chunk_size] * n_workers
+            )
+            merged = reduce(DriftSketch.merge, sketches)
+        elapsed = time.perf_counter() - start
+        equal = all(np.array_equal(merged.counts[x], expected.counts[x]) for x in merged.columns)
+        print(f"{n_workers:>8} | {n_rows:>12,} | {elapsed:>8.3f} | {n_rows / elapsed:>12,.0f} | {str(equal):>20}")
+
+
+if __name__ == "__main__":
+    main()
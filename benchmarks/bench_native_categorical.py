@@ -0,0 +1,76 @@
+"""Benchmark of the 'one_hot' and 'native_categorical' preprocessing modes of the LightGBM classifier: fit time,
+predict throughput (rows/second), feature matrix width, pickled model size and validation ROC AUC, using the
+feature engineered train dataset written by `kedro run`.
+
+Usage:
+    python benchmarks/bench_native_categorical.py --tile 4
+"""
+import argparse
+import os
+import pickle
+import time
+
+import pandas as pd
+from kedro.config import OmegaConfigLoader
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from bank_loan_defaulter_prediction.datasets import ArrowIPCDataset
+from bank_loan_defaulter_prediction.pipelines.data_science.classifier_model import (
+    ClassifierModel,
+)
+from bank_loan_defaulter_prediction.pipelines.data_science.estimators import (
+    PREPROCESSING_MODES,
+    build_estimator,
+    build_preprocessor,
+    categorical_fit_params,
+)
+from bank_loan_defaulter_prediction.pipelines.data_science.feature_matrix_cache import (
+    to_feature_matrix,
+)
+from bank_loan_defaulter_prediction.settings import CONFIG_LOADER_ARGS
+
+PROJECT_PATH = os.path.join(os.path.dirname(__file__), "..")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=os.path.join(PROJECT_PATH, "data/04_feature/feature_engineered_train_dataset.arrow"))
+    parser.add_argument("--tile", type=int, default=1, help="Repeat the dataset this many times to fit on more rows")
+    args = parser.parse_args()
+
+    config_loader = OmegaConfigLoader(os.path.join(PROJECT_PATH, "conf"), **CONFIG_LOADER_ARGS)
+    parameters = config_loader["parameters"]["model_options"]
+    features, target_var = parameters["features"], parameters["target"]
+    input_features = features["numeric"] + features["categorical"]
+    data_df = ArrowIPCDataset(filepath=args.data, load_args={"columns": input_features + [target_var]}).load()
+    data_df = pd.concat([data_df] * args.tile, ignore_index=True)
+    train_df, validation_df = train_test_split(
+        data_df, stratify=data_df[target_var], test_size=parameters["validation_size"], random_state=parameters["random_state"]
+    )
+
+    print(f"{'Preprocessing':>18} | {'Fit (s)':>8} | {'Predict rows/s':>14} | {'Columns':>7} | {'Model (KB)':>10} | {'ROC AUC':>7}")
+    for preprocessing in PREPROCESSING_MODES:
+        start = time.perf_counter()
+        preprocessor = build_preprocessor(features, preprocessing)
+        X_train = to_feature_matrix(preprocessor.fit_transform(train_df[input_features]))
+        classifier = build_estimator({"class": "lightgbm.LGBMClassifier", "params": {"verbose": -1}}, parameters["random_state"])
+        classifier.fit(X_train, train_df[target_var].to_numpy(), **categorical_fit_params(classifier, features, preprocessing))
+        fit_seconds = time.perf_counter() - start
+        classifier_model = ClassifierModel(
+            Pipeline(steps=[("preprocessor", preprocessor), ("classifier", classifier)]), input_features
+        )
+
+        start = time.perf_counter()
+        pred_proba, _ = classifier_model.predict_scores(validation_df)
+        predict_seconds = time.perf_counter() - start
+        print(
+            f"{preprocessing:>18} | {fit_seconds:>8.2f} | {len(validation_df) / predict_seconds:>14,.0f} | "
+            f"{X_train.shape[1]:>7} | {len(pickle.dumps(classifier_model)) / 1024:>10,.0f} | "
+            f"{roc_auc_score(validation_df[target_var], pred_proba):>7.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
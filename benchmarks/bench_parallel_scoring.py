@@ -0,0 +1,50 @@
+"""Benchmark of batch scoring throughput (rows/second) against the number of worker processes, using the fitted
+`classifier_model` and the feature engineered train dataset written by `kedro run`.
+
+Usage:
+    python benchmarks/bench_parallel_scoring.py --workers 1 2 4 8
+"""
+import argparse
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from bank_loan_defaulter_prediction.datasets import ArrowIPCDataset
+from bank_loan_defaulter_prediction.pipelines.data_science.parallel_scoring import (
+    ParallelScorer,
+)
+
+PROJECT_PATH = os.path.join(os.path.dirname(__file__), "..")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=os.path.join(PROJECT_PATH, "data/06_models/classifier_model.pickle"))
+    parser.add_argument("--data", default=os.path.join(PROJECT_PATH, "data/04_feature/feature_engineered_train_dataset.arrow"))
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count()])
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--tile", type=int, default=1, help="Repeat the dataset this many times to score more rows")
+    args = parser.parse_args()
+
+    with open(args.model, "rb") as f:
+        classifier_model = pickle.load(f)
+    data_df = ArrowIPCDataset(filepath=args.data, load_args={"columns": classifier_model.input_features}).load()
+    data_df = pd.concat([data_df] * args.tile, ignore_index=True)
+
+    expected = classifier_model.predict_proba(data_df)
+    print(f"{'Workers':>8} | {'Seconds':>8} | {'Rows/second':>12}")
+    for n_workers in sorted(set(args.workers)):
+        with ParallelScorer(classifier_model, n_workers=n_workers, batch_size=args.batch_size) as scorer:
+            scorer.predict_proba(data_df.iloc[:args.batch_size * n_workers])  # Warm up the worker processes
+            start = time.perf_counter()
+            actual = scorer.predict_proba(data_df)
+            elapsed = time.perf_counter() - start
+        np.testing.assert_allclose(actual, expected)
+        print(f"{n_workers:>8} | {elapsed:>8.3f} | {len(data_df) / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
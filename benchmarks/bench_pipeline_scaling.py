@@ -0,0 +1,174 @@
+"""Benchmark suite of the `data_processing` and `data_science` pipelines on synthetic raw data (see synthetic_loans.py)
+at increasing scales. Each scale runs in a fresh process, through Kedro's SequentialRunner with in-memory datasets and
+the project's `ProfilingHooks`, which time every node (preprocessing, feature engineering, training, evaluation,
+scoring) and track its memory. Results are written as JSON and can be compared against a baseline run, failing when a
+node got slower than the tolerance.
+
+Usage:
+    python benchmarks/bench_pipeline_scaling.py --rows 100000 1000000 10000000
+    python benchmarks/bench_pipeline_scaling.py --rows 100000 --baseline data/08_reporting/benchmarks/<baseline>.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from kedro.config import OmegaConfigLoader
+from kedro.framework.hooks.manager import _create_hook_manager
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.pipeline import Pipeline
+from kedro.runner import SequentialRunner
+
+from bank_loan_defaulter_prediction.hooks import ProfilingHooks
+from bank_loan_defaulter_prediction.pipelines import data_processing, data_science
+from bank_loan_defaulter_prediction.settings import CONFIG_LOADER_ARGS
+
+# synthetic_loans.py is imported from this script's directory, whatever the working directory and sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic_loans import generate_loans  # noqa: E402
+
+PROJECT_PATH = os.path.join(os.path.dirname(__file__), "..")
+
+# Node metrics kept in the results
+NODE_METRICS = ["wall_seconds", "cpu_seconds", "peak_rss_delta_mb", "input_bytes", "output_bytes"]
+
+
+def _run_scale(n_rows: int, n_test_rows: int, parameters: dict, estimator_spec: dict, skip_nodes: list) -> dict:
+    logging.disable(logging.INFO)  # The table printed by main replaces the per-node logs
+    start = time.perf_counter()
+    train_df = generate_loans(n_rows, random_state=1)
+    test_df = generate_loans(n_test_rows, random_state=2, with_target=False, first_id=10_000_000 + n_rows)
+    generation_seconds = time.perf_counter() - start
+
+    pipeline = data_processing.create_pipeline() + data_science.create_pipeline()
+    pipeline = Pipeline([x for x in pipeline.nodes if x.name not in skip_nodes])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_options = parameters["model_options"]
+        model_options = {**model_options, "feature_cache": {**model_options["feature_cache"], "cache_dir": os.path.join(tmp_dir, "cache")}}
+        catalog = DataCatalog({
+            "train_dataset": MemoryDataset(train_df, copy_mode="assign"),
+            "test_dataset": MemoryDataset(test_df, copy_mode="assign"),
+            "params:model_options.estimator": MemoryDataset(estimator_spec),
+            "params:model_options": MemoryDataset(model_options),
+            "params:data_processing_options": MemoryDataset(parameters["data_processing_options"]),
+        })
+        del train_df, test_df
+
+        hook_manager = _create_hook_manager()
+        hook_manager.register(ProfilingHooks(report_dir=tmp_dir))
+        run_params = {"session_id": f"rows_{n_rows}", "pipeline_name": "data_processing+data_science", "runner": "SequentialRunner"}
+        hook_manager.hook.before_pipeline_run(run_params=run_params, pipeline=pipeline, catalog=catalog)
+        SequentialRunner().run(pipeline, catalog, hook_manager)
+        hook_manager.hook.after_pipeline_run(run_params=run_params, run_result={}, pipeline=pipeline, catalog=catalog)
+        with open(os.path.join(tmp_dir, f"{run_params['session_id']}.json")) as f:
+            report = json.load(f)
+
+    return {
+        "rows": n_rows,
+        "test_rows": n_test_rows,
+        "generation_seconds": generation_seconds,
+        "wall_seconds": report["wall_seconds"],
+        "rss_start_mb": report["rss_start_mb"],
+        # High-water mark of the process (data generation included), in KB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "nodes": {x["node"]: {k: x[k] for k in NODE_METRICS} for x in report["nodes"]},
+    }
+
+
+def _compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    """
+    Prints the wall time of each node against the baseline run at the same scale, returning whether any node got
+    slower than the tolerance.
+    """
+    baseline_runs = {x["rows"]: x for x in baseline["runs"]}
+    regressed = False
+    print(f"\n{'Rows':>11} | {'Node':<35} | {'Baseline (s)':>12} | {'Current (s)':>11} | {'Ratio':>6}")
+    for run in results["runs"]:
+        if run["rows"] not in baseline_runs:
+            continue
+        for node, metrics in run["nodes"].items():
+            baseline_metrics = baseline_runs[run["rows"]]["nodes"].get(node)
+            if baseline_metrics is None:
+                continue
+            ratio = metrics["wall_seconds"] / max(baseline_metrics["wall_seconds"], 1e-9)
+            flag = " <- slower" if ratio > 1 + tolerance else ""
+            regressed |= bool(flag)
+            print(
+                f"{run['rows']:>11,} | {node:<35} | {baseline_metrics['wall_seconds']:>12.2f} | "
+                f"{metrics['wall_seconds']:>11.2f} | {ratio:>6.2f}{flag}"
+            )
+    return regressed
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=PROJECT_PATH, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--test-fraction", type=float, default=0.43, help="Test rows per train row, as in the Kaggle data")
+    parser.add_argument("--skip-nodes", nargs="*", default=["cross_validate_model_node"])
+    parser.add_argument("--output", default=None, help="Results file, by default timestamped in data/08_reporting/benchmarks")
+    parser.add_argument("--baseline", default=None, help="Results file of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Slowdown of a node over the baseline flagged as a regression")
+    args = parser.parse_args()
+
+    config_loader = OmegaConfigLoader(os.path.join(PROJECT_PATH, "conf"), **CONFIG_LOADER_ARGS)
+    parameters = config_loader["parameters"]
+    lightgbm = parameters["model_selection_options"]["candidates"]["lightgbm"]
+    estimator_spec = {"class": lightgbm["class"], "params": lightgbm.get("fixed_params", {})}
+
+    results = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "estimator": estimator_spec,
+        "runs": [],
+    }
+    # A fresh process per scale, so that memory measurements are not affected by the previous ones
+    context = multiprocessing.get_context("spawn")
+    print(f"{'Rows':>11} | {'Node':<35} | {'Wall (s)':>8} | {'CPU (s)':>8} | {'Peak RSS +MB':>12}")
+    for n_rows in args.rows:
+        with context.Pool(1) as pool:
+            run = pool.apply(
+                _run_scale, (n_rows, int(n_rows * args.test_fraction), parameters, estimator_spec, args.skip_nodes)
+            )
+        results["runs"].append(run)
+        for node, metrics in run["nodes"].items():
+            print(
+                f"{n_rows:>11,} | {node:<35} | {metrics['wall_seconds']:>8.2f} | {metrics['cpu_seconds']:>8.2f} | "
+                f"{metrics['peak_rss_delta_mb']:>12,.0f}"
+            )
+        print(f"{n_rows:>11,} | {'Total (peak RSS)':<35} | {run['wall_seconds']:>8.2f} | {'':>8} | {run['peak_rss_mb']:>12,.0f}")
+
+    output = args.output or os.path.join(
+        PROJECT_PATH, "data", "08_reporting", "benchmarks", f"pipeline_scaling_{datetime.now():%Y%m%dT%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if _compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark of reason code throughput (rows/second) using the fitted `classifier_model` and the feature engineered
+test dataset written by `kedro run`: explaining one application at a time (as a per-row loop would), explaining
+whole batches in-process, and sharding batches across worker processes. Exact SHAP values cost grows with the depth
+of the trees, so fewer rows are needed to measure them than decision path attributions.
+
+Usage:
+    python benchmarks/bench_reason_codes.py --method path --rows 1000000 --workers 1 2 4
+    python benchmarks/bench_reason_codes.py --method shap --rows 10000 --per-row-rows 100
+"""
+import argparse
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from bank_loan_defaulter_prediction.datasets import ArrowIPCDataset
+from bank_loan_defaulter_prediction.pipelines.data_science.explanations import (
+    EXPLANATION_METHODS,
+)
+from bank_loan_defaulter_prediction.pipelines.data_science.parallel_scoring import (
+    ParallelScorer,
+)
+
+PROJECT_PATH = os.path.join(os.path.dirname(__file__), "..")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=os.path.join(PROJECT_PATH, "data/06_models/classifier_model.pickle"))
+    parser.add_argument("--data", default=os.path.join(PROJECT_PATH, "data/04_feature/feature_engineered_test_dataset.arrow"))
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows explained, tiling the dataset as needed")
+    parser.add_argument("--per-row-rows", type=int, default=200, help="Rows explained one at a time")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count()])
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--n-reasons", type=int, default=3)
+    parser.add_argument("--method", choices=EXPLANATION_METHODS, default="path")
+    args = parser.parse_args()
+
+    with open(args.model, "rb") as f:
+        classifier_model = pickle.load(f)
+    data_df = ArrowIPCDataset(filepath=args.data, load_args={"columns": classifier_model.input_features}).load()
+    n_tiles = -(-args.rows // len(data_df))
+    data_df = pd.concat([data_df] * n_tiles, ignore_index=True).iloc[:args.rows]
+    print(f"{type(classifier_model.classifier).__name__} ({args.method}), {len(data_df):,} rows, top {args.n_reasons} reasons\n")
+
+    print(f"{'Mode':>12} | {'Rows':>10} | {'Seconds':>8} | {'Rows/second':>12}")
+    per_row_df = data_df.iloc[:args.per_row_rows]
+    classifier_model.reason_codes(per_row_df.iloc[:1], args.n_reasons, args.method)  # Build the cached path tables
+    start = time.perf_counter()
+    for i in range(len(per_row_df)):
+        classifier_model.reason_codes(per_row_df.iloc[i:i + 1], args.n_reasons, args.method)
+    elapsed = time.perf_counter() - start
+    print(f"{'per row':>12} | {len(per_row_df):>10,} | {elapsed:>8.3f} | {len(per_row_df) / elapsed:>12,.0f}")
+
+    expected = None
+    for n_workers in sorted(set(args.workers)):
+        with ParallelScorer(classifier_model, n_workers=n_workers, batch_size=args.batch_size) as scorer:
+            scorer.reason_codes(data_df.iloc[:args.batch_size * n_workers], args.n_reasons, args.method)  # Warm up
+            start = time.perf_counter()
+            positions, contributions = scorer.reason_codes(data_df, args.n_reasons, args.method)
+            elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = contributions
+        np.testing.assert_allclose(contributions, expected)
+        mode = "in-process" if n_workers == 1 else f"{n_workers} workers"
+        print(f"{mode:>12} | {len(data_df):>10,} | {elapsed:>8.3f} | {len(data_df) / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
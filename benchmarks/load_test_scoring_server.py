@@ -0,0 +1,81 @@
+"""Load test of the online scoring service, replaying raw loan applications against a running server over keep-alive
+connections and reporting throughput and latency percentiles.
+
+Usage:
+    python -m bank_loan_defaulter_prediction.serving.server &
+    python benchmarks/load_test_scoring_server.py --concurrency 4 --requests 20000
+"""
+import argparse
+import http.client
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+PROJECT_PATH = os.path.join(os.path.dirname(__file__), "..")
+
+
+def _run_client(url, payloads, endpoint, latencies, errors):
+    parsed = urlparse(url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port)
+    headers = {"Content-Type": "application/json"}
+    for payload in payloads:
+        start = time.perf_counter()
+        connection.request("POST", endpoint, body=payload, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != http.HTTPStatus.OK:
+            errors.append(response.status)
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--data", default=os.path.join(PROJECT_PATH, "data/01_raw/test.csv"))
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of concurrent keep-alive clients")
+    parser.add_argument("--requests", type=int, default=10000, help="Total number of requests")
+    parser.add_argument("--batch-size", type=int, default=1, help="Records per request; above 1 uses /score/batch")
+    args = parser.parse_args()
+
+    records = pd.read_csv(args.data, nrows=max(args.requests * args.batch_size, 1000)).to_dict(orient="records")
+    # NaN is not valid JSON, missing fields are sent as null as a client would
+    records = [{key: None if isinstance(value, float) and np.isnan(value) else value for key, value in record.items()} for record in records]
+    endpoint = "/score" if args.batch_size == 1 else "/score/batch"
+    payloads = []
+    for i in range(args.requests):
+        batch = [records[(i * args.batch_size + j) % len(records)] for j in range(args.batch_size)]
+        payloads.append(json.dumps(batch[0] if args.batch_size == 1 else batch).encode())
+
+    # Warm-up request so that lazy initialisation on the server is not measured
+    _run_client(args.url, payloads[:1], endpoint, [], [])
+
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=_run_client, args=(args.url, payloads[i::args.concurrency], endpoint, latencies, errors))
+        for i in range(args.concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    print(f"Requests: {len(latencies):,} ({len(errors):,} errors) | Concurrency: {args.concurrency} | Batch size: {args.batch_size}")
+    print(f"Throughput: {len(latencies) / elapsed:,.0f} requests/second, {len(latencies) * args.batch_size / elapsed:,.0f} applications/second")
+    print("Latency (ms): " + " | ".join(
+        f"{name} {value:.2f}" for name, value in zip(
+            ["p50", "p90", "p99", "max"], [*np.percentile(latencies_ms, [50, 90, 99]), latencies_ms.max()]
+        )
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Synthetic loan applications with the schema of the raw Kaggle `train.csv`/`test.csv`, for benchmarks and offline
+runs without network access. Columns keep the quirks of the raw data: 'Employment Duration' holds home ownership
+values and 'Home Ownership' the annual income, and 'Loan Title' is free text with inconsistent case, spacing, typos
+and suffixes. 'Loan Status' (about 9% defaulters) depends on the interest rate, grade, debt-to-income ratio and
+delinquencies, so that models have signal to learn. Large files are generated and written chunk by chunk.
+
+Usage:
+    python benchmarks/synthetic_loans.py --rows 1000000 --output data/01_raw/train.csv
+    python benchmarks/synthetic_loans.py --rows 400000 --output data/01_raw/test.csv --no-target
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from bank_loan_defaulter_prediction.pipelines.data_processing.preprocessing_plan import (
+    LOAN_TITLE_ALIASES,
+)
+
+GRADES = list('ABCDEFG')
+BATCHES = [f"BAT{x}" for x in np.random.default_rng(0).integers(1_000_000, 5_000_000, size=41)]
+# Most frequent titles first, as variants are drawn with decreasing probability
+COMMON_TITLES = ['Debt consolidation', 'Credit card refinancing', 'Home improvement', 'Other', 'Major purchase']
+FREE_TEXT_TITLES = ['Personal Loan', 'Loan', 'Wedding', 'Vacation', 'Business', 'Moving and relocation', 'Green loan']
+# Fractions of the applications with a late fee received, and with recoveries (and their collection fees)
+LATE_FEE_RATE = 0.1
+RECOVERY_RATE = 0.3
+
+
+# ============================== Auxiliary Functions ==============================
+def _loan_title_variants(n_variants: int=500, random_state: int=0) -> np.ndarray:
+    """
+    Messy spellings of the loan titles: raw aliases and their normalised titles in random case, with stray spaces,
+    typos or numeric suffixes.
+    """
+    rng = np.random.default_rng(random_state)
+    titles = COMMON_TITLES + sorted(set(LOAN_TITLE_ALIASES) | set(LOAN_TITLE_ALIASES.values())) + FREE_TEXT_TITLES
+    variants = []
+    for i in range(n_variants):
+        title = titles[i % len(titles)]
+        variants.append(str(rng.choice([
+            title, title.lower(), title.title(), f" {title}", f"{title} ", title.upper().replace('DEBT', 'DEPT'),
+            f"{title.title()} {2010 + i % 8}", title.replace(' ', '  '),
+        ])))
+    return np.array(variants, dtype=object)
+
+
+# ============================== Main Functions ==============================
+def generate_loans(n_rows: int, random_state: int=42, with_target: bool=True, first_id: int=10_000_000) -> pd.DataFrame:
+    """
+    Generates `n_rows` raw loan applications, as read by `pd.read_csv` from the Kaggle files. IDs are consecutive
+    from `first_id`.
+    """
+    rng = np.random.default_rng(random_state)
+    grade_idx = rng.choice(len(GRADES), size=n_rows, p=[0.10, 0.28, 0.29, 0.18, 0.09, 0.04, 0.02])
+    interest_rate = np.clip(6 + 3 * grade_idx + rng.normal(0, 2.5, n_rows), 5.32, 27.18)
+    debit_to_income = rng.uniform(0.67, 39.63, n_rows)
+    delinquencies = rng.poisson(0.3, n_rows)
+    loan_amount = rng.integers(1014, 35001, n_rows)
+    funded_amount = np.minimum(loan_amount, rng.integers(1014, 35001, n_rows))
+    # Title popularity follows a long tail
+    title_variants = _loan_title_variants()
+    title_weights = 1 / np.arange(1, len(title_variants) + 1) ** 1.1
+
+    data_df = pd.DataFrame({
+        'ID': np.arange(first_id, first_id + n_rows),
+        'Loan Amount': loan_amount,
+        'Funded Amount': funded_amount,
+        'Funded Amount Investor': funded_amount * rng.uniform(0.6, 1.0, n_rows),
+        'Term': rng.choice([36, 58, 59], size=n_rows, p=[0.1, 0.2, 0.7]),
+        'Batch Enrolled': rng.choice(BATCHES, size=n_rows),
+        'Interest Rate': interest_rate,
+        'Grade': np.array(GRADES)[grade_idx],
+        'Sub Grade': np.char.add(np.array(GRADES)[grade_idx], rng.integers(1, 6, n_rows).astype(str)).astype(object),
+        # Mislabelled in the raw data: holds home ownership values
+        'Employment Duration': rng.choice(['MORTGAGE', 'RENT', 'OWN'], size=n_rows, p=[0.48, 0.42, 0.10]),
+        # Mislabelled in the raw data: holds the annual income
+        'Home Ownership': rng.lognormal(11.2, 0.5, n_rows),
+        'Verification Status': rng.choice(['Not Verified', 'Source Verified', 'Verified'], size=n_rows),
+        'Payment Plan': 'n',
+        'Loan Title': rng.choice(title_variants, size=n_rows, p=title_weights / title_weights.sum()),
+        'Debit to Income': debit_to_income,
+        'Delinquency - two years': delinquencies,
+        'Inquires - six months': rng.integers(0, 6, n_rows),
+        'Open Account': rng.integers(2, 38, n_rows),
+        'Public Record': rng.choice(5, size=n_rows, p=[0.9, 0.07, 0.02, 0.007, 0.003]),
+        'Revolving Balance': rng.integers(0, 116934, n_rows),
+        'Revolving Utilities': rng.uniform(0, 100, n_rows),
+        'Total Accounts': rng.integers(4, 73, n_rows),
+        'Initial List Status': rng.choice(['w', 'f'], size=n_rows, p=[0.54, 0.46]),
+        'Total Received Interest': rng.exponential(2000, n_rows),
+        'Total Received Late Fee': rng.exponential(0.5, n_rows) * (rng.random(n_rows) < LATE_FEE_RATE),
+        'Recoveries': rng.exponential(60, n_rows) * (rng.random(n_rows) < RECOVERY_RATE),
+        'Collection Recovery Fee': rng.exponential(2, n_rows) * (rng.random(n_rows) < RECOVERY_RATE),
+        'Collection 12 months Medical': rng.choice(2, size=n_rows, p=[0.98, 0.02]),
+        'Application Type': rng.choice(['INDIVIDUAL', 'JOINT'], size=n_rows, p=[0.998, 0.002]),
+        'Last week Pay': rng.integers(0, 162, n_rows),
+        'Accounts Delinquent': 0,
+        'Total Collection Amount': rng.integers(1, 16422, n_rows),
+        'Total Current Balance': rng.integers(617, 1177413, n_rows),
+        'Total Revolving Credit Limit': rng.integers(1000, 201170, n_rows),
+    })
+    if with_target:
+        logit = -2.6 + 0.12 * (interest_rate - 12) + 0.02 * (debit_to_income - 20) + 0.3 * delinquencies
+        data_df['Loan Status'] = (rng.random(n_rows) < 1 / (1 + np.exp(-logit))).astype(np.int64)
+    return data_df
+
+
+def write_loans_csv(filepath: str, n_rows: int, chunk_size: int=1_000_000, random_state: int=42, with_target: bool=True):
+    """
+    Writes `n_rows` raw loan applications to a CSV file, generating at most `chunk_size` rows at a time (each chunk
+    seeded from `random_state` and its position).
+    """
+    seeds = np.random.SeedSequence(random_state).spawn((n_rows + chunk_size - 1) // chunk_size)
+    for i, seed in enumerate(seeds):
+        start = i * chunk_size
+        chunk_df = generate_loans(
+            min(chunk_size, n_rows - start), random_state=np.random.default_rng(seed), with_target=with_target,
+            first_id=10_000_000 + start
+        )
+        chunk_df.to_csv(filepath, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--output", required=True, help="CSV file to write")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--random-state", type=int, default=42)
+    parser.add_argument("--no-target", action="store_true", help="Omit 'Loan Status', as in test.csv")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_loans_csv(args.output, args.rows, args.chunk_size, args.random_state, with_target=not args.no_target)
+    print(f"Wrote {args.rows:,} rows to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Standalone scoring artifact compiled from the fitted classifier_model (see
+`pipelines/data_science/model_compiler.py`). It only depends on NumPy, so that scoring workers load and evaluate it
+without importing pandas, sklearn or LightGBM."""
+import json
+import math
+from typing import Any, Dict, Mapping, Sequence, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# `missing_type` of the tree splits, following LightGBM: values sent to the default child are NaNs ('nan'), zeros
+# and NaNs ('zero'), or none ('none', NaNs then being compared as zeros)
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+_ZERO_THRESHOLD = 1e-35  # Values LightGBM considers zero
+
+# Elements of the (rows x trees) arrays evaluated at once, to bound the memory of large batches
+_MAX_BLOCK_SIZE = 2 ** 22
+
+
+# ============================== Auxiliary Functions ==============================
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _lookup(values: Sequence, index: Dict[Any, int], missing: int) -> np.ndarray:
+    """
+    Positions of the values in `index` (-1 for unknown values, `missing` for missing ones). pandas Categorical
+    columns are looked up once per category rather than once per value.
+    """
+    categories = getattr(getattr(values, 'cat', None), 'categories', None)
+    if categories is not None:
+        # Code -1 (missing) selects the last entry
+        table = np.array([index.get(x, -1) for x in categories] + [missing], dtype=np.int64)
+        return table[np.asarray(values.cat.codes)]
+    return np.array([missing if _is_missing(x) else index.get(x, -1) for x in values], dtype=np.int64)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-x))
+
+
+# ============================== Main Classes ==============================
+class CompiledModel:
+    """
+    The fitted preprocessing and classifier of a ClassifierModel reduced to plain arrays: the scaler statistics, the
+    category-to-column tables and either the tree ensemble, flattened into contiguous node arrays, or the
+    coefficients of a linear model. Batches are scored with vectorised NumPy operations, matching the pipeline's
+    `predict_proba` to within float tolerance.
+
+    Trees are evaluated for all rows and trees at once, one level per step, each step only gathering the split
+    features and thresholds of the (row, tree) pairs that have not reached a leaf (leaves point to themselves).
+
+    Attributes:
+        metadata (dict): Features, categories, model kind, decision threshold and classes.
+        arrays (dict): Scaler statistics, and the tree node arrays or linear coefficients.
+        input_features (list): Columns the model is scored on, as for ClassifierModel.
+        threshold (float): Probability above which an application is labelled as the positive class.
+        classes_ (np.ndarray): Class labels, the positive class last.
+    """
+
+    def __init__(self, metadata: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        if metadata.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format {metadata.get('format_version')}, expected {FORMAT_VERSION}.")
+        self.metadata = metadata
+        self.arrays = arrays
+        self.input_features = metadata['numeric_features'] + metadata['categorical_features']
+        self.threshold = metadata['threshold']
+        self.classes_ = np.asarray(metadata['classes'])
+        self._category_index = [{category: i for i, category in enumerate(x)} for x in metadata['categories']]
+        if metadata['categorical_encoding'] == 'one_hot':
+            self._missing_index = [index.get(metadata['fill_value'], -1) for index in self._category_index]
+        else:
+            self._missing_index = [-1] * len(self._category_index)
+        if metadata['model'] == 'trees':
+            self._prepare_trees()
+
+    @property
+    def n_features(self) -> int:
+        return self.metadata['n_features']
+
+    # ------------------------------ Persistence ------------------------------
+    def save(self, filepath: str):
+        """
+        Saves the model as an uncompressed `.npz` file, its metadata as JSON.
+        """
+        with open(filepath, 'wb') as f:
+            np.savez(f, metadata=np.array(json.dumps(self.metadata)), **self.arrays)
+
+    @classmethod
+    def load(cls, filepath: str) -> "CompiledModel":
+        with np.load(filepath, allow_pickle=False) as f:
+            arrays = {name: f[name] for name in f.files}
+        return cls(json.loads(str(arrays.pop('metadata'))), arrays)
+
+    # ------------------------------ Encoding ------------------------------
+    def encode(self, data: Mapping[str, Sequence]) -> np.ndarray:
+        """
+        Encodes the feature engineered columns (a DataFrame or any mapping of column names to values) into the
+        float32 feature matrix the classifier was fitted on.
+        """
+        numeric_features, categorical_features = self.metadata['numeric_features'], self.metadata['categorical_features']
+        n_rows = len(data[self.input_features[0]])
+        X = np.zeros((n_rows, self.n_features), dtype=np.float32)
+        for i, feature in enumerate(numeric_features):
+            X[:, i] = (np.asarray(data[feature], dtype=np.float64) - self.arrays['mean'][i]) / self.arrays['scale'][i]
+
+        offset = len(numeric_features)
+        rows = np.arange(n_rows)
+        for i, feature in enumerate(categorical_features):
+            positions = _lookup(data[feature], self._category_index[i], self._missing_index[i])
+            if self.metadata['categorical_encoding'] == 'codes':
+                # One column per feature holding the category code, -1 when missing or unknown
+                X[:, offset] = positions
+                offset += 1
+            else:
+                # One column per category, left as zeros for unknown categories
+                known = positions >= 0
+                X[rows[known], offset + positions[known]] = 1
+                offset += len(self._category_index[i])
+        return X
+
+    # ------------------------------ Scoring ------------------------------
+    def _prepare_trees(self):
+        """
+        Derives the arrays of the traversal from the stored node arrays: child pairs, leaf flags and the direction of
+        NaNs at each split.
+        """
+        a = self.arrays
+        self._children = np.column_stack([a['left'], a['right']]).ravel()  # Left and right child of node i at 2i, 2i + 1
+        self._is_leaf = a['left'] == np.arange(len(a['left']))
+        # NaNs go to the default child, unless missing values have none and NaNs are compared as zeros (LightGBM)
+        self._nan_left = np.where(a['missing_type'] == MISSING_NONE, 0 <= a['threshold'], a['default_left'])
+        self._zero_missing = a['missing_type'] == MISSING_ZERO
+        self._has_zero_missing = bool(self._zero_missing.any())
+        self._has_categorical = bool((a['categorical_split'] >= 0).any())
+
+    def _evaluate_trees(self, X: np.ndarray) -> np.ndarray:
+        """
+        Leaf values reached by each row in each tree, as a (rows x trees) array. Only the (row, tree) pairs that
+        have not reached a leaf yet are advanced at each level.
+        """
+        a = self.arrays
+        n_rows, n_trees, n_features = len(X), len(a['roots']), X.shape[1]
+        n_categories = a['categorical_left'].shape[1] - 1  # The last column is for codes that are never listed
+        leaf_values = np.empty(n_rows * n_trees)
+        block_rows = max(1, _MAX_BLOCK_SIZE // max(n_trees, 1))
+        for start in range(0, n_rows, block_rows):
+            X_block = np.ascontiguousarray(X[start:start + block_rows]).ravel()
+            has_nan = bool(np.isnan(X_block).any())
+            nodes = np.tile(a['roots'], len(X_block) // n_features)
+            active = np.flatnonzero(~self._is_leaf[nodes])
+            while active.size:
+                node = nodes[active]
+                values = X_block[(active // n_trees) * n_features + a['feature'][node]]
+                go_right = values > a['threshold'][node]
+                if has_nan:
+                    is_nan = np.isnan(values)
+                    go_right[is_nan] = ~self._nan_left[node[is_nan]]
+                if self._has_zero_missing:
+                    is_zero = self._zero_missing[node] & (np.abs(values) <= _ZERO_THRESHOLD)
+                    go_right[is_zero] = ~a['default_left'][node[is_zero]]
+                if self._has_categorical:
+                    # Category splits send the listed codes left, and NaN, negative or unseen codes right
+                    split = a['categorical_split'][node]
+                    is_categorical = split >= 0
+                    codes = values[is_categorical]
+                    codes = np.where(np.isnan(codes) | (codes < 0) | (codes >= n_categories), n_categories, codes)
+                    go_right[is_categorical] = ~a['categorical_left'][split[is_categorical], codes.astype(np.int64)]
+                child = self._children[2 * node + go_right]
+                nodes[active] = child
+                active = active[~self._is_leaf[child]]
+            leaf_values[start * n_trees:start * n_trees + len(nodes)] = a['value'][nodes]
+        return leaf_values.reshape(n_rows, n_trees)
+
+    def score_matrix(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the positive class probabilities and the thresholded labels of an encoded feature matrix.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if self.metadata['model'] == 'linear':
+            raw_score = X.astype(np.float64) @ self.arrays['coef'] + self.arrays['intercept']
+        else:
+            leaf_values = self._evaluate_trees(X)
+            raw_score = leaf_values.mean(axis=1) if self.metadata['average_trees'] else leaf_values.sum(axis=1)
+        pred_proba = _sigmoid(self.metadata['sigmoid_scale'] * raw_score) if self.metadata['link'] == 'sigmoid' else raw_score
+        pred = self.classes_[(pred_proba > self.threshold).astype(int)]
+        return pred_proba, pred
+
+    def predict_scores(self, data: Mapping[str, Sequence]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the positive class probabilities and the thresholded labels of the feature engineered columns.
+        """
+        return self.score_matrix(self.encode(data))
+
+    def predict_proba(self, data: Mapping[str, Sequence]) -> np.ndarray:
+        pred_proba = self.predict_scores(data)[0]
+        return np.column_stack([1 - pred_proba, pred_proba])
+
+    def predict(self, data: Mapping[str, Sequence]) -> np.ndarray:
+        return self.predict_scores(data)[1]
@@ -0,0 +1,7 @@
+"""Project-specific Kedro datasets"""
+
+from .arrow_ipc_dataset import ArrowIPCDataset
+from .compiled_model_dataset import CompiledModelDataset
+from .raw_csv_dataset import RawCSVDataset
+
+__all__ = ["ArrowIPCDataset", "CompiledModelDataset", "RawCSVDataset"]
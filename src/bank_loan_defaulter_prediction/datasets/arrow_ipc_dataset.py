@@ -0,0 +1,51 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pandas as pd
+import pyarrow as pa
+from kedro.io import AbstractDataset
+
+
+class ArrowIPCDataset(AbstractDataset[pd.DataFrame, pd.DataFrame]):
+    """
+    Saves a DataFrame as an uncompressed Arrow IPC file on the local filesystem and memory-maps it on load. Numeric
+    columns without missing values are handed to pandas as zero-copy views over the mapped file, and columns that are
+    not requested are never read from disk.
+
+    Example catalog entry:
+
+        feature_engineered_train_dataset:
+          type: bank_loan_defaulter_prediction.datasets.ArrowIPCDataset
+          filepath: data/04_feature/feature_engineered_train_dataset.arrow
+          load_args:
+            columns: [ID, LOAN_STATUS, LOAN_AMOUNT]
+
+    Attributes:
+        filepath (Path): Path of the Arrow IPC file.
+        columns (list): Columns to load. Defaults to all columns.
+    """
+
+    def __init__(self, filepath: str, load_args: Dict[str, Any]=None, metadata: Dict[str, Any]=None):
+        self.filepath = Path(filepath)
+        self.columns: List[str] = (load_args or {}).get('columns')
+        self.metadata = metadata
+
+    def _load(self) -> pd.DataFrame:
+        with pa.memory_map(str(self.filepath), 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        if self.columns is not None:
+            table = table.select(self.columns)
+        # `split_blocks` keeps each column in its own block, so the mapped buffers are not consolidated into copies
+        return table.to_pandas(split_blocks=True)
+
+    def _save(self, data: pd.DataFrame) -> None:
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        with pa.OSFile(str(self.filepath), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    def _exists(self) -> bool:
+        return self.filepath.exists()
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"filepath": str(self.filepath), "columns": self.columns}
@@ -0,0 +1,39 @@
+from pathlib import Path
+from typing import Any, Dict
+
+from kedro.io import AbstractDataset
+
+from ..compiled_model import CompiledModel
+
+
+class CompiledModelDataset(AbstractDataset[CompiledModel, CompiledModel]):
+    """
+    Saves a CompiledModel as an `.npz` file of its arrays and JSON metadata on the local filesystem. Loading it only
+    requires NumPy, and never unpickles Python objects.
+
+    Example catalog entry:
+
+        compiled_model:
+          type: bank_loan_defaulter_prediction.datasets.CompiledModelDataset
+          filepath: data/06_models/compiled_model.npz
+
+    Attributes:
+        filepath (Path): Path of the `.npz` file.
+    """
+
+    def __init__(self, filepath: str, metadata: Dict[str, Any]=None):
+        self.filepath = Path(filepath)
+        self.metadata = metadata
+
+    def _load(self) -> CompiledModel:
+        return CompiledModel.load(str(self.filepath))
+
+    def _save(self, data: CompiledModel) -> None:
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        data.save(str(self.filepath))
+
+    def _exists(self) -> bool:
+        return self.filepath.exists()
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"filepath": str(self.filepath)}
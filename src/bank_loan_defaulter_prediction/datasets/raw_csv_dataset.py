@@ -0,0 +1,44 @@
+from pathlib import Path
+from typing import Any, Dict
+
+import pandas as pd
+from kedro.io import AbstractDataset
+
+from ..raw_data import read_raw_csv
+
+
+class RawCSVDataset(AbstractDataset[pd.DataFrame, pd.DataFrame]):
+    """
+    Loads a raw Kaggle CSV file with the explicit raw schema (see raw_data.py), from a Parquet copy written next to it
+    on the first load and reused until the CSV changes. Saving writes the CSV, which invalidates the copy.
+
+    Example catalog entry:
+
+        train_dataset:
+          type: bank_loan_defaulter_prediction.datasets.RawCSVDataset
+          filepath: data/01_raw/train.csv
+          load_args:
+            cache: true
+
+    Attributes:
+        filepath (Path): Path of the CSV file.
+        cache (bool): Whether the Parquet copy is used and written. Defaults to True.
+    """
+
+    def __init__(self, filepath: str, load_args: Dict[str, Any]=None, metadata: Dict[str, Any]=None):
+        self.filepath = Path(filepath)
+        self.cache: bool = (load_args or {}).get('cache', True)
+        self.metadata = metadata
+
+    def _load(self) -> pd.DataFrame:
+        return read_raw_csv(str(self.filepath), cache=self.cache)
+
+    def _save(self, data: pd.DataFrame) -> None:
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        data.to_csv(self.filepath, index=False)
+
+    def _exists(self) -> bool:
+        return self.filepath.exists()
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"filepath": str(self.filepath), "cache": self.cache}
@@ -0,0 +1,178 @@
+"""Drift monitoring of scored applications against the training distribution, with fixed-size sketches that are
+updated chunk by chunk and merged across workers (see the `monitoring` and `batch_scoring` pipelines). It only depends
+on NumPy and pandas, so that the fast-start scoring CLI can monitor the files it scores."""
+import logging
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+_PSI_EPSILON = 1e-4  # Floor of the bin proportions in the PSI, whose log ratio is undefined for empty bins
+
+
+# ============================== Auxiliary Functions ==============================
+def _numeric_bins(values: pd.Series, edges: np.ndarray) -> np.ndarray:
+    """
+    Bin of each value: `i` for values in (edges[i - 1], edges[i]], `len(edges)` above the last edge and
+    `len(edges) + 1` for missing values.
+    """
+    values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.where(np.isnan(values), len(edges) + 1, np.searchsorted(edges, values, side='left'))
+
+
+def _categorical_bins(values: pd.Series, categories: np.ndarray) -> np.ndarray:
+    """
+    Bin of each value: its position in `categories`, `len(categories)` for unseen categories and
+    `len(categories) + 1` for missing values.
+    """
+    codes = np.asarray(pd.Categorical(values, categories=categories).codes, dtype=np.int64)
+    return np.where(codes >= 0, codes, np.where(values.isna().to_numpy(), len(categories) + 1, len(categories)))
+
+
+def _proportions(counts: np.ndarray) -> np.ndarray:
+    total = counts.sum()
+    return counts / total if total > 0 else np.full(len(counts), np.nan)
+
+
+def _psi(baseline_counts: np.ndarray, counts: np.ndarray) -> float:
+    expected = np.maximum(_proportions(baseline_counts), _PSI_EPSILON)
+    actual = np.maximum(_proportions(counts), _PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def _psi_groups(baseline_counts: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Groups consecutive percentile bins into `n_groups` bins of about equal baseline mass (e.g. deciles), as the PSI
+    is usually computed over.
+    """
+    cumulative_before = np.cumsum(baseline_counts) - baseline_counts
+    return np.minimum((cumulative_before / max(baseline_counts.sum(), 1) * n_groups).astype(int), n_groups - 1)
+
+
+# ============================== Main Classes ==============================
+class DriftSketch:
+    """
+    Fixed-size summary of the distribution of each monitored column. Numerical columns are counted over the bins
+    between percentiles of the baseline data (an equi-depth histogram, i.e. a quantile sketch whose quantiles are
+    fixed by the baseline), categorical columns over the baseline categories, with a bucket for unseen categories.
+    Both have a bucket for missing values.
+
+    The bins are fixed when the baseline is fitted, so a sketch holds the same number of counts however many rows it
+    has seen, and sketches sharing the baseline bins (`empty_like`) are merged exactly by adding their counts, e.g.
+    the sketches of the chunks of a file, or of partitions scored by separate workers.
+
+    Attributes:
+        edges (dict): Upper bounds of the bins of each numerical column, the last bin being unbounded.
+        categories (dict): Categories of each categorical column.
+        counts (dict): Number of values of each column in each bin, the missing value bucket last.
+    """
+
+    def __init__(
+        self, edges: Dict[str, np.ndarray], categories: Dict[str, np.ndarray], counts: Dict[str, np.ndarray]=None
+    ):
+        self.edges = edges
+        self.categories = categories
+        if counts is None:
+            counts = {column: np.zeros(len(x) + 2, dtype=np.int64) for column, x in {**edges, **categories}.items()}
+        self.counts = counts
+
+    @classmethod
+    def fit(
+        cls, data_df: pd.DataFrame, numeric_columns: Sequence[str], categorical_columns: Sequence[str],
+        n_quantiles: int=100
+    ) -> "DriftSketch":
+        """
+        Sketches the baseline data, binning the numerical columns between their `n_quantiles`-quantiles (e.g.
+        percentiles) and the categorical columns over their observed categories.
+        """
+        levels = np.linspace(0, 1, n_quantiles + 1)[1:-1]
+        edges = {}
+        for column in numeric_columns:
+            values = data_df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            # Quantiles taken among the values themselves, so that the bins of discrete columns end on their values
+            edges[column] = np.unique(np.quantile(values, levels, method='inverted_cdf')) if len(values) else np.empty(0)
+        categories = {column: np.sort(pd.unique(data_df[column].dropna().to_numpy())) for column in categorical_columns}
+        return cls(edges, categories).update(data_df)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.counts)
+
+    def empty_like(self) -> "DriftSketch":
+        return DriftSketch(self.edges, self.categories)
+
+    def update(self, data_df: pd.DataFrame) -> "DriftSketch":
+        """
+        Adds the values of a chunk of rows to the counts, in place. Only the monitored columns present in the chunk
+        are counted, so that features and predictions can be added separately.
+        """
+        for column in data_df.columns.intersection(self.columns):
+            if column in self.edges:
+                bins = _numeric_bins(data_df[column], self.edges[column])
+            else:
+                bins = _categorical_bins(data_df[column], self.categories[column])
+            self.counts[column] += np.bincount(bins, minlength=len(self.counts[column]))
+        return self
+
+    def merge(self, other: "DriftSketch") -> "DriftSketch":
+        """
+        Returns the sketch of the rows of both sketches, which must share the same baseline bins.
+        """
+        bins, other_bins = {**self.edges, **self.categories}, {**other.edges, **other.categories}
+        if bins.keys() != other_bins.keys() or not all(np.array_equal(x, other_bins[k]) for k, x in bins.items()):
+            raise ValueError("Only sketches sharing the same baseline bins can be merged.")
+        return DriftSketch(self.edges, self.categories, {x: self.counts[x] + other.counts[x] for x in self.columns})
+
+
+# ============================== Main Functions ==============================
+def drift_report(baseline: DriftSketch, sketch: DriftSketch, psi_bins: int=10, psi_threshold: float=0.25) -> pd.DataFrame:
+    """
+    Compares each column of a sketch with the baseline it was binned from. The population stability index (PSI) is
+    computed over `psi_bins` bins of equal baseline mass for numerical columns (the missing value bucket apart), and
+    over the categories for categorical ones. The Kolmogorov-Smirnov statistic (KS) of numerical columns is the
+    largest difference between the cumulative distributions of their non-missing values, evaluated at the baseline
+    quantiles the bins end on. Columns whose PSI exceeds `psi_threshold` are flagged as drifting.
+    """
+    rows = []
+    for column in sketch.columns:
+        baseline_counts, counts = baseline.counts[column], sketch.counts[column]
+        row = {
+            'column': column,
+            'type': 'numeric' if column in sketch.edges else 'categorical',
+            'baseline_rows': int(baseline_counts.sum()),
+            'rows': int(counts.sum()),
+            'baseline_missing_rate': _proportions(baseline_counts)[-1],
+            'missing_rate': _proportions(counts)[-1],
+            'psi': np.nan,
+            'ks': np.nan,
+        }
+        if row['rows'] > 0 and row['baseline_rows'] > 0:
+            if column in sketch.edges:
+                groups = np.append(_psi_groups(baseline_counts[:-1], psi_bins), psi_bins)
+                row['psi'] = _psi(np.bincount(groups, baseline_counts), np.bincount(groups, counts))
+                row['ks'] = float(np.abs(
+                    np.cumsum(_proportions(baseline_counts[:-1])) - np.cumsum(_proportions(counts[:-1]))
+                ).max(initial=0))
+            else:
+                row['psi'] = _psi(baseline_counts, counts)
+        rows.append(row)
+    report_df = pd.DataFrame(rows, columns=[
+        'column', 'type', 'baseline_rows', 'rows', 'baseline_missing_rate', 'missing_rate', 'psi', 'ks'
+    ])
+    report_df['drift'] = report_df['psi'] > psi_threshold
+    return report_df
+
+
+def log_drift(report_df: pd.DataFrame, label: str):
+    """
+    Logs the largest PSI and KS of a drift report, and warns about the drifting columns.
+    """
+    _logger = logging.getLogger(__name__)
+    if report_df['psi'].notna().any():
+        worst = report_df.loc[report_df['psi'].idxmax()]
+        _logger.info(
+            f"{label}: largest PSI {worst['psi']:.3f} ({worst['column']}), largest KS {report_df['ks'].max():.3f}"
+        )
+    if report_df['drift'].any():
+        _logger.warning(f"{label}: drift detected on {', '.join(report_df.loc[report_df['drift'], 'column'])}")
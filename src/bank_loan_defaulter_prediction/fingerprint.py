@@ -0,0 +1,25 @@
+"""Content hashing of datasets, shared by the caches of the project."""
+import hashlib
+import pickle
+from typing import Any
+
+import pandas as pd
+
+
+def fingerprint_data(data: Any) -> str:
+    """
+    Content hash of a dataset or node input. DataFrames are hashed row-wise by pandas (together with their columns,
+    dtypes and categories), anything else through its pickled bytes.
+    """
+    digest = hashlib.sha256()
+    if isinstance(data, pd.DataFrame):
+        digest.update(repr(list(zip(data.columns, map(str, data.dtypes)))).encode())
+        for dtype in data.dtypes:
+            if isinstance(dtype, pd.CategoricalDtype):
+                # The same values under other categories (e.g. of a refitted preprocessing plan) encode differently
+                categories = (dtype.categories.tolist(), dtype.ordered)
+                digest.update(pickle.dumps(categories, protocol=pickle.HIGHEST_PROTOCOL))
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    else:
+        digest.update(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
@@ -0,0 +1,466 @@
+"""Project hooks."""
+import ast
+import hashlib
+import importlib.util
+import inspect
+import json
+import logging
+import os
+import pickle
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import psutil
+from kedro.framework.hooks import hook_impl
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+from scipy import sparse
+
+from .fingerprint import fingerprint_data
+
+logger = logging.getLogger(__name__)
+
+
+# ============================== Auxiliary Functions ==============================
+def _module_path(module_name: str, package_dir: Path) -> Optional[Path]:
+    """
+    Source file of a module of the top-level package stored in `package_dir`, None if it is not a module file (e.g.
+    a name imported from a module rather than a submodule).
+    """
+    base = package_dir.joinpath(*module_name.split('.')[1:])
+    for filepath in (base.with_suffix('.py'), base / '__init__.py'):
+        if filepath.is_file():
+            return filepath
+    return None
+
+
+def _walk_statements(node: ast.AST, skip_functions: bool):
+    for child in ast.iter_child_nodes(node):
+        if skip_functions and isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            continue
+        yield child
+        yield from _walk_statements(child, skip_functions)
+
+
+def _imported_modules(module_name: str, filepath: Path, import_time_only: bool=False) -> set:
+    """
+    Names of the modules imported in a source file, relative imports resolved. Lazy imports within functions are
+    included unless `import_time_only`. `from package import name` yields both `package` and `package.name`, as the
+    name may be a submodule.
+    """
+    package = module_name if filepath.name == '__init__.py' else module_name.rpartition('.')[0]
+    names = set()
+    for node in _walk_statements(ast.parse(filepath.read_bytes()), skip_functions=import_time_only):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = importlib.util.resolve_name('.' * node.level + (node.module or ''), package) if node.level else node.module
+            names.add(base)
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    return names
+
+
+@lru_cache(maxsize=None)
+def _fingerprint_module(module_name: str) -> str:
+    """
+    Hash of the source of a module and of the modules of its top-level package it imports, transitively. The parent
+    packages of each module are included with what they import when imported (e.g. not the pipeline a pipeline
+    package builds lazily), as importing the module runs them.
+    """
+    top_level = sys.modules[module_name.split('.')[0]]
+    if not hasattr(top_level, '__path__'):
+        return hashlib.sha256(Path(sys.modules[module_name].__file__).read_bytes()).hexdigest()
+    package_dir = Path(top_level.__file__).parent
+    # Module name -> (source file, whether only its import-time imports were followed)
+    sources = {}
+    pending = [(module_name, False)]
+    while pending:
+        name, import_time_only = pending.pop()
+        if name.split('.')[0] != top_level.__name__ or (name in sources and (import_time_only or not sources[name][1])):
+            continue
+        filepath = _module_path(name, package_dir)
+        sources[name] = (filepath, import_time_only)
+        if filepath is not None:
+            pending.extend(('.'.join(name.split('.')[:i]), True) for i in range(1, name.count('.') + 1))
+            pending.extend((x, False) for x in sorted(_imported_modules(name, filepath, import_time_only)))
+
+    digest = hashlib.sha256()
+    for name, (filepath, _) in sorted(sources.items()):
+        if filepath is not None:
+            digest.update(name.encode())
+            digest.update(filepath.read_bytes())
+    return digest.hexdigest()
+
+
+def _fingerprint_source(func: Callable) -> str:
+    """
+    Hash of the source of the module defining the node function and of the modules of its package it imports,
+    transitively, so that changes to any module the node relies on (compiled_model.py, drift.py, ...) invalidate its
+    cache, while changes to unrelated modules (e.g. the reporting plots for the data science nodes) do not.
+    """
+    return _fingerprint_module(inspect.unwrap(func).__module__)
+
+
+def _data_size(data: Any) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Number of rows and in-memory bytes of a dataset, None when unknown (e.g. for fitted models).
+    """
+    if isinstance(data, pd.DataFrame):
+        return len(data), int(data.memory_usage(index=True, deep=True).sum())
+    if isinstance(data, pd.Series):
+        return len(data), int(data.memory_usage(index=True, deep=True))
+    if isinstance(data, np.ndarray):
+        return (data.shape[0] if data.ndim else None), data.nbytes
+    if sparse.issparse(data):
+        data = data.tocsr()
+        return data.shape[0], data.data.nbytes + data.indices.nbytes + data.indptr.nbytes
+    return None, None
+
+
+def _is_parameters(dataset_name: str) -> bool:
+    return dataset_name == 'parameters' or dataset_name.startswith('params:')
+
+
+def _sizes(datasets: Dict[str, Any]) -> Dict[str, Dict]:
+    sizes = {}
+    for name, data in datasets.items():
+        if not _is_parameters(name):
+            rows, n_bytes = _data_size(data)
+            sizes[name] = {'rows': rows, 'bytes': n_bytes}
+    return sizes
+
+
+def _folded_stack(frame) -> str:
+    """
+    Stack of the frame in the 'folded' format of flamegraph tools: outermost call first, calls separated by ';'.
+    Calls are identified by their function (and the line it is defined at) so that samples aggregate per function.
+    """
+    calls = []
+    while frame is not None:
+        code = frame.f_code
+        calls.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(calls))
+
+
+class _ResourceSampler(threading.Thread):
+    """
+    Background thread sampling, at a fixed interval, the resident memory of the process (keeping its peak during each
+    running node) and the call stack of the threads running nodes that are profiled.
+    """
+
+    def __init__(self, interval_ms: float):
+        super().__init__(name='resource-sampler', daemon=True)
+        self.interval = interval_ms / 1000
+        self.process = psutil.Process()
+        self.peak_rss: Dict[str, int] = {}
+        self.stacks: Dict[str, Counter] = {}
+        self._profiled_threads: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def rss(self) -> int:
+        return self.process.memory_info().rss
+
+    def track(self, node_name: str, thread_id: Optional[int]=None):
+        """
+        Starts tracking the peak memory of a node and, given the thread running it, sampling its call stack.
+        """
+        with self._lock:
+            self.peak_rss[node_name] = self.rss()
+            if thread_id is not None:
+                self._profiled_threads[node_name] = thread_id
+                self.stacks[node_name] = Counter()
+
+    def untrack(self, node_name: str) -> Tuple[int, Optional[Counter]]:
+        """
+        Stops tracking the node, returning its peak memory and sampled call stacks (if profiled).
+        """
+        with self._lock:
+            self._profiled_threads.pop(node_name, None)
+            return max(self.peak_rss.pop(node_name), self.rss()), self.stacks.pop(node_name, None)
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            rss = self.rss()
+            with self._lock:
+                for node_name, peak in self.peak_rss.items():
+                    self.peak_rss[node_name] = max(peak, rss)
+                if self._profiled_threads:
+                    frames = sys._current_frames()
+                    for node_name, thread_id in self._profiled_threads.items():
+                        if thread_id in frames:
+                            self.stacks[node_name][_folded_stack(frames[thread_id])] += 1
+
+    def stop(self):
+        self._stopped.set()
+
+
+# ============================== Main Classes ==============================
+class NodeCacheHooks:
+    """
+    Skips nodes whose inputs, parameters and source are unchanged since a previous run, reusing their stored outputs.
+    Each node run is fingerprinted from its input data (parameters included) and the source of the module defining
+    its function and of the package modules it imports, transitively. On a hit the node function is swapped for one returning the stored outputs; on a miss the
+    outputs are stored once the node has run. Least-recently-used entries are evicted beyond `max_size_mb`. Nodes
+    reading or writing files themselves must be excluded, as their inputs only hold the file paths.
+
+    Attributes:
+        cache_dir (Path): Directory in which the node outputs are stored.
+        max_size_mb (float): Disk budget for the cache, in megabytes.
+        exclude_nodes (list): Names of nodes that are never cached.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: float=2048, exclude_nodes: list=None):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_mb = max_size_mb
+        self.exclude_nodes = set(exclude_nodes or [])
+        self._node_funcs: Dict[str, Callable] = {}
+
+    def _cache_path(self, node: Node, inputs: Dict[str, Any]) -> Path:
+        digest = hashlib.sha256(_fingerprint_source(node.func).encode())
+        for name in sorted(inputs):
+            digest.update(name.encode())
+            digest.update(fingerprint_data(inputs[name]).encode())
+        return self.cache_dir / re.sub(r'[^\w.-]+', '_', node.name) / f"{digest.hexdigest()}.pickle"
+
+    def _evict(self):
+        entries = sorted(self.cache_dir.glob('*/*.pickle'), key=lambda x: x.stat().st_mtime)
+        total_size = sum(x.stat().st_size for x in entries)
+        while entries and total_size > self.max_size_mb * 1024 ** 2:
+            entry = entries.pop(0)
+            total_size -= entry.stat().st_size
+            entry.unlink()
+            logger.info(f"Evicted cached outputs {entry.parent.name}/{entry.name}")
+
+    @hook_impl
+    def before_node_run(self, node: Node, inputs: Dict[str, Any]):
+        if node.name in self.exclude_nodes:
+            return
+        cache_path = self._cache_path(node, inputs)
+        self._node_funcs[node.name] = func = node.func
+
+        if cache_path.exists():
+            logger.info(f"Cache hit for node '{node.name}', reusing outputs from {cache_path.name}")
+            with open(cache_path, 'rb') as f:
+                outputs = pickle.load(f)
+            os.utime(cache_path)  # Marks the entry as recently used
+
+            @wraps(func)
+            def _cached_func(*args, **kwargs):
+                return outputs
+            node.func = _cached_func
+        else:
+            logger.info(f"Cache miss for node '{node.name}'")
+
+            @wraps(func)
+            def _caching_func(*args, **kwargs):
+                outputs = func(*args, **kwargs)
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(cache_path, 'wb') as f:
+                        pickle.dump(outputs, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    self._evict()
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    cache_path.unlink(missing_ok=True)
+                    logger.warning(f"Outputs of node '{node.name}' cannot be cached: {e}")
+                return outputs
+            node.func = _caching_func
+
+    def _restore_node_func(self, node: Node):
+        if node.name in self._node_funcs:
+            node.func = self._node_funcs.pop(node.name)
+
+    @hook_impl
+    def after_node_run(self, node: Node):
+        self._restore_node_func(node)
+
+    @hook_impl
+    def on_node_error(self, node: Node):
+        self._restore_node_func(node)
+
+
+class ProfilingHooks:
+    """
+    Records the wall time, CPU time, peak resident memory increase and input/output sizes (rows and bytes) of every
+    node run, and the duration and size of every dataset load and save, and writes them as a JSON run report named
+    after the session id. Nodes listed in `profile_nodes` are additionally profiled by sampling their call stack,
+    written next to the report in the 'folded' format of flamegraph tools (flamegraph.pl, speedscope).
+
+    CPU time is measured both for the thread running the node and for the whole process (which includes other
+    threads and the child processes that have exited, e.g. joblib workers). Memory is sampled in a background
+    thread, so the peak of nodes shorter than the sampling interval can be missed. Nodes run by the ParallelRunner
+    execute in other processes and are not recorded.
+
+    Attributes:
+        report_dir (Path): Directory in which the run reports are written.
+        profile_nodes (set): Names of the nodes whose call stacks are sampled.
+        sample_interval_ms (float): Interval between memory and call stack samples, in milliseconds.
+    """
+
+    def __init__(self, report_dir: str, profile_nodes: List[str]=None, sample_interval_ms: float=10):
+        self.report_dir = Path(report_dir)
+        self.profile_nodes = set(profile_nodes or [])
+        self.sample_interval_ms = sample_interval_ms
+        self._lock = threading.Lock()
+        self._sampler: Optional[_ResourceSampler] = None
+        self._run: Dict[str, Any] = {}
+        self._nodes: List[Dict] = []
+        self._datasets: List[Dict] = []
+        self._node_starts: Dict[str, Dict] = {}
+        self._io_starts: Dict[Tuple[str, str, str], float] = {}
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: Dict[str, Any]):
+        self._sampler = _ResourceSampler(self.sample_interval_ms)
+        self._sampler.start()
+        self._run = {
+            'session_id': run_params.get('session_id'),
+            'pipeline_name': run_params.get('pipeline_name') or '__default__',
+            # Runner instances are passed as their repr, e.g. '<kedro.runner.SequentialRunner object at 0x...>'
+            'runner': re.sub(r'^<(?:[\w.]+\.)?(\w+) object at \w+>$', r'\1', str(run_params.get('runner'))),
+            'run_params': {k: run_params.get(k) for k in ('env', 'tags', 'node_names', 'from_nodes', 'to_nodes')},
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'rss_start_mb': self._sampler.rss() / 1024 ** 2,
+            '_start': time.perf_counter(),
+        }
+        self._nodes, self._datasets = [], []
+
+    # ------------------------------ Nodes ------------------------------
+    @hook_impl
+    def before_node_run(self, node: Node, inputs: Dict[str, Any]):
+        if self._sampler is None:
+            return
+        profiled = node.name in self.profile_nodes
+        self._sampler.track(node.name, threading.get_ident() if profiled else None)
+        with self._lock:
+            self._node_starts[node.name] = {
+                'inputs': _sizes(inputs),
+                'rss': self._sampler.rss(),
+                'wall': time.perf_counter(),
+                'thread_cpu': time.thread_time(),
+                'process_cpu': self._process_cpu(),
+            }
+
+    def _process_cpu(self) -> float:
+        cpu_times = self._sampler.process.cpu_times()
+        return cpu_times.user + cpu_times.system + cpu_times.children_user + cpu_times.children_system
+
+    def _record_node(self, node: Node, outputs: Dict[str, Any], status: str):
+        if self._sampler is None or node.name not in self._node_starts:
+            return
+        wall, thread_cpu, process_cpu = time.perf_counter(), time.thread_time(), self._process_cpu()
+        peak_rss, stacks = self._sampler.untrack(node.name)
+        with self._lock:
+            start = self._node_starts.pop(node.name)
+        record = {
+            'node': node.name,
+            'status': status,
+            'wall_seconds': wall - start['wall'],
+            'cpu_seconds': thread_cpu - start['thread_cpu'],
+            'process_cpu_seconds': process_cpu - start['process_cpu'],
+            'rss_start_mb': start['rss'] / 1024 ** 2,
+            'peak_rss_delta_mb': (peak_rss - start['rss']) / 1024 ** 2,
+            'inputs': start['inputs'],
+            'outputs': _sizes(outputs),
+        }
+        for direction in ('inputs', 'outputs'):
+            record[f'{direction[:-1]}_bytes'] = sum(x['bytes'] or 0 for x in record[direction].values())
+        if stacks:
+            record['flamegraph'] = str(self._write_stacks(node.name, stacks))
+        logger.info(
+            f"Node '{node.name}': {record['wall_seconds']:.2f}s wall, {record['cpu_seconds']:.2f}s CPU, "
+            f"peak RSS +{record['peak_rss_delta_mb']:.0f} MB"
+        )
+        with self._lock:
+            self._nodes.append(record)
+
+    def _write_stacks(self, node_name: str, stacks: Counter) -> Path:
+        filename = re.sub(r'[^\w.-]+', '_', node_name) + '.folded'
+        filepath = self.report_dir / str(self._run['session_id']) / filename
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(''.join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+        return filepath
+
+    @hook_impl
+    def after_node_run(self, node: Node, outputs: Dict[str, Any]):
+        self._record_node(node, outputs, 'completed')
+
+    @hook_impl
+    def on_node_error(self, node: Node):
+        self._record_node(node, {}, 'failed')
+
+    # ------------------------------ Datasets ------------------------------
+    def _start_io(self, dataset_name: str, node: Node, operation: str):
+        if not _is_parameters(dataset_name):
+            with self._lock:
+                self._io_starts[(dataset_name, node.name, operation)] = time.perf_counter()
+
+    def _record_io(self, dataset_name: str, data: Any, node: Node, operation: str):
+        with self._lock:
+            start = self._io_starts.pop((dataset_name, node.name, operation), None)
+        if start is None:
+            return
+        rows, n_bytes = _data_size(data)
+        with self._lock:
+            self._datasets.append({
+                'dataset': dataset_name,
+                'operation': operation,
+                'node': node.name,
+                'wall_seconds': time.perf_counter() - start,
+                'rows': rows,
+                'bytes': n_bytes,
+            })
+
+    @hook_impl
+    def before_dataset_loaded(self, dataset_name: str, node: Node):
+        self._start_io(dataset_name, node, 'load')
+
+    @hook_impl
+    def after_dataset_loaded(self, dataset_name: str, data: Any, node: Node):
+        self._record_io(dataset_name, data, node, 'load')
+
+    @hook_impl
+    def before_dataset_saved(self, dataset_name: str, node: Node):
+        self._start_io(dataset_name, node, 'save')
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str, data: Any, node: Node):
+        self._record_io(dataset_name, data, node, 'save')
+
+    # ------------------------------ Report ------------------------------
+    def _write_report(self, pipeline: Pipeline, status: str):
+        if self._sampler is None:
+            return
+        self._sampler.stop()
+        report = {k: v for k, v in self._run.items() if not k.startswith('_')}
+        report.update({
+            'status': status,
+            'wall_seconds': time.perf_counter() - self._run['_start'],
+            'n_nodes': len(pipeline.nodes),
+            'nodes': self._nodes,
+            'datasets': self._datasets,
+        })
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        filepath = self.report_dir / f"{report['session_id']}.json"
+        with open(filepath, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        self._sampler = None
+        logger.info(f"Run report written to {filepath}")
+
+    @hook_impl
+    def after_pipeline_run(self, pipeline: Pipeline):
+        self._write_report(pipeline, 'completed')
+
+    @hook_impl
+    def on_pipeline_error(self, pipeline: Pipeline):
+        self._write_report(pipeline, 'failed')
@@ -4,6 +4,13 @@ from typing import Dict
 from kedro.framework.project import find_pipelines
 from kedro.pipeline import Pipeline
 
+from bank_loan_defaulter_prediction.pipelines import batch_scoring, data_processing
+
+# Pipelines that are only run explicitly (e.g. `kedro run --pipeline batch_scoring`), not as part of `kedro run`
+ON_DEMAND_PIPELINES = [
+    "batch_scoring", "batch_scoring_unmonitored", "data_processing_stepwise", "model_selection"
+]
+
 
 def register_pipelines() -> Dict[str, Pipeline]:
     """Register the project's pipelines.
@@ -12,5 +19,11 @@ def register_pipelines() -> Dict[str, Pipeline]:
         A mapping from pipeline names to ``Pipeline`` objects.
     """
     pipelines = find_pipelines()
-    pipelines["__default__"] = sum(pipelines.values())
+    # data_processing node by node, writing the preprocessed datasets
+    pipelines["data_processing_stepwise"] = data_processing.create_pipeline(fused=False)
+    # batch_scoring without drift monitoring, which needs no drift baseline
+    pipelines["batch_scoring_unmonitored"] = batch_scoring.create_pipeline(monitored=False)
+    pipelines["__default__"] = sum(
+        pipeline for name, pipeline in pipelines.items() if name not in ON_DEMAND_PIPELINES
+    )
     return pipelines
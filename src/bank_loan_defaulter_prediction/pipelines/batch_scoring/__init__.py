@@ -0,0 +1,9 @@
+"""Streaming batch scoring pipeline for files larger than memory"""
+
+
+def __getattr__(name):
+    # Kedro is only imported when the pipeline is built, so that the nodes can be imported without it
+    if name == 'create_pipeline':
+        from .pipeline import create_pipeline
+        return create_pipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,154 @@
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+from ...compiled_model import CompiledModel
+from ...drift import DriftSketch, log_drift
+from ...raw_data import RAW_SCHEMA
+from ..data_processing.nodes import feature_engineering, preprocess_dataset
+from ..data_processing.preprocessing_plan import PreprocessingPlan
+from ..monitoring.nodes import report_drift
+
+if TYPE_CHECKING:
+    # Only for annotations: scoring with the compiled model (see score.py) does not import sklearn
+    from ..data_science.classifier_model import ClassifierModel
+
+
+# ============================== Auxiliary Functions ==============================
+def _iter_csv_chunks(filepath: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Streams a raw CSV file with the raw schema, as `raw_data.read_raw_csv` parses it, regrouping the blocks parsed by
+    Arrow into chunks of `chunk_size` rows.
+    """
+    reader = pv.open_csv(
+        filepath, convert_options=pv.ConvertOptions(column_types=RAW_SCHEMA, strings_can_be_null=True)
+    )
+    batches, n_rows = [], 0
+    for batch in reader:
+        batches.append(batch)
+        n_rows += batch.num_rows
+        while n_rows >= chunk_size:
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+            yield table.slice(0, chunk_size).to_pandas()
+            remainder = table.slice(chunk_size)
+            batches, n_rows = remainder.to_batches(), remainder.num_rows
+    if n_rows > 0:
+        yield pa.Table.from_batches(batches, schema=reader.schema).to_pandas()
+
+
+def _iter_chunks(filepath: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Reads a raw CSV or Parquet file in chunks of at most `chunk_size` rows.
+    """
+    suffix = Path(filepath).suffix.lower()
+    if suffix == '.csv':
+        yield from _iter_csv_chunks(filepath, chunk_size)
+    elif suffix in ('.parquet', '.pq'):
+        for batch in pq.ParquetFile(filepath).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported file format '{suffix}' for {filepath}, expected .csv or .parquet.")
+
+
+class _ChunkWriter:
+    """
+    Appends scored chunks to a CSV or Parquet file, so that only the current chunk is ever held in memory.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.suffix = Path(filepath).suffix.lower()
+        if self.suffix not in ('.csv', '.parquet', '.pq'):
+            raise ValueError(f"Unsupported file format '{self.suffix}' for {filepath}, expected .csv or .parquet.")
+        self._parquet_writer = None
+        self._has_header = False
+
+    def __enter__(self):
+        Path(self.filepath).parent.mkdir(parents=True, exist_ok=True)
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
+        return self
+
+    def write(self, chunk_df: pd.DataFrame):
+        if self.suffix == '.csv':
+            chunk_df.to_csv(self.filepath, mode='a', header=not self._has_header, index=False)
+            self._has_header = True
+        else:
+            table = pa.Table.from_pandas(chunk_df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.filepath, table.schema)
+            self._parquet_writer.write_table(table)
+
+    def __exit__(self, *exc_info):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+# ============================== Main Functions ==============================
+def score_in_chunks(
+    preprocessing_plan: PreprocessingPlan, classifier_model: Union['ClassifierModel', CompiledModel], parameters: Dict,
+    drift_baseline: DriftSketch=None, monitoring_options: Dict=None
+) -> Tuple[Dict, Optional[DriftSketch]]:
+    """
+    Scores a raw CSV/Parquet file chunk by chunk: each chunk is preprocessed with the fitted preprocessing plan,
+    feature engineered, predicted on, and appended to the output file before the next chunk is read. The model is
+    either the pickled ClassifierModel or the CompiledModel, which score chunks alike. `parameters` are the
+    `batch_scoring_options` (input and output files, chunk size, ID and target columns).
+
+    Given a drift baseline (and the `monitoring_options` of its report), the features and predicted probabilities
+    of each chunk are also added to a sketch of the scored rows, whose PSI and KS statistic against the baseline are
+    logged as the chunks are scored. The sketch keeps the same size however large the file, and is returned (None
+    without a baseline) so that the sketches of files scored separately can be merged.
+    """
+    _logger = logging.getLogger(__name__)
+    target_var = parameters['target']
+    id_column = parameters['id_column']
+    drift_sketch = drift_baseline.empty_like() if drift_baseline is not None else None
+
+    n_rows, n_chunks = 0, 0
+    with _ChunkWriter(parameters['output_filepath']) as writer:
+        for chunk_df in _iter_chunks(parameters['input_filepath'], parameters['chunk_size']):
+            features_df = feature_engineering(preprocess_dataset(chunk_df, preprocessing_plan))
+            pred_proba, pred = classifier_model.predict_scores(features_df)
+            predictions_df = pd.DataFrame({
+                id_column: features_df[id_column].to_numpy(),
+                target_var: pred,
+                f'{target_var}_PRED_PROBA': pred_proba,
+            })
+            writer.write(predictions_df)
+            n_rows += len(predictions_df)
+            n_chunks += 1
+            _logger.info(f"Scored chunk {n_chunks} ({n_rows:,} rows so far)")
+            if drift_sketch is not None:
+                drift_sketch.update(features_df).update(predictions_df)
+                report_df = report_drift(drift_baseline, drift_sketch, monitoring_options).set_index('column')
+                _logger.info(
+                    f"Drift of the {n_rows:,} rows scored: largest PSI {report_df['psi'].max():.3f}, predicted "
+                    f"probability PSI {report_df.loc[f'{target_var}_PRED_PROBA', 'psi']:.3f} and KS "
+                    f"{report_df.loc[f'{target_var}_PRED_PROBA', 'ks']:.3f}"
+                )
+
+    summary = {"rows_scored": float(n_rows), "chunks_scored": float(n_chunks)}
+    if drift_sketch is not None:
+        report_df = report_drift(drift_baseline, drift_sketch, monitoring_options)
+        log_drift(report_df, "Batch scoring")
+        summary["largest_psi"] = float(report_df['psi'].max())
+        summary["drifting_columns"] = float(report_df['drift'].sum())
+    return summary, drift_sketch
+
+
+def score_in_chunks_unmonitored(
+    preprocessing_plan: PreprocessingPlan, classifier_model: Union['ClassifierModel', CompiledModel], parameters: Dict
+) -> Dict:
+    """
+    Scores a raw CSV/Parquet file chunk by chunk without drift monitoring, so that no drift baseline is needed (see
+    `score_in_chunks`).
+    """
+    summary, _ = score_in_chunks(preprocessing_plan, classifier_model, parameters)
+    return summary
@@ -0,0 +1,42 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from ..monitoring.nodes import report_drift
+from .nodes import score_in_chunks, score_in_chunks_unmonitored
+
+
+def create_pipeline(monitored: bool=True, **kwargs) -> Pipeline:
+    """
+    The monitored pipeline also sketches the scored rows and reports their drift against `drift_baseline`. The
+    unmonitored pipeline (`monitored=False`, registered as `batch_scoring_unmonitored`) only scores, so that it runs
+    without a drift baseline, e.g. before the `monitoring` pipeline has written one.
+    """
+    if not monitored:
+        return pipeline(
+            [
+                node(
+                    func=score_in_chunks_unmonitored,
+                    inputs=["preprocessing_plan", "classifier_model", "params:batch_scoring_options"],
+                    outputs="batch_scoring_summary",
+                    name="score_in_chunks_node",
+                ),
+            ]
+        )
+    return pipeline(
+        [
+            node(
+                func=score_in_chunks,
+                inputs=[
+                    "preprocessing_plan", "classifier_model", "params:batch_scoring_options", "drift_baseline",
+                    "params:monitoring_options"
+                ],
+                outputs=["batch_scoring_summary", "batch_drift_sketch"],
+                name="score_in_chunks_node",
+            ),
+            node(
+                func=report_drift,
+                inputs=["drift_baseline", "batch_drift_sketch", "params:monitoring_options"],
+                outputs="batch_drift_report",
+                name="report_batch_drift_node",
+            ),
+        ]
+    )
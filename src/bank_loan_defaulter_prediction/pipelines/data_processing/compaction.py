@@ -0,0 +1,127 @@
+"""Schema-driven compaction of the preprocessed datasets. No value is ever changed: compacting the dataset the schema
+was fitted on fails loudly if a value would change, while other datasets (e.g. scoring batches), which can hold values
+the training schema cannot, have those columns widened with a warning instead of failing."""
+import logging
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+# String columns with at most this ratio of distinct values to rows are interned as categoricals, the others are
+# stored as Arrow strings
+MAX_CATEGORY_RATIO = 0.5
+
+INTEGER_DTYPES = ['int8', 'int16', 'int32', 'int64']
+
+
+# ============================== Auxiliary Functions ==============================
+def _is_float32_exact(values: pd.Series) -> bool:
+    values = values.to_numpy(dtype=np.float64)
+    return bool(np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True))
+
+
+def _smallest_integer_dtype(values: pd.Series) -> str:
+    if values.empty:
+        return str(values.dtype)
+    low, high = values.min(), values.max()
+    return next(x for x in INTEGER_DTYPES if np.iinfo(x).min <= low and high <= np.iinfo(x).max)
+
+
+def _float_dtype(values: pd.Series) -> str:
+    return 'float32' if _is_float32_exact(values) else 'float64'
+
+
+def _string_dtype(values: pd.Series) -> str:
+    return 'category' if values.nunique() <= MAX_CATEGORY_RATIO * len(values) else 'string[pyarrow]'
+
+
+# Kinds of columns with the function picking their compacted dtype, checked in order. Categorical and boolean columns
+# are kept as they are, as are columns of any other kind.
+COMPACT_DTYPE_PICKERS = [
+    (lambda x: isinstance(x.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(x), lambda x: str(x.dtype)),
+    (pd.api.types.is_integer_dtype, _smallest_integer_dtype),
+    (pd.api.types.is_float_dtype, _float_dtype),
+    (lambda x: pd.api.types.is_object_dtype(x) or pd.api.types.is_string_dtype(x), _string_dtype),
+]
+
+
+def _compact_dtype(values: pd.Series) -> str:
+    """
+    Smallest dtype holding every value of the column unchanged.
+    """
+    return next((pick(values) for matches, pick in COMPACT_DTYPE_PICKERS if matches(values)), str(values.dtype))
+
+
+def _assert_unchanged(before: pd.Series, after: pd.Series):
+    """
+    Raises if compacting the column changed any of its values (missing values included).
+    """
+    missing = before.isna().to_numpy()
+    if not np.array_equal(missing, after.isna().to_numpy()):
+        raise ValueError(f"Compacting column '{before.name}' to {after.dtype} would change its missing values.")
+    restored = after[~missing].astype(object if isinstance(after.dtype, (pd.CategoricalDtype, pd.StringDtype)) else before.dtype)
+    changed = restored.to_numpy() != before[~missing].to_numpy()
+    if changed.any():
+        raise ValueError(
+            f"Compacting column '{before.name}' from {before.dtype} to {after.dtype} would change {changed.sum()} "
+            f"values, e.g. {before[~missing][changed].iloc[0]}. Refit the preprocessing plan on data covering them."
+        )
+
+
+def _compact_column(values: pd.Series, dtype: str, strict: bool=True) -> pd.Series:
+    """
+    Casts the column to its compacted dtype. Values the dtype cannot hold unchanged raise when `strict` (when fitting),
+    otherwise the column is widened to the smallest dtype holding the values of this batch (e.g. when scoring).
+    """
+    # Integer columns holding missing values in this batch are kept as floats, as exactly as possible
+    if dtype in INTEGER_DTYPES and values.isna().any():
+        dtype = _float_dtype(values)
+    if str(values.dtype) == dtype:
+        return values
+    compacted = values.astype(dtype)
+    try:
+        _assert_unchanged(values, compacted)
+    except ValueError as error:
+        if strict:
+            raise
+        widened_dtype = _compact_dtype(values)
+        logging.getLogger(__name__).warning(f"{error} Widening it to {widened_dtype} for this batch instead.")
+        compacted = values if str(values.dtype) == widened_dtype else values.astype(widened_dtype)
+    return compacted
+
+
+# ============================== Main Functions ==============================
+def infer_compact_dtypes(data_df: pd.DataFrame) -> Dict[str, str]:
+    """
+    Infers the compaction schema of a dataset: the smallest integer type holding the range of each integer column,
+    float32 for float columns it represents exactly, and categoricals (or Arrow strings when of high cardinality)
+    for string columns.
+    """
+    return {col: _compact_dtype(data_df[col]) for col in data_df.columns}
+
+
+def compact_dataset(
+    data_df: pd.DataFrame, compact_dtypes: Dict[str, str], strict: bool=True
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Casts the columns of the dataset to the compaction schema. If any value would change, fails when `strict`,
+    otherwise widens the column to the smallest dtype holding its values in this dataset and logs a warning.
+
+    Returns:
+        The compacted dataset and the memory usage of each column before and after.
+    """
+    memory_before = data_df.memory_usage(index=False, deep=True)
+    dtypes_before = data_df.dtypes.astype(str)
+    for col, dtype in compact_dtypes.items():
+        if col in data_df.columns:
+            data_df[col] = _compact_column(data_df[col], dtype, strict)
+    memory_after = data_df.memory_usage(index=False, deep=True)
+
+    report = pd.DataFrame({
+        'dtype_before': dtypes_before,
+        'dtype_after': data_df.dtypes.astype(str),
+        'memory_before_bytes': memory_before,
+        'memory_after_bytes': memory_after,
+    })
+    report.loc['TOTAL'] = ['', '', memory_before.sum(), memory_after.sum()]
+    return data_df, report
@@ -0,0 +1,66 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# ============================== Auxiliary Functions ==============================
+def _factorize(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Returns the integer codes (-1 for missing values) and the distinct values they point to. Categorical columns
+    already carry both, so they are reused instead of being re-hashed.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    codes, uniques = pd.factorize(values)
+    return codes, pd.Index(uniques, dtype=object)
+
+
+def _broadcast(codes: np.ndarray, unique_values: np.ndarray, fill_value) -> np.ndarray:
+    """
+    Broadcasts per-unique results back to the rows, using `fill_value` for missing values (code -1).
+    """
+    if len(unique_values) == 0:
+        return np.full(len(codes), fill_value)
+    return np.where(codes >= 0, unique_values.take(codes, mode='clip'), fill_value)
+
+
+# ============================== Main Functions ==============================
+def normalise_loan_titles(
+    loan_titles: pd.Series, lookup: Dict[str, str], categories: List[str]=None
+) -> pd.Series:
+    """
+    Uppercases, strips and maps loan titles to their normalised names, returning them as a Categorical. The string
+    work is done once per distinct title and broadcast back to the rows through the factorized codes.
+
+    Args:
+        loan_titles (pd.Series): Raw loan titles.
+        lookup (dict): Mapping of cleaned loan titles to their normalised names.
+        categories (list, optional): Category vocabulary. Defaults to the sorted normalised titles that are present.
+    """
+    codes, uniques = _factorize(loan_titles)
+    normalised_uniques = uniques.str.upper().str.strip()
+    normalised_uniques = pd.Index([lookup.get(x, x) for x in normalised_uniques], dtype=object)
+
+    if categories is None:
+        categories = sorted(normalised_uniques.dropna().unique())
+    categories = pd.Index(categories)
+    category_codes = _broadcast(codes, categories.get_indexer(normalised_uniques), -1)
+    return pd.Series(
+        pd.Categorical.from_codes(category_codes, categories=categories, ordered=False),
+        index=loan_titles.index, name=loan_titles.name,
+    )
+
+
+def flag_consolidation(loan_titles: pd.Series) -> pd.Series:
+    """
+    Flags (1/0) loan titles containing 'CONSOLIDATION' (case-insensitive), evaluated once per distinct title. As with
+    `.str.contains(...).astype(int)`, the flags are int64 and missing titles (e.g. outside the fitted vocabulary)
+    raise a ValueError.
+    """
+    codes, uniques = _factorize(loan_titles)
+    n_missing = int((codes < 0).sum())
+    if n_missing > 0:
+        raise ValueError(f"Cannot flag {n_missing} missing loan titles as consolidations or not.")
+    unique_flags = np.asarray(uniques.str.contains('CONSOLIDATION', case=False, na=False), dtype=bool)
+    return pd.Series(_broadcast(codes, unique_flags, False).astype(int), index=loan_titles.index, name=loan_titles.name)
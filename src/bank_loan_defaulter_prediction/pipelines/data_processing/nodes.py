@@ -1,108 +1,54 @@
-import re
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
 
 import pandas as pd
 
+from .loan_titles import flag_consolidation
+from .preprocessing_plan import PreprocessingPlan
 
-# ============================== Auxiliary Functions ==============================
-def _standardise_column_names(data_df: pd.DataFrame) -> pd.DataFrame:
-    data_df.columns = [re.sub(r'[\s-]+', '_', x).upper() for x in data_df.columns]
-    
-    # There is a correction whereby the 'EMPLOYMENT_DURATION' column is wrongly labelled. The data contained within is 
-    # actually the 'HOME_OWNERSHIP' column.
-    data_df['__HOME_OWNERSHIP__'] = data_df['HOME_OWNERSHIP']  # NOTE: Still unsure what this column represents
-    data_df['HOME_OWNERSHIP'] = data_df['EMPLOYMENT_DURATION']
-    data_df = data_df.drop(columns=['EMPLOYMENT_DURATION'])
-    
-    return data_df
+# Engineered ratio features, mapped to their (numerator, denominator) columns. Also used by the online scoring service.
+RATIO_FEATURES = {
+    # Ratio of funded amounts to the total loan amount
+    'FUNDED_AMOUNT_TO_PRINCIPAL': ('FUNDED_AMOUNT', 'LOAN_AMOUNT'),
+    'FUNDED_AMOUNT_INVESTOR_TO_PRINCIPAL': ('FUNDED_AMOUNT_INVESTOR', 'LOAN_AMOUNT'),
+    # Ratio of interests collected to the total loan amount
+    'RECEIVED_INTEREST_TO_PRINCIPAL': ('TOTAL_RECEIVED_INTEREST', 'LOAN_AMOUNT'),
+    # Ratio of late fees collected to the total loan amount
+    'RECEIVED_LATE_FEE_TO_PRINCIPAL': ('TOTAL_RECEIVED_LATE_FEE', 'LOAN_AMOUNT'),
+}
 
 
-def _preprocess_categorical_variables(data_df: pd.DataFrame, reference_df: pd.DataFrame=None) -> pd.DataFrame:
-    # Text cleanup
-    data_df['LOAN_TITLE'] = data_df['LOAN_TITLE'].str.upper().str.strip()  # Standardise all titles to uppercase
-    data_df['LOAN_TITLE'] = data_df['LOAN_TITLE'].replace({
-        'BATHROOM': 'HOME IMPROVEMENT LOAN',
-        'POOL': 'HOME IMPROVEMENT LOAN',
-        'BILL PAYOFF': 'BILLS',
-        'CAR LOAN': 'CAR FINANCING',
-        'CARDS': 'CREDIT CARD', 
-        'CARD CONSOLIDATION': 'CREDIT CARD CONSOLIDATION',
-        'CC': 'CREDIT CARD',
-        'CC CONSOLIDATION': 'CREDIT CARD CONSOLIDATION',
-        'CC LOAN': 'CREDIT CARD',
-        'CC REFI': 'CREDIT CARD REFINANCE',
-        'CC REFINANCE': 'CREDIT CARD REFINANCE',
-        'CC-REFINANCE': 'CREDIT CARD REFINANCE',
-        'CONSO': 'CONSOLIDATION',
-        'CONSOLIDATE': 'CONSOLIDATION',
-        'CONSOLIDATED': 'CONSOLIDATION',
-        'CONSOLIDATION LOAN': 'CONSOLIDATION',
-        'CREDIT': 'CREDIT LOAN',
-        'CREDIT CARD PAY OFF': 'CREDIT CARD PAYOFF',
-        'CREDIT CARD REFI': 'CREDIT CARD REFINANCE',
-        'CREDIT CARD REFINANCE LOAN': 'CREDIT CARD REFINANCE',
-        'CREDIT CARD REFINANCING': 'CREDIT CARD REFINANCE',
-        'CREDIT CARDS': 'CREDIT CARD',
-        'CREDIT PAY OFF': 'CREDIT PAYOFF',
-        'DEBT': 'DEBT LOAN',
-        'DEBT CONSOLIDATION 2013': 'DEBT CONSOLIDATION',
-        'DEBT CONSOLIDATION LOAN': 'DEBT CONSOLIDATION',
-        'DEPT CONSOLIDATION': 'DEBT CONSOLIDATION',
-        'GET DEBT FREE': 'GET OUT OF DEBT',
-        'HOME': 'HOME LOAN',
-        'HOME BUYING': 'HOME LOAN',
-        'HOME IMPROVEMENT': 'HOME IMPROVEMENT LOAN',
-        'HOUSE': 'HOME LOAN',
-        'LOAN 1': 'LOAN',
-        'LOAN1': 'LOAN',
-        'LENDING CLUB': 'LOAN',
-        'LENDING LOAN': 'LOAN',
-        'MEDICAL EXPENSES': 'MEDICAL',
-        'MEDICAL LOAN': 'MEDICAL',
-        'MY LOAN': 'LOAN',
-        'MYLOAN': 'LOAN',
-        'PAY OFF': 'PAYOFF',
-        'PAY OFF BILLS': 'PAYOFF',
-        'PERSONAL': 'LOAN',
-        'PERSONAL LOAN': 'LOAN',
-        'REFI': 'REFINANCE',
-        'REFINANCE LOAN': 'REFINANCE',
-    })
-    
-    # Managing strings so that they are in Categorical format
-    if reference_df is None:
-        reference_df = data_df.copy()
-    data_df['ID'] = data_df['ID'].astype(str)
-    data_df['BATCH_ENROLLED'] = data_df['BATCH_ENROLLED'].astype(str)
-    data_df['GRADE'] = pd.Categorical(data_df['GRADE'], categories=sorted(set(reference_df['GRADE'])), ordered=True)
-    data_df['SUB_GRADE'] = pd.Categorical(data_df['SUB_GRADE'], categories=sorted(set(reference_df['SUB_GRADE'])), ordered=True)
-    data_df['LOAN_TITLE'] = pd.Categorical(data_df['LOAN_TITLE'], categories=sorted(set(reference_df['LOAN_TITLE'])), ordered=False)
-    data_df['INITIAL_LIST_STATUS'] = pd.Categorical(data_df['INITIAL_LIST_STATUS'].replace({'f': 'FORWARDED', 'w': 'WAITING'}), categories=['FORWARDED', 'WAITING'], ordered=False)
-    data_df['APPLICATION_TYPE'] = pd.Categorical(data_df['APPLICATION_TYPE'], categories=sorted(set(reference_df['APPLICATION_TYPE'])), ordered=False)
-    return data_df
+# ============================== Auxiliary Functions ==============================
+def _process_test_dataset(
+    test_df: pd.DataFrame, preprocessing_plan: PreprocessingPlan, compaction_fitted: threading.Event
+) -> pd.DataFrame:
+    """
+    Converts the test dataset with the fitted vocabularies, then compacts and feature engineers it once the
+    compaction schema is fitted on the training dataset (`compaction_fitted` is set).
+    """
+    converted_test_df = preprocessing_plan.convert(test_df)
+    compaction_fitted.wait()
+    return feature_engineering(preprocessing_plan.compact(converted_test_df))
 
 
-def _preprocess_numerical_variables(data_df: pd.DataFrame, reference_df: pd.DataFrame=None) -> pd.DataFrame:
-    numerical_vars = [
-        'LOAN_AMOUNT', 'FUNDED_AMOUNT', 'FUNDED_AMOUNT_INVESTOR', 'TERM', 'INTEREST_RATE', 'DEBIT_TO_INCOME',
-        'DELINQUENCY_TWO_YEARS', 'INQUIRES_SIX_MONTHS', 'OPEN_ACCOUNT', 'PUBLIC_RECORD', 'REVOLVING_BALANCE',
-        'REVOLVING_UTILITIES', 'TOTAL_ACCOUNTS', 'TOTAL_RECEIVED_INTEREST', 'TOTAL_RECEIVED_LATE_FEE', 'RECOVERIES',
-        'COLLECTION_RECOVERY_FEE', 'COLLECTION_12_MONTHS_MEDICAL', 'LAST_WEEK_PAY', 'TOTAL_COLLECTION_AMOUNT',
-        'TOTAL_CURRENT_BALANCE', 'TOTAL_REVOLVING_CREDIT_LIMIT', 
-    ]
-    for var in numerical_vars:
-        data_df[var] = pd.to_numeric(data_df[var], errors='coerce')
-    return data_df
+# ============================== Main Functions ==============================
+def fit_preprocessing_plan(data_df: pd.DataFrame) -> PreprocessingPlan:
+    """
+    Fits the preprocessing plan (category vocabularies, loan title lookup and numeric dtypes) on the training dataset.
+    """
+    return PreprocessingPlan.fit(data_df)
 
 
-# ============================== Main Functions ==============================
-def preprocess_dataset(data_df: pd.DataFrame, reference_df: pd.DataFrame=None) -> pd.DataFrame:
+def preprocess_dataset(data_df: pd.DataFrame, preprocessing_plan: PreprocessingPlan=None) -> pd.DataFrame:
     """
     Preprocess the dataset by standardising column names, preprocessing categorical variables, and preprocessing numerical variables.
+    If no fitted preprocessing plan is provided, the plan is fitted on the dataset itself.
     """
-    data_df = _standardise_column_names(data_df)
-    data_df = _preprocess_categorical_variables(data_df, reference_df)
-    data_df = _preprocess_numerical_variables(data_df, reference_df)
-    return data_df
+    if preprocessing_plan is None:
+        preprocessing_plan = fit_preprocessing_plan(data_df)
+    return preprocessing_plan.transform(data_df)
 
 
 def feature_engineering(data_df: pd.DataFrame) -> pd.DataFrame:
@@ -110,19 +56,43 @@ def feature_engineering(data_df: pd.DataFrame) -> pd.DataFrame:
     Feature engineering for the dataset.
     """
     # ============================== Numerical ==============================
-    # Ratio of funded amounts to the total loan amount
-    data_df['FUNDED_AMOUNT_TO_PRINCIPAL'] = data_df['FUNDED_AMOUNT'] / data_df['LOAN_AMOUNT']
-    data_df['FUNDED_AMOUNT_INVESTOR_TO_PRINCIPAL'] = data_df['FUNDED_AMOUNT_INVESTOR'] / data_df['LOAN_AMOUNT']
-    
-    # Ratio of interests collected to the total loan amount
-    data_df['RECEIVED_INTEREST_TO_PRINCIPAL'] = data_df['TOTAL_RECEIVED_INTEREST'] / data_df['LOAN_AMOUNT']
-
-    # Ratio of late fees collected to the total loan amount
-    data_df['RECEIVED_LATE_FEE_TO_PRINCIPAL'] = data_df['TOTAL_RECEIVED_LATE_FEE'] / data_df['LOAN_AMOUNT']
+    for feature, (numerator, denominator) in RATIO_FEATURES.items():
+        # Computed in float64 whatever the compacted dtypes of the operands
+        data_df[feature] = data_df[numerator].astype('float64') / data_df[denominator]
 
     # ============================== Categorical ==============================
     # Whether a loan is part of consolidation
-    data_df['IS_CONSOLIDATION'] = data_df['LOAN_TITLE'].str.contains('CONSOLIDATION', case=False).astype(int)
+    data_df['IS_CONSOLIDATION'] = flag_consolidation(data_df['LOAN_TITLE'])
 
     return data_df
 
+
+def process_datasets(
+    train_df: pd.DataFrame, test_df: pd.DataFrame, processing_options: Dict
+) -> Tuple[PreprocessingPlan, pd.DataFrame, pd.DataFrame]:
+    """
+    Fused preprocessing and feature engineering of both datasets, without materialising the preprocessed datasets.
+    The training dataset is converted once, both to fit the compaction schema and to be transformed. The test branch
+    only needs the fitted plan, not the preprocessed training dataset: it runs in a worker thread concurrently with
+    the training branch when `processing_options['concurrent_branches']` is set, otherwise after it.
+    """
+    _logger = logging.getLogger(__name__)
+    preprocessing_plan = PreprocessingPlan.fit_vocabularies(train_df)
+    compaction_fitted = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        test_branch = None
+        if processing_options['concurrent_branches']:
+            test_branch = executor.submit(_process_test_dataset, test_df, preprocessing_plan, compaction_fitted)
+        try:
+            converted_train_df = preprocessing_plan.convert(train_df)
+            preprocessing_plan.fit_compaction(converted_train_df)
+        finally:
+            # Also released on failure, so that the test branch does not wait forever
+            compaction_fitted.set()
+        train_df = feature_engineering(preprocessing_plan.compact(converted_train_df, strict=True))
+        if test_branch is None:
+            test_df = _process_test_dataset(test_df, preprocessing_plan, compaction_fitted)
+        else:
+            test_df = test_branch.result()
+    _logger.info(f"Processed {len(train_df):,} train and {len(test_df):,} test rows")
+    return preprocessing_plan, train_df, test_df
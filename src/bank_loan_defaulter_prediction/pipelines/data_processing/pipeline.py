@@ -1,20 +1,42 @@
 from kedro.pipeline import Pipeline, node, pipeline
 
-from .nodes import preprocess_dataset, feature_engineering
+from .nodes import fit_preprocessing_plan, preprocess_dataset, feature_engineering, process_datasets
 
 
-def create_pipeline(**kwargs) -> Pipeline:
+def create_pipeline(fused: bool=True, **kwargs) -> Pipeline:
+    """
+    The fused pipeline preprocesses and feature engineers both datasets in a single node, keeping the preprocessed
+    datasets in memory. The step-by-step pipeline (`fused=False`, registered as `data_processing_stepwise`) runs and
+    writes each step separately, e.g. to inspect the preprocessed datasets.
+    """
+    if fused:
+        return pipeline(
+            [
+                node(
+                    func=process_datasets,
+                    inputs=["train_dataset", "test_dataset", "params:data_processing_options"],
+                    outputs=["preprocessing_plan", "feature_engineered_train_dataset", "feature_engineered_test_dataset"],
+                    name="process_datasets",
+                ),
+            ]
+        )
     return pipeline(
         [
             node(
-                func=preprocess_dataset,
+                func=fit_preprocessing_plan,
                 inputs={"data_df": "train_dataset"},
+                outputs="preprocessing_plan",
+                name="fit_preprocessing_plan",
+            ),
+            node(
+                func=preprocess_dataset,
+                inputs={"data_df": "train_dataset", "preprocessing_plan": "preprocessing_plan"},
                 outputs="preprocessed_train_dataset",
                 name="preprocess_train_dataset",
             ),
             node(
                 func=preprocess_dataset,
-                inputs=["test_dataset", "preprocessed_train_dataset"],
+                inputs={"data_df": "test_dataset", "preprocessing_plan": "preprocessing_plan"},
                 outputs="preprocessed_test_dataset",
                 name="preprocess_test_dataset",
             ),
@@ -0,0 +1,218 @@
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from .compaction import compact_dataset, infer_compact_dtypes
+from .loan_titles import normalise_loan_titles
+
+LOAN_TITLE_ALIASES = {
+    'BATHROOM': 'HOME IMPROVEMENT LOAN',
+    'POOL': 'HOME IMPROVEMENT LOAN',
+    'BILL PAYOFF': 'BILLS',
+    'CAR LOAN': 'CAR FINANCING',
+    'CARDS': 'CREDIT CARD',
+    'CARD CONSOLIDATION': 'CREDIT CARD CONSOLIDATION',
+    'CC': 'CREDIT CARD',
+    'CC CONSOLIDATION': 'CREDIT CARD CONSOLIDATION',
+    'CC LOAN': 'CREDIT CARD',
+    'CC REFI': 'CREDIT CARD REFINANCE',
+    'CC REFINANCE': 'CREDIT CARD REFINANCE',
+    'CC-REFINANCE': 'CREDIT CARD REFINANCE',
+    'CONSO': 'CONSOLIDATION',
+    'CONSOLIDATE': 'CONSOLIDATION',
+    'CONSOLIDATED': 'CONSOLIDATION',
+    'CONSOLIDATION LOAN': 'CONSOLIDATION',
+    'CREDIT': 'CREDIT LOAN',
+    'CREDIT CARD PAY OFF': 'CREDIT CARD PAYOFF',
+    'CREDIT CARD REFI': 'CREDIT CARD REFINANCE',
+    'CREDIT CARD REFINANCE LOAN': 'CREDIT CARD REFINANCE',
+    'CREDIT CARD REFINANCING': 'CREDIT CARD REFINANCE',
+    'CREDIT CARDS': 'CREDIT CARD',
+    'CREDIT PAY OFF': 'CREDIT PAYOFF',
+    'DEBT': 'DEBT LOAN',
+    'DEBT CONSOLIDATION 2013': 'DEBT CONSOLIDATION',
+    'DEBT CONSOLIDATION LOAN': 'DEBT CONSOLIDATION',
+    'DEPT CONSOLIDATION': 'DEBT CONSOLIDATION',
+    'GET DEBT FREE': 'GET OUT OF DEBT',
+    'HOME': 'HOME LOAN',
+    'HOME BUYING': 'HOME LOAN',
+    'HOME IMPROVEMENT': 'HOME IMPROVEMENT LOAN',
+    'HOUSE': 'HOME LOAN',
+    'LOAN 1': 'LOAN',
+    'LOAN1': 'LOAN',
+    'LENDING CLUB': 'LOAN',
+    'LENDING LOAN': 'LOAN',
+    'MEDICAL EXPENSES': 'MEDICAL',
+    'MEDICAL LOAN': 'MEDICAL',
+    'MY LOAN': 'LOAN',
+    'MYLOAN': 'LOAN',
+    'PAY OFF': 'PAYOFF',
+    'PAY OFF BILLS': 'PAYOFF',
+    'PERSONAL': 'LOAN',
+    'PERSONAL LOAN': 'LOAN',
+    'REFI': 'REFINANCE',
+    'REFINANCE LOAN': 'REFINANCE',
+}
+
+INITIAL_LIST_STATUS_LABELS = {'f': 'FORWARDED', 'w': 'WAITING'}
+
+# Categorical variables whose vocabulary is learnt from the training data, mapped to whether they are ordered
+FITTED_CATEGORICAL_VARIABLES = {
+    'GRADE': True,
+    'SUB_GRADE': True,
+    'LOAN_TITLE': False,
+    'APPLICATION_TYPE': False,
+}
+
+NUMERICAL_VARIABLES = [
+    'LOAN_AMOUNT', 'FUNDED_AMOUNT', 'FUNDED_AMOUNT_INVESTOR', 'TERM', 'INTEREST_RATE', 'DEBIT_TO_INCOME',
+    'DELINQUENCY_TWO_YEARS', 'INQUIRES_SIX_MONTHS', 'OPEN_ACCOUNT', 'PUBLIC_RECORD', 'REVOLVING_BALANCE',
+    'REVOLVING_UTILITIES', 'TOTAL_ACCOUNTS', 'TOTAL_RECEIVED_INTEREST', 'TOTAL_RECEIVED_LATE_FEE', 'RECOVERIES',
+    'COLLECTION_RECOVERY_FEE', 'COLLECTION_12_MONTHS_MEDICAL', 'LAST_WEEK_PAY', 'TOTAL_COLLECTION_AMOUNT',
+    'TOTAL_CURRENT_BALANCE', 'TOTAL_REVOLVING_CREDIT_LIMIT',
+]
+
+
+def standardise_column_name(column: str) -> str:
+    """
+    Standardises a raw column name, e.g. 'Delinquency - two years' to 'DELINQUENCY_TWO_YEARS'.
+    """
+    return re.sub(r'[\s-]+', '_', column).upper()
+
+
+# ============================== Auxiliary Functions ==============================
+def _standardise_column_names(data_df: pd.DataFrame) -> pd.DataFrame:
+    data_df.columns = [standardise_column_name(x) for x in data_df.columns]
+
+    # There is a correction whereby the 'EMPLOYMENT_DURATION' column is wrongly labelled. The data contained within is
+    # actually the 'HOME_OWNERSHIP' column.
+    data_df['__HOME_OWNERSHIP__'] = data_df['HOME_OWNERSHIP']  # NOTE: Still unsure what this column represents
+    data_df['HOME_OWNERSHIP'] = data_df['EMPLOYMENT_DURATION']
+    data_df = data_df.drop(columns=['EMPLOYMENT_DURATION'])
+
+    return data_df
+
+
+def _cast_numeric(values: pd.Series, dtype: str) -> pd.Series:
+    if values.dtype == dtype:
+        return values
+    # Integer columns can only be restored when the batch holds no missing or fractional values
+    if pd.api.types.is_integer_dtype(dtype) and (values.isna().any() or (values % 1 != 0).any()):
+        logging.getLogger(__name__).warning(f"Column '{values.name}' cannot be cast to {dtype}, keeping float64.")
+        return values.astype('float64')
+    return values.astype(dtype)
+
+
+# ============================== Main Classes ==============================
+@dataclass
+class PreprocessingPlan:
+    """
+    Frozen preprocessing state learnt from the training dataset. Fitting is done once, after which every batch is
+    transformed using only its own rows (no reference dataset scans or copies).
+
+    Attributes:
+        categories (dict): Category vocabulary for each of the fitted categorical variables.
+        loan_title_lookup (dict): Mapping of cleaned loan titles to their normalised names.
+        numeric_dtypes (dict): Dtype each numerical variable is cast to.
+        compact_dtypes (dict): Compaction schema, i.e. the smallest dtype each column is finally stored as.
+    """
+    categories: Dict[str, List[str]]
+    loan_title_lookup: Dict[str, str]
+    numeric_dtypes: Dict[str, str]
+    compact_dtypes: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def fit_vocabularies(cls, data_df: pd.DataFrame) -> "PreprocessingPlan":
+        """
+        Learns the category vocabularies, loan title lookup and numeric dtypes from a raw dataset, which are all that
+        `convert` needs. The compaction schema is left to `fit_compaction`.
+        """
+        raw_columns = {standardise_column_name(x): x for x in data_df.columns}
+        loan_title_lookup = dict(LOAN_TITLE_ALIASES)
+
+        categories = {}
+        for var in FITTED_CATEGORICAL_VARIABLES:
+            if var == 'LOAN_TITLE':
+                categories[var] = normalise_loan_titles(data_df[raw_columns[var]], loan_title_lookup).cat.categories.tolist()
+            else:
+                categories[var] = sorted(data_df[raw_columns[var]].dropna().unique())
+
+        numeric_dtypes = {
+            var: str(pd.to_numeric(data_df[raw_columns[var]], errors='coerce').dtype) for var in NUMERICAL_VARIABLES
+        }
+        return cls(categories=categories, loan_title_lookup=loan_title_lookup, numeric_dtypes=numeric_dtypes)
+
+    @classmethod
+    def fit(cls, data_df: pd.DataFrame) -> "PreprocessingPlan":
+        """
+        Learns the preprocessing state from a raw dataset. The dataset itself is left untouched.
+        """
+        plan = cls.fit_vocabularies(data_df)
+        # The compaction schema is inferred from the converted training dataset
+        plan.fit_compaction(plan.convert(data_df.copy(deep=False)))
+        return plan
+
+    @classmethod
+    def fit_transform(cls, data_df: pd.DataFrame) -> Tuple["PreprocessingPlan", pd.DataFrame]:
+        """
+        Learns the preprocessing state from a raw dataset and returns it with the transformed dataset, converting the
+        dataset once for both.
+        """
+        plan = cls.fit_vocabularies(data_df)
+        converted_df = plan.convert(data_df)
+        plan.fit_compaction(converted_df)
+        return plan, plan.compact(converted_df, strict=True)
+
+    def fit_compaction(self, converted_df: pd.DataFrame):
+        """
+        Infers the compaction schema from the converted (see `convert`) training dataset.
+        """
+        self.compact_dtypes = infer_compact_dtypes(converted_df)
+
+    def transform(self, data_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Standardises column names, converts the categorical and numerical variables of a raw dataset and compacts its
+        columns to the smallest dtypes holding their values unchanged.
+        """
+        return self.compact(self.convert(data_df))
+
+    def convert(self, data_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Standardises column names and converts the categorical and numerical variables of a raw dataset. Only needs
+        the vocabularies of the plan, not its compaction schema.
+        """
+        data_df = _standardise_column_names(data_df)
+
+        # Managing strings so that they are in Categorical format
+        data_df['ID'] = data_df['ID'].astype(str)
+        data_df['BATCH_ENROLLED'] = data_df['BATCH_ENROLLED'].astype(str)
+        for var, ordered in FITTED_CATEGORICAL_VARIABLES.items():
+            if var == 'LOAN_TITLE':
+                data_df[var] = normalise_loan_titles(data_df[var], self.loan_title_lookup, categories=self.categories[var])
+            else:
+                data_df[var] = pd.Categorical(data_df[var], categories=self.categories[var], ordered=ordered)
+        data_df['INITIAL_LIST_STATUS'] = pd.Categorical(
+            data_df['INITIAL_LIST_STATUS'].replace(INITIAL_LIST_STATUS_LABELS),
+            categories=list(INITIAL_LIST_STATUS_LABELS.values()), ordered=False
+        )
+
+        for var, dtype in self.numeric_dtypes.items():
+            data_df[var] = _cast_numeric(pd.to_numeric(data_df[var], errors='coerce'), dtype)
+        return data_df
+
+    def compact(self, data_df: pd.DataFrame, strict: bool=False) -> pd.DataFrame:
+        """
+        Compacts the columns of a converted dataset to the compaction schema, if one was fitted. Only the dataset the
+        schema was fitted on is compacted `strict`ly: new data (e.g. scoring batches) holding values the schema cannot
+        hold unchanged has those columns widened instead (see `compact_dataset`).
+        """
+        if self.compact_dtypes:
+            data_df, report = compact_dataset(data_df, self.compact_dtypes, strict)
+            logging.getLogger(__name__).info(
+                f"Compacted dataset from {report.loc['TOTAL', 'memory_before_bytes'] / 1024 ** 2:,.1f} MB to "
+                f"{report.loc['TOTAL', 'memory_after_bytes'] / 1024 ** 2:,.1f} MB:\n{report.to_string()}"
+            )
+        return data_df
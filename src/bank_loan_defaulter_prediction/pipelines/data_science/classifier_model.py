@@ -0,0 +1,85 @@
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+
+from .explanations import (
+    encoded_feature_groups,
+    feature_contributions,
+    top_contributions,
+)
+from .feature_matrix_cache import FeatureMatrix, to_feature_matrix
+
+
+class ClassifierModel:
+    """
+    The fitted sklearn Pipeline bundled with the input features it expects and its decision threshold, so that both
+    are persisted with the model. Probabilities and thresholded labels are derived from a single inference pass.
+
+    Attributes:
+        pipeline (Pipeline): The fitted sklearn Pipeline (preprocessor and classifier).
+        input_features (list): Columns passed to the pipeline, in order.
+        threshold (float): Probability above which an application is labelled as the positive class.
+    """
+
+    def __init__(self, pipeline: Pipeline, input_features: List[str], threshold: float=0.5):
+        self.pipeline = pipeline
+        self.input_features = list(input_features)
+        self.threshold = threshold
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.pipeline.classes_
+
+    @property
+    def preprocessor(self) -> ColumnTransformer:
+        # The fitted step itself, not a Pipeline slice, as the feature matrix cache keys the matrices on it
+        return self.pipeline.named_steps['preprocessor']
+
+    @property
+    def classifier(self):
+        return self.pipeline.steps[-1][1]
+
+    def transform(self, data_df: pd.DataFrame) -> FeatureMatrix:
+        """
+        Encodes the data frame into the float32 feature matrix the classifier was fitted on.
+        """
+        return to_feature_matrix(self.preprocessor.transform(data_df[self.input_features]))
+
+    def score_matrix(self, X: FeatureMatrix) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the positive class probabilities and the thresholded labels of an already encoded feature matrix from
+        one `predict_proba` pass.
+        """
+        pred_proba = self.classifier.predict_proba(X)[:, 1]
+        pred = self.classes_[(pred_proba > self.threshold).astype(int)]
+        return pred_proba, pred
+
+    def predict_scores(self, data_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the positive class probabilities and the thresholded labels from one `predict_proba` pass.
+        """
+        return self.score_matrix(self.transform(data_df))
+
+    def predict_proba(self, data_df: pd.DataFrame) -> np.ndarray:
+        return self.classifier.predict_proba(self.transform(data_df))
+
+    def predict(self, data_df: pd.DataFrame) -> np.ndarray:
+        return self.predict_scores(data_df)[1]
+
+    def predict_contributions(self, data_df: pd.DataFrame, method: str='shap') -> np.ndarray:
+        """
+        Returns the (rows x input features) contributions of each input feature to the score of each row (see
+        `feature_contributions`), the contributions of the columns a feature is encoded into (e.g. one-hot) summed.
+        """
+        groups = encoded_feature_groups(self.preprocessor, self.input_features)
+        return np.asarray(feature_contributions(self.classifier, self.transform(data_df), method) @ groups)
+
+    def reason_codes(self, data_df: pd.DataFrame, n_reasons: int=3, method: str='shap') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the positions in `input_features` of the `n_reasons` features contributing most towards the positive
+        class for each row, and their contributions, in decreasing order.
+        """
+        return top_contributions(self.predict_contributions(data_df, method), n_reasons)
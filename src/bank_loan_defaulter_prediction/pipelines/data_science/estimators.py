@@ -0,0 +1,108 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from kedro.utils import load_obj
+from lightgbm import LGBMModel
+from sklearn.base import BaseEstimator, ClassifierMixin, TransformerMixin
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+# Values of `model_options.preprocessing`
+PREPROCESSING_MODES = ('one_hot', 'native_categorical')
+
+
+# ============================== Main Classes ==============================
+class CategoryCodeEncoder(BaseEstimator, TransformerMixin):
+    """
+    Encodes categorical columns as their integer category codes, for classifiers handling categories natively.
+    Categories are taken from the pandas Categorical dtype when the column has one (as set by the preprocessing
+    plan), otherwise from the sorted values seen in fit. Missing and unseen values are encoded as -1, which LightGBM
+    treats as missing.
+
+    Attributes:
+        categories_ (list): Categories of each column, whose positions are the codes.
+    """
+
+    def fit(self, X: pd.DataFrame, y=None):
+        self.categories_ = [
+            X[col].cat.categories if isinstance(X[col].dtype, pd.CategoricalDtype) else pd.Index(sorted(X[col].dropna().unique()))
+            for col in X.columns
+        ]
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        return self
+
+    def transform(self, X: pd.DataFrame) -> np.ndarray:
+        return np.column_stack([
+            pd.Categorical(X[col], categories=categories).codes.astype(np.float32)
+            for col, categories in zip(X.columns, self.categories_)
+        ])
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        return self.feature_names_in_
+
+
+# ============================== Main Functions ==============================
+def build_preprocessor(features: Dict, preprocessing: str='one_hot') -> ColumnTransformer:
+    """
+    Builds the (unfitted) preprocessing step of the model pipeline. With 'one_hot', numerical features are
+    standardised and categorical ones one-hot encoded. With 'native_categorical', numerical features are passed
+    through unscaled (trees are insensitive to scaling) and categorical ones are encoded as category codes.
+    """
+    if preprocessing not in PREPROCESSING_MODES:
+        raise ValueError(f"Unknown preprocessing '{preprocessing}', expected one of {PREPROCESSING_MODES}.")
+    if preprocessing == 'native_categorical':
+        return ColumnTransformer(
+            transformers=[
+                ('numeric', 'passthrough', features['numeric']),
+                ('categorical', CategoryCodeEncoder(), features['categorical'])
+            ]
+        )
+
+    # Preprocessing for numerical data
+    numerical_transformer = Pipeline(steps=[
+        ('scaler', StandardScaler())
+    ])
+    # Preprocessing for categorical data
+    categorical_transformer = Pipeline(steps=[
+        ('imputer', SimpleImputer(strategy='constant', fill_value='missing')),
+        ('onehot', OneHotEncoder(handle_unknown='ignore'))
+    ])
+    # Combine preprocessing steps
+    return ColumnTransformer(
+        transformers=[
+            ('numeric', numerical_transformer, features['numeric']),
+            ('categorical', categorical_transformer, features['categorical'])
+        ]
+    )
+
+
+def build_estimator(estimator_spec: Dict, random_state: int=None) -> ClassifierMixin:
+    """
+    Instantiates the classifier described by `estimator_spec`, e.g.
+    `{'class': 'lightgbm.LGBMClassifier', 'params': {'num_leaves': 63}}`. The random state is set on estimators
+    accepting one.
+    """
+    estimator = load_obj(estimator_spec['class'])(**estimator_spec.get('params', {}))
+    if random_state is not None and 'random_state' in estimator.get_params():
+        estimator.set_params(random_state=random_state)
+    return estimator
+
+
+def supports_native_categorical(estimator_class: str) -> bool:
+    return issubclass(load_obj(estimator_class), LGBMModel)
+
+
+def categorical_fit_params(estimator: ClassifierMixin, features: Dict, preprocessing: str='one_hot') -> Dict[str, List]:
+    """
+    Keyword arguments of `estimator.fit` declaring the category code columns output by the 'native_categorical'
+    preprocessing (they follow the numerical ones).
+    """
+    if preprocessing != 'native_categorical':
+        return {}
+    if not isinstance(estimator, LGBMModel):
+        raise ValueError(f"'native_categorical' preprocessing requires a LightGBM classifier, got {type(estimator).__name__}.")
+    n_numeric = len(features['numeric'])
+    return {'categorical_feature': list(range(n_numeric, n_numeric + len(features['categorical'])))}
@@ -0,0 +1,157 @@
+import weakref
+from typing import List, Tuple
+
+import numpy as np
+from lightgbm import LGBMClassifier
+from scipy import sparse
+from sklearn.compose import ColumnTransformer
+
+from .feature_matrix_cache import FeatureMatrix
+
+EXPLANATION_METHODS = ('shap', 'path')
+
+# (leaves x features) path tables of the fitted LightGBM classifiers explained so far, built once per classifier
+_LIGHTGBM_LEAF_PATHS = weakref.WeakKeyDictionary()
+
+
+# ============================== Auxiliary Functions ==============================
+def _encoded_widths(transformer, columns: List[str]) -> List[int]:
+    """
+    Number of encoded columns each input column of a ColumnTransformer step is expanded into.
+    """
+    onehot = getattr(transformer, 'named_steps', {}).get('onehot')
+    if onehot is None:
+        return [1] * len(columns)
+    if onehot.drop_idx_ is not None or any(x is not None for x in getattr(onehot, 'infrequent_categories_', [])):
+        raise ValueError("One-hot encoders dropping or grouping categories cannot be explained.")
+    return [len(x) for x in onehot.categories_]
+
+
+def _lightgbm_contributions(classifier, X: FeatureMatrix) -> FeatureMatrix:
+    # SHAP values in log-odds from LightGBM's tree traversal; the last column is the expected value
+    return classifier.predict(X, pred_contrib=True)[:, :-1]
+
+
+def _lightgbm_leaf_paths(classifier) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    (leaves of all trees x features) matrix of the changes of raw score along the path from the root of each tree to
+    each of its leaves, credited to the features split on, and the offset of each tree's first leaf in it.
+    """
+    if classifier not in _LIGHTGBM_LEAF_PATHS:
+        trees = classifier.booster_.dump_model()['tree_info']
+        offsets = np.cumsum([0] + [x['num_leaves'] for x in trees])
+        leaves, features, deltas = [], [], []
+        for offset, tree in zip(offsets, trees):
+            stack = [(tree['tree_structure'], {})]
+            while stack:
+                node, path = stack.pop()
+                if 'split_index' not in node:
+                    leaves += [offset + node.get('leaf_index', 0)] * len(path)
+                    features += path.keys()
+                    deltas += path.values()
+                    continue
+                feature = node['split_feature']
+                for child in (node['left_child'], node['right_child']):
+                    value = child['internal_value'] if 'split_index' in child else child['leaf_value']
+                    stack.append((child, {**path, feature: path.get(feature, 0) + value - node['internal_value']}))
+        paths = sparse.csr_matrix((deltas, (leaves, features)), shape=(offsets[-1], classifier.n_features_in_))
+        _LIGHTGBM_LEAF_PATHS[classifier] = paths, offsets[:-1]
+    return _LIGHTGBM_LEAF_PATHS[classifier]
+
+
+def _lightgbm_path_contributions(classifier, X: FeatureMatrix) -> np.ndarray:
+    """
+    Decision path attributions of LightGBM, in log-odds: the leaf each row reaches in each tree (LightGBM's native
+    `pred_leaf` output) selects the path changes of that leaf, which are summed over the trees. Unlike SHAP values,
+    their cost does not grow with the depth of the trees.
+    """
+    paths, offsets = _lightgbm_leaf_paths(classifier)
+    leaves = classifier.predict(X, pred_leaf=True) + offsets
+    n_rows, n_trees = leaves.shape
+    # (rows x leaves of all trees) indicator of the leaf reached in each tree
+    reached = sparse.csr_matrix(
+        (np.ones(leaves.size), leaves.ravel(), np.arange(0, leaves.size + 1, n_trees)), shape=(n_rows, paths.shape[0])
+    )
+    return (reached @ paths).toarray()
+
+
+def _linear_contributions(classifier, X: FeatureMatrix) -> FeatureMatrix:
+    # Terms of the log-odds: standardised numerical features contribute relative to their training mean
+    coef = classifier.coef_[0]
+    return X.multiply(coef).tocsr() if sparse.issparse(X) else X * coef
+
+
+def _forest_contributions(classifier, X: FeatureMatrix) -> np.ndarray:
+    """
+    Decision path attributions of a random forest or extra trees, in probability: every split on a row's path
+    credits its feature with the change of the positive class probability from the node to the child taken. They
+    are averaged over the trees as the probabilities are.
+    """
+    n_features = X.shape[1]
+    contributions = np.zeros((X.shape[0], n_features))
+    for estimator in classifier.estimators_:
+        tree = estimator.tree_
+        value = tree.value[:, 0, 1] / tree.value[:, 0, :].sum(axis=1)
+        internal = np.flatnonzero(tree.children_left >= 0)
+        parent = np.full(tree.node_count, -1)
+        parent[tree.children_left[internal]] = internal
+        parent[tree.children_right[internal]] = internal
+        child = np.flatnonzero(parent >= 0)
+        # (nodes x features) change of probability into each child, on the feature split by its parent
+        deltas = sparse.csr_matrix(
+            (value[child] - value[parent[child]], (child, tree.feature[parent[child]])), shape=(tree.node_count, n_features)
+        )
+        contributions += (estimator.decision_path(X) @ deltas).toarray()
+    return contributions / len(classifier.estimators_)
+
+
+# ============================== Main Functions ==============================
+def encoded_feature_groups(preprocessor: ColumnTransformer, input_features: List[str]) -> np.ndarray:
+    """
+    (encoded columns x input features) indicator matrix mapping each column of the preprocessor's output to the
+    input feature it encodes, e.g. the one-hot columns of GRADE to GRADE.
+    """
+    n_encoded = max(x.stop for x in preprocessor.output_indices_.values())
+    groups = np.zeros((n_encoded, len(input_features)))
+    for name, transformer, columns in preprocessor.transformers_:
+        if name == 'remainder' or transformer == 'drop':
+            continue
+        offset = preprocessor.output_indices_[name].start
+        for column, width in zip(columns, _encoded_widths(transformer, columns)):
+            groups[offset:offset + width, input_features.index(column)] = 1
+            offset += width
+    return groups
+
+
+def feature_contributions(classifier, X: FeatureMatrix, method: str='shap') -> FeatureMatrix:
+    """
+    Contribution of each encoded column to the score of each row: for LightGBM, SHAP values (from its native
+    `pred_contrib` output) or, with the `path` method, decision path attributions, both in log-odds; the terms of the
+    log-odds for logistic regressions, and decision path attributions in probability for random forests and extra
+    trees, whatever the method.
+    """
+    if method not in EXPLANATION_METHODS:
+        raise ValueError(f"Unknown explanation method '{method}', expected one of {EXPLANATION_METHODS}.")
+    # Imported here, as sklearn.ensemble and sklearn.linear_model are slow to import and only needed to explain
+    from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    if isinstance(classifier, LGBMClassifier):
+        return _lightgbm_contributions(classifier, X) if method == 'shap' else _lightgbm_path_contributions(classifier, X)
+    if isinstance(classifier, LogisticRegression):
+        return _linear_contributions(classifier, X)
+    if isinstance(classifier, (RandomForestClassifier, ExtraTreesClassifier)):
+        return _forest_contributions(classifier, X)
+    raise ValueError(f"Classifiers of type {type(classifier).__name__} cannot be explained.")
+
+
+def top_contributions(contributions: np.ndarray, n_reasons: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Positions and values of the `n_reasons` largest contributions of each row, in decreasing order.
+    """
+    n_reasons = min(n_reasons, contributions.shape[1])
+    # Partial sort of each row, then a full sort of the selected columns only
+    positions = np.argpartition(-contributions, n_reasons - 1, axis=1)[:, :n_reasons]
+    values = np.take_along_axis(contributions, positions, axis=1)
+    order = np.argsort(-values, axis=1, kind='stable')
+    return np.take_along_axis(positions, order, axis=1), np.take_along_axis(values, order, axis=1)
@@ -0,0 +1,133 @@
+import logging
+import pickle
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import TransformerMixin, clone
+
+from ...fingerprint import fingerprint_data
+
+logger = logging.getLogger(__name__)
+
+FeatureMatrix = Union[np.ndarray, sparse.csr_matrix]
+
+
+# ============================== Auxiliary Functions ==============================
+def to_feature_matrix(X) -> FeatureMatrix:
+    """
+    Casts the output of the preprocessor to the representation the classifiers are fitted on and score: a float32 CSR
+    matrix when sparse, a float32 array otherwise.
+    """
+    if sparse.issparse(X):
+        return sparse.csr_matrix(X, dtype=np.float32)
+    return np.asarray(X, dtype=np.float32)
+
+
+# ============================== Main Classes ==============================
+class FeatureMatrixCache:
+    """
+    On-disk cache of fitted preprocessors and of the feature matrices they output, so that training, evaluation and
+    the hyperparameter search do not re-encode the same frames every time.
+
+    Fitted preprocessors are keyed by the unfitted preprocessor (its parameters) and the fingerprint of the frame it
+    is fitted on; feature matrices by the fitted preprocessor and the fingerprint of the transformed frame. Dense
+    matrices are memory-mapped on load. Least-recently-used entries, preprocessors and matrices alike, are evicted
+    beyond `max_size_mb`.
+
+    Attributes:
+        cache_dir (Path): Directory in which the entries are stored.
+        max_size_mb (float): Disk budget for the cache, in megabytes.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: float=4096):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_mb = max_size_mb
+
+    def _lookup(self, key: str, suffix: str) -> Path:
+        entry = self.cache_dir / f"{key}{suffix}"
+        if entry.exists():
+            entry.touch()  # Marks the entry as recently used
+            return entry
+        return None
+
+    def _evict(self):
+        # Fitted preprocessors and feature matrices share the budget and the least-recently-used order. Entries may be
+        # evicted concurrently by other processes using the same cache (e.g. the cross-validation folds).
+        entries = []
+        for entry in self.cache_dir.glob('*.*'):
+            try:
+                entries.append((entry.stat(), entry))
+            except FileNotFoundError:
+                continue
+        entries.sort(key=lambda x: x[0].st_mtime)
+        total_size = sum(stat.st_size for stat, _ in entries)
+        while entries and total_size > self.max_size_mb * 1024 ** 2:
+            stat, entry = entries.pop(0)
+            total_size -= stat.st_size
+            entry.unlink(missing_ok=True)
+            logger.info(f"Evicted cached entry {entry.name}")
+
+    def _store_matrix(self, key: str, X: FeatureMatrix):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if sparse.issparse(X):
+            sparse.save_npz(self.cache_dir / f"{key}.npz", X, compressed=False)
+        else:
+            np.save(self.cache_dir / f"{key}.npy", X)
+        self._evict()
+
+    def _store_preprocessor(self, key: str, preprocessor: TransformerMixin):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / f"{key}.pickle", 'wb') as f:
+            pickle.dump(preprocessor, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._evict()
+
+    def _load_matrix(self, key: str) -> Optional[FeatureMatrix]:
+        entry = self._lookup(key, '.npy')
+        if entry is not None:
+            return np.load(entry, mmap_mode='r')
+        entry = self._lookup(key, '.npz')
+        if entry is not None:
+            return sparse.load_npz(entry)
+        return None
+
+    def _load_or_transform(self, preprocessor: TransformerMixin, data_df: pd.DataFrame, data_fingerprint: str):
+        key = joblib.hash([joblib.hash(preprocessor), data_fingerprint])
+        X = self._load_matrix(key)
+        if X is None:
+            X = to_feature_matrix(preprocessor.transform(data_df))
+            self._store_matrix(key, X)
+        return X
+
+    def load(self, preprocessor: TransformerMixin, data_df: pd.DataFrame) -> Optional[FeatureMatrix]:
+        """
+        Returns the cached feature matrix of `data_df` through the fitted `preprocessor`, or None when it was never
+        encoded. Unlike `transform`, nothing is encoded or stored on a miss.
+        """
+        return self._load_matrix(joblib.hash([joblib.hash(preprocessor), fingerprint_data(data_df)]))
+
+    def transform(self, preprocessor: TransformerMixin, data_df: pd.DataFrame) -> FeatureMatrix:
+        """
+        Returns the feature matrix of `data_df` through the fitted `preprocessor`, encoding it only on a cache miss.
+        """
+        return self._load_or_transform(preprocessor, data_df, fingerprint_data(data_df))
+
+    def fit_transform(self, preprocessor: TransformerMixin, data_df: pd.DataFrame) -> Tuple[TransformerMixin, FeatureMatrix]:
+        """
+        Fits a clone of the unfitted `preprocessor` on `data_df`, returning it with the feature matrix of `data_df`.
+        Both are reused from the cache when the same preprocessor was already fitted on the same frame.
+        """
+        data_fingerprint = fingerprint_data(data_df)
+        fitted_preprocessor = clone(preprocessor)
+        key = joblib.hash([joblib.hash(fitted_preprocessor), data_fingerprint])
+        entry = self._lookup(key, '.pickle')
+        if entry is not None:
+            with open(entry, 'rb') as f:
+                fitted_preprocessor = pickle.load(f)
+        else:
+            fitted_preprocessor.fit(data_df)
+            self._store_preprocessor(key, fitted_preprocessor)
+        return fitted_preprocessor, self._load_or_transform(fitted_preprocessor, data_df, data_fingerprint)
@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# ============================== Main Classes ==============================
+@dataclass
+class ClassificationReport:
+    """
+    Cumulative true/false positive counts of a binary classifier's scores, from which the ROC and precision-recall
+    curves, their areas, confusion matrices at any threshold and optimal thresholds are all derived without sorting
+    the scores again. The decision threshold the scores were labelled with is kept with the counts, so that reports
+    read later (e.g. by the reporting pipeline) use the threshold of the model that produced them.
+
+    Counts are taken at each distinct score (in decreasing order): `tps[i]` and `fps[i]` are the positives and
+    negatives scoring at least `cutoffs[i]`. Thresholds follow the labelling of `ClassifierModel`, i.e. a score is
+    labelled positive when strictly above the threshold.
+
+    Attributes:
+        n_positives (int): Number of positive samples.
+        n_negatives (int): Number of negative samples.
+        cutoffs (np.ndarray): Distinct scores, in decreasing order.
+        tps (np.ndarray): Cumulative true positives at each cutoff.
+        fps (np.ndarray): Cumulative false positives at each cutoff.
+        decision_threshold (float): Threshold the scores were labelled with.
+    """
+    n_positives: int
+    n_negatives: int
+    cutoffs: np.ndarray
+    tps: np.ndarray
+    fps: np.ndarray
+    decision_threshold: float = 0.5
+
+    @classmethod
+    def from_scores(
+        cls, y_true: Sequence, y_score: Sequence, pos_label=1, decision_threshold: float=0.5
+    ) -> "ClassificationReport":
+        """
+        Builds the report from a single sort of the scores.
+        """
+        y_true = np.asarray(y_true) == pos_label
+        y_score = np.asarray(y_score, dtype=np.float64)
+        order = np.argsort(y_score, kind='mergesort')[::-1]
+        y_score, y_true = y_score[order], y_true[order]
+        # Last position of each run of equal scores
+        last_idx = np.r_[np.flatnonzero(np.diff(y_score)), len(y_score) - 1]
+        tps = np.cumsum(y_true)[last_idx]
+        fps = last_idx + 1 - tps
+        return cls(int(y_true.sum()), int(len(y_true) - y_true.sum()), y_score[last_idx], tps, fps, decision_threshold)
+
+    # ------------------------------ Curves ------------------------------
+    @property
+    def fpr(self) -> np.ndarray:
+        return np.r_[0, self.fps] / self.n_negatives
+
+    @property
+    def tpr(self) -> np.ndarray:
+        return np.r_[0, self.tps] / self.n_positives
+
+    @property
+    def roc_auc(self) -> float:
+        # Undefined with a single class, for which sklearn's `roc_auc_score` raises alike
+        if self.n_positives == 0 or self.n_negatives == 0:
+            raise ValueError("Only one class present in y_true. ROC AUC score is not defined in that case.")
+        fpr, tpr = self.fpr, self.tpr
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+    @property
+    def precision(self) -> np.ndarray:
+        return self.tps / (self.tps + self.fps)
+
+    @property
+    def recall(self) -> np.ndarray:
+        return self.tps / self.n_positives
+
+    @property
+    def average_precision(self) -> float:
+        # Without positives, recall is taken as one at every cutoff (as by sklearn), so the average precision is 0
+        if self.n_positives == 0:
+            return 0.0
+        return float(np.sum(np.diff(np.r_[0, self.recall]) * self.precision))
+
+    # ------------------------------ Thresholds ------------------------------
+    def _counts_above(self, thresholds: np.ndarray):
+        """
+        True and false positives among the scores strictly above each threshold.
+        """
+        n_cutoffs_above = np.searchsorted(-self.cutoffs, -np.asarray(thresholds, dtype=np.float64), side='left')
+        return np.r_[0, self.tps][n_cutoffs_above], np.r_[0, self.fps][n_cutoffs_above]
+
+    def confusion_matrix(self, threshold: float) -> np.ndarray:
+        """
+        Confusion matrix at the threshold, laid out as sklearn's `[[tn, fp], [fn, tp]]`.
+        """
+        tp, fp = (int(x[0]) for x in self._counts_above([threshold]))
+        return np.array([[self.n_negatives - fp, fp], [self.n_positives - tp, tp]])
+
+    def threshold_table(self, thresholds: Sequence[float], costs: Dict[str, float]=None) -> pd.DataFrame:
+        """
+        Confusion matrix counts and derived metrics at each of the thresholds, in one vectorised pass.
+        """
+        tp, fp = self._counts_above(thresholds)
+        fn, tn = self.n_positives - tp, self.n_negatives - fp
+        with np.errstate(divide='ignore', invalid='ignore'):
+            table = pd.DataFrame({
+                'threshold': thresholds,
+                'tn': tn,
+                'fp': fp,
+                'fn': fn,
+                'tp': tp,
+                'accuracy': (tp + tn) / (self.n_positives + self.n_negatives),
+                'precision': np.where(tp + fp > 0, tp / (tp + fp), 0.0),
+                'recall': tp / self.n_positives,
+                'f1': 2 * tp / (2 * tp + fp + fn),
+            })
+        if costs is not None:
+            table['cost'] = costs['false_positive'] * fp + costs['false_negative'] * fn
+        return table
+
+    def metrics_at(self, threshold: float) -> Dict[str, float]:
+        row = self.threshold_table([threshold]).iloc[0]
+        return {
+            "roc_auc": self.roc_auc,
+            "average_precision": self.average_precision,
+            "accuracy": float(row['accuracy']),
+            "precision": float(row['precision']),
+            "recall": float(row['recall']),
+            "f1": float(row['f1']),
+        }
+
+    def _optimal_threshold(self, objective: np.ndarray) -> float:
+        """
+        Threshold labelling positive the scores at or above the cutoff maximising `objective` (evaluated at each
+        cutoff), expressed as a strict threshold halfway to the next lower cutoff.
+        """
+        best = int(np.argmax(objective))
+        if best + 1 < len(self.cutoffs):
+            return float((self.cutoffs[best] + self.cutoffs[best + 1]) / 2)
+        return float(np.nextafter(self.cutoffs[best], -np.inf))
+
+    def f1_optimal_threshold(self) -> float:
+        return self._optimal_threshold(2 * self.tps / (self.tps + self.fps + self.n_positives))
+
+    def cost_optimal_threshold(self, costs: Dict[str, float]) -> float:
+        """
+        Threshold minimising `costs['false_positive'] * fp + costs['false_negative'] * fn`. Labelling no sample
+        positive is also considered.
+        """
+        cost = costs['false_positive'] * self.fps + costs['false_negative'] * (self.n_positives - self.tps)
+        if costs['false_negative'] * self.n_positives <= cost.min():
+            return float(self.cutoffs[0])
+        return self._optimal_threshold(-cost)
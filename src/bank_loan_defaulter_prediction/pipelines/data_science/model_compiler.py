@@ -0,0 +1,202 @@
+import re
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from lightgbm import LGBMClassifier
+from sklearn.compose import ColumnTransformer
+
+from ...compiled_model import (
+    FORMAT_VERSION,
+    MISSING_NAN,
+    MISSING_NONE,
+    MISSING_ZERO,
+    CompiledModel,
+)
+from .classifier_model import ClassifierModel
+from .estimators import CategoryCodeEncoder
+
+LIGHTGBM_MISSING_TYPES = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+# The compiled model only scores the positive class of binary classifiers
+N_CLASSES = 2
+
+
+# ============================== Auxiliary Functions ==============================
+def _to_builtin(values) -> List[Any]:
+    # Categories become JSON values (numpy scalars are not serialisable)
+    return [x.item() if isinstance(x, np.generic) else x for x in values]
+
+
+def _add_node(nodes: List[Dict], **fields) -> int:
+    """
+    Appends a tree node, by default a leaf pointing to itself, and returns its index.
+    """
+    idx = len(nodes)
+    nodes.append({
+        'feature': 0, 'threshold': 0.0, 'left': idx, 'right': idx, 'default_left': False,
+        'missing_type': MISSING_NONE, 'categorical_split': -1, 'value': 0.0, **fields
+    })
+    return idx
+
+
+def _flatten_lightgbm_tree(tree: Dict, nodes: List[Dict], categorical_splits: List[List[int]]) -> Tuple[int, int]:
+    """
+    Appends the nodes of a tree of `Booster.dump_model()`, returning the index of its root and its depth.
+    """
+    if 'leaf_value' in tree:
+        if 'leaf_coeff' in tree:
+            raise ValueError("LightGBM models with linear trees cannot be compiled.")
+        return _add_node(nodes, value=tree['leaf_value']), 0
+    idx = _add_node(
+        nodes, feature=tree['split_feature'], default_left=tree['default_left'],
+        missing_type=LIGHTGBM_MISSING_TYPES[tree['missing_type']]
+    )
+    if tree['decision_type'] == '==':
+        # Categorical split: the listed category codes go left
+        nodes[idx]['categorical_split'] = len(categorical_splits)
+        categorical_splits.append([int(x) for x in str(tree['threshold']).split('||')])
+    else:
+        nodes[idx]['threshold'] = float(tree['threshold'])
+    left, left_depth = _flatten_lightgbm_tree(tree['left_child'], nodes, categorical_splits)
+    right, right_depth = _flatten_lightgbm_tree(tree['right_child'], nodes, categorical_splits)
+    nodes[idx].update(left=left, right=right)
+    return idx, 1 + max(left_depth, right_depth)
+
+
+def _tree_arrays(nodes: List[Dict], roots: List[int], categorical_splits: List[List[int]]) -> Dict[str, np.ndarray]:
+    n_categories = max((max(x) + 1 for x in categorical_splits), default=0)
+    # One more column for the codes that are never listed (NaN, negative or unseen), which go right
+    categorical_left = np.zeros((len(categorical_splits), n_categories + 1), dtype=bool)
+    for i, categories in enumerate(categorical_splits):
+        categorical_left[i, categories] = True
+    return {
+        'roots': np.array(roots, dtype=np.int32),
+        'feature': np.array([x['feature'] for x in nodes], dtype=np.int32),
+        'threshold': np.array([x['threshold'] for x in nodes], dtype=np.float64),
+        'left': np.array([x['left'] for x in nodes], dtype=np.int32),
+        'right': np.array([x['right'] for x in nodes], dtype=np.int32),
+        'default_left': np.array([x['default_left'] for x in nodes], dtype=bool),
+        'missing_type': np.array([x['missing_type'] for x in nodes], dtype=np.int8),
+        'categorical_split': np.array([x['categorical_split'] for x in nodes], dtype=np.int32),
+        'categorical_left': categorical_left,
+        'value': np.array([x['value'] for x in nodes], dtype=np.float64),
+    }
+
+
+def _compile_lightgbm(classifier: LGBMClassifier) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    # Same iterations as `predict_proba`, i.e. up to the best iteration when early stopping was used
+    model = classifier.booster_.dump_model()
+    sigmoid = re.match(r'binary sigmoid:([\d.eE+-]+)', model['objective'])
+    if sigmoid is None or model['num_tree_per_iteration'] != 1:
+        raise ValueError(f"Only binary LightGBM models can be compiled, got objective '{model['objective']}'.")
+
+    nodes, roots, categorical_splits, max_depth = [], [], [], 0
+    for tree_info in model['tree_info']:
+        root, depth = _flatten_lightgbm_tree(tree_info['tree_structure'], nodes, categorical_splits)
+        roots.append(root)
+        max_depth = max(max_depth, depth)
+    metadata = {
+        'model': 'trees', 'max_depth': max_depth, 'average_trees': bool(model.get('average_output', False)),
+        'link': 'sigmoid', 'sigmoid_scale': float(sigmoid.group(1)),
+    }
+    return metadata, _tree_arrays(nodes, roots, categorical_splits)
+
+
+def _compile_forest(classifier) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    arrays = {k: [] for k in ('roots', 'feature', 'threshold', 'left', 'right', 'default_left', 'missing_type', 'value')}
+    n_nodes, max_depth = 0, 0
+    for estimator in classifier.estimators_:
+        tree = estimator.tree_
+        node_idx = n_nodes + np.arange(tree.node_count)
+        is_leaf = tree.children_left < 0
+        # NaNs go to the child chosen during training (sklearn >= 1.3), otherwise values are compared as is
+        missing_go_to_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=bool))
+        arrays['roots'].append(np.array([n_nodes]))
+        arrays['feature'].append(np.where(is_leaf, 0, tree.feature))
+        arrays['threshold'].append(np.where(is_leaf, 0.0, tree.threshold))
+        arrays['left'].append(np.where(is_leaf, node_idx, n_nodes + tree.children_left))
+        arrays['right'].append(np.where(is_leaf, node_idx, n_nodes + tree.children_right))
+        arrays['default_left'].append(missing_go_to_left.astype(bool))
+        arrays['missing_type'].append(np.full(tree.node_count, MISSING_NAN if hasattr(tree, 'missing_go_to_left') else MISSING_NONE))
+        # Leaf values are the positive class probabilities
+        arrays['value'].append(tree.value[:, 0, 1] / tree.value[:, 0, :].sum(axis=1))
+        n_nodes += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    dtypes = {'roots': np.int32, 'feature': np.int32, 'threshold': np.float64, 'left': np.int32, 'right': np.int32,
+              'default_left': bool, 'missing_type': np.int8, 'value': np.float64}
+    arrays = {k: np.concatenate(v).astype(dtypes[k]) for k, v in arrays.items()}
+    arrays['categorical_split'] = np.full(n_nodes, -1, dtype=np.int32)
+    arrays['categorical_left'] = np.zeros((0, 1), dtype=bool)
+    metadata = {'model': 'trees', 'max_depth': int(max_depth), 'average_trees': True, 'link': 'identity', 'sigmoid_scale': 1.0}
+    return metadata, arrays
+
+
+def _compile_classifier(classifier) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    if len(classifier.classes_) != N_CLASSES:
+        raise ValueError(f"Only binary classifiers can be compiled, got classes {list(classifier.classes_)}.")
+    # Imported here, as sklearn.ensemble and sklearn.linear_model are slow to import and only needed when compiling
+    from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    if isinstance(classifier, LGBMClassifier):
+        return _compile_lightgbm(classifier)
+    if isinstance(classifier, (RandomForestClassifier, ExtraTreesClassifier)):
+        return _compile_forest(classifier)
+    if isinstance(classifier, LogisticRegression):
+        metadata = {'model': 'linear', 'link': 'sigmoid', 'sigmoid_scale': 1.0}
+        return metadata, {'coef': classifier.coef_[0].astype(np.float64), 'intercept': classifier.intercept_.astype(np.float64)}
+    raise ValueError(f"Classifiers of type {type(classifier).__name__} cannot be compiled.")
+
+
+def _compile_preprocessor(preprocessor: ColumnTransformer) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    transformers = {name: (transformer, columns) for name, transformer, columns in preprocessor.transformers_}
+    if set(transformers) - {'remainder'} != {'numeric', 'categorical'}:
+        raise ValueError(f"Unsupported preprocessor with transformers {sorted(transformers)}.")
+
+    # Numerical features are either standardised ('one_hot' preprocessing) or passed through ('native_categorical')
+    numeric_transformer, numeric_features = transformers['numeric']
+    scaler = getattr(numeric_transformer, 'named_steps', {}).get('scaler')
+    mean = np.zeros(len(numeric_features)) if getattr(scaler, 'mean_', None) is None else scaler.mean_
+    scale = np.ones(len(numeric_features)) if getattr(scaler, 'scale_', None) is None else scaler.scale_
+
+    categorical_transformer, categorical_features = transformers['categorical']
+    if isinstance(categorical_transformer, CategoryCodeEncoder):
+        categories = [_to_builtin(x) for x in categorical_transformer.categories_]
+        encoding, fill_value, n_features = 'codes', None, len(numeric_features) + len(categorical_features)
+    else:
+        onehot = categorical_transformer.named_steps['onehot']
+        if onehot.drop_idx_ is not None or any(x is not None for x in getattr(onehot, 'infrequent_categories_', [])):
+            raise ValueError("One-hot encoders dropping or grouping categories cannot be compiled.")
+        categories = [_to_builtin(x) for x in onehot.categories_]
+        encoding, fill_value = 'one_hot', categorical_transformer.named_steps['imputer'].fill_value
+        n_features = len(numeric_features) + sum(len(x) for x in categories)
+
+    metadata = {
+        'numeric_features': list(numeric_features),
+        'categorical_features': list(categorical_features),
+        'categorical_encoding': encoding,
+        'categories': categories,
+        'fill_value': fill_value,
+        'n_features': n_features,
+    }
+    return metadata, {'mean': np.asarray(mean, dtype=np.float64), 'scale': np.asarray(scale, dtype=np.float64)}
+
+
+# ============================== Main Functions ==============================
+def compile_classifier_model(classifier_model: ClassifierModel) -> CompiledModel:
+    """
+    Compiles the fitted preprocessor and classifier (LightGBM, random forest, extra trees or logistic regression) of
+    the model into a standalone CompiledModel.
+    """
+    preprocessor_metadata, preprocessor_arrays = _compile_preprocessor(classifier_model.pipeline.named_steps['preprocessor'])
+    classifier_metadata, classifier_arrays = _compile_classifier(classifier_model.classifier)
+    metadata = {
+        'format_version': FORMAT_VERSION,
+        **preprocessor_metadata,
+        **classifier_metadata,
+        'threshold': classifier_model.threshold,
+        'classes': _to_builtin(classifier_model.classes_),
+    }
+    if metadata['numeric_features'] + metadata['categorical_features'] != classifier_model.input_features:
+        raise ValueError("The preprocessor columns do not match the input features of the model.")
+    return CompiledModel(metadata, {**preprocessor_arrays, **classifier_arrays})
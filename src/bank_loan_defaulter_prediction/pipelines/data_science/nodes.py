@@ -1,117 +1,268 @@
 import logging
 from typing import Dict, Tuple
 
+import numpy as np
 import pandas as pd
-from lightgbm import LGBMClassifier
-from sklearn.compose import ColumnTransformer
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.impute import SimpleImputer
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
-from sklearn.model_selection import train_test_split
+from joblib import Parallel, delayed
+from sklearn.model_selection import StratifiedKFold, train_test_split
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
+from ...compiled_model import CompiledModel
+from .classifier_model import ClassifierModel
+from .estimators import build_estimator, build_preprocessor, categorical_fit_params
+from .feature_matrix_cache import FeatureMatrixCache
+from .metrics_engine import ClassificationReport
+from .model_compiler import compile_classifier_model
+from .parallel_scoring import ParallelScorer
 
-def split_data(data: pd.DataFrame, parameters: Dict) -> Tuple:
+
+# ============================== Auxiliary Functions ==============================
+def _score_rows(
+    scorer: ParallelScorer, feature_cache: FeatureMatrixCache, data: pd.DataFrame, row_idx: np.ndarray,
+    parameters: Dict
+) -> pd.DataFrame:
+    """
+    Scores the selected rows of the dataset, returning their ID, target and scores. Their feature matrix is reused
+    from the cache when they were already encoded, e.g. by `train_model`. Otherwise the rows are encoded and scored
+    by the scoring worker processes.
+    """
+    target_var = parameters['target']
+    classifier_model = scorer.classifier_model
+    rows_df = data[classifier_model.input_features].iloc[row_idx]
+    X = feature_cache.load(classifier_model.preprocessor, rows_df)
+    if X is not None:
+        pred_proba, pred = classifier_model.score_matrix(X)
+    else:
+        pred_proba, pred = scorer.predict_scores(rows_df)
+    return pd.DataFrame({
+        parameters['id_column']: data[parameters['id_column']].to_numpy()[row_idx],
+        target_var: data[target_var].to_numpy()[row_idx],
+        f'{target_var}_PRED': pred,
+        f'{target_var}_PRED_PROBA': pred_proba,
+    })
+
+
+def _fit_fold(
+    estimator_spec: Dict, data_df: pd.DataFrame, y: np.ndarray, fold: Tuple[np.ndarray, np.ndarray], parameters: Dict
+) -> np.ndarray:
     """
-    Splits data into training and validation datasets.
+    Fits the preprocessing and the classifier on the training part of a fold (its training and held-out row
+    positions), returning the positive class probabilities of the held-out part. The fold matrices are reused from
+    the feature matrix cache when the fold was already encoded.
     """
-    train_df, validation_df = train_test_split(
-        data, stratify=data[parameters['target']], test_size=parameters["validation_size"], random_state=parameters["random_state"]
+    fit_idx, validation_idx = fold
+    feature_cache = FeatureMatrixCache(**parameters['feature_cache'])
+    preprocessor, X_fit = feature_cache.fit_transform(
+        build_preprocessor(parameters['features'], parameters['preprocessing']), data_df.iloc[fit_idx]
     )
-    train_df = train_df.reset_index(drop=True).assign(DATA_GROUP='Train')
-    validation_df = validation_df.reset_index(drop=True).assign(DATA_GROUP='Validation')
-    return train_df, validation_df
-
-
-def train_model(train_df: pd.DataFrame, parameters: Dict) -> Pipeline:
-    """
-    Trains the classifier model.
-    """
-    # Setting up the Sklearn Pipeline
-    # Preprocessing for numerical data
-    numerical_transformer = Pipeline(steps=[
-        ('scaler', StandardScaler())
-    ])
-    # Preprocessing for categorical data
-    categorical_transformer = Pipeline(steps=[
-        ('imputer', SimpleImputer(strategy='constant', fill_value='missing')),
-        ('onehot', OneHotEncoder(handle_unknown='ignore'))
-    ])
-    # Combine preprocessing steps
-    preprocessor_pipeline = ColumnTransformer(
-        transformers=[
-            ('numeric', numerical_transformer, parameters['features']['numeric']),
-            ('categorical', categorical_transformer, parameters['features']['categorical'])
-        ]
+    X_validation = feature_cache.transform(preprocessor, data_df.iloc[validation_idx])
+    classifier = build_estimator(estimator_spec, random_state=parameters['random_state'])
+    classifier.fit(X_fit, y[fit_idx], **categorical_fit_params(classifier, parameters['features'], parameters['preprocessing']))
+    return classifier.predict_proba(X_validation)[:, 1]
+
+
+# ============================== Main Functions ==============================
+def split_data(data: pd.DataFrame, parameters: Dict) -> Dict[str, np.ndarray]:
+    """
+    Splits data into training and validation datasets, represented as row positions over the (memory-mapped) dataset
+    instead of two materialised copies.
+    """
+    train_idx, validation_idx = train_test_split(
+        np.arange(len(data)), stratify=data[parameters['target']], test_size=parameters["validation_size"], random_state=parameters["random_state"]
     )
-    # Create the final pipeline
-    model_pipeline = Pipeline(steps=[
-        ('preprocessor', preprocessor_pipeline),
-        # ('classifier', LogisticRegression(random_state=parameters['random_state'])),
-        # ('classifier', RandomForestClassifier(random_state=parameters['random_state'])),
-        ('classifier', LGBMClassifier(random_state=parameters['random_state'])),
-    ])
-    
+    return {"Train": train_idx, "Validation": validation_idx}
+
+
+def train_model(
+    data: pd.DataFrame, data_split: Dict[str, np.ndarray], estimator_spec: Dict, parameters: Dict
+) -> ClassifierModel:
+    """
+    Trains the classifier of `model_options.estimator` (see `build_estimator` for the format of `estimator_spec`) on
+    the training rows of the dataset.
+    """
+    train_df = data.iloc[data_split['Train']]
     input_features = parameters['features']['numeric'] + parameters['features']['categorical']
-    model_pipeline.fit(train_df[input_features], train_df[parameters['target']])
-    return model_pipeline
+
+    # The preprocessor and its output are reused from the cache when only the classifier settings changed
+    feature_cache = FeatureMatrixCache(**parameters['feature_cache'])
+    preprocessor, X_train = feature_cache.fit_transform(
+        build_preprocessor(parameters['features'], parameters['preprocessing']), train_df[input_features]
+    )
+    classifier = build_estimator(estimator_spec, random_state=parameters['random_state'])
+    classifier.fit(
+        X_train, train_df[parameters['target']].to_numpy(),
+        **categorical_fit_params(classifier, parameters['features'], parameters['preprocessing'])
+    )
+
+    model_pipeline = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', classifier)])
+    return ClassifierModel(model_pipeline, input_features, threshold=parameters['decision_threshold'])
 
 
 def evaluate_model(
-    classifier_model: Pipeline, train_df: pd.DataFrame, validation_df: pd.DataFrame, parameters: Dict
+    classifier_model: ClassifierModel, data: pd.DataFrame, data_split: Dict[str, np.ndarray], parameters: Dict
 ) -> Tuple:
     """
-    Calculates and logs the classification metrics.
+    Calculates and logs the classification metrics. The returned predictions only hold the ID, target and scores.
+    The metrics, curves and threshold analyses of each split are derived from one `ClassificationReport` (a single
+    sort of its scores), which is also returned for the reporting pipeline. Metrics are taken at the threshold
+    persisted with the model, which labelled the predictions, rather than at the current `decision_threshold`.
     """
     target_var = parameters['target']
-    input_features = parameters['features']['numeric'] + parameters['features']['categorical']
-    train_df[f'{target_var}_PRED'] = classifier_model.predict(train_df[input_features])
-    train_df[f'{target_var}_PRED_PROBA'] = classifier_model.predict_proba(train_df[input_features])[:, 1]
-    validation_df[f'{target_var}_PRED'] = classifier_model.predict(validation_df[input_features])
-    validation_df[f'{target_var}_PRED_PROBA'] = classifier_model.predict_proba(validation_df[input_features])[:, 1]
-    
-    def _calculate_metrics(y_true, y_pred, y_pred_proba):
-        roc_value = roc_auc_score(y_true=y_true, y_score=y_pred_proba)
-        accuracy_value = accuracy_score(y_true=y_true, y_pred=y_pred)
-        f1_value = f1_score(y_true=y_true, y_pred=y_pred)
-        return {
-            "roc_auc": roc_value,
-            "accuracy": accuracy_value,
-            "f1": f1_value
-        }
-    
-    train_metrics = _calculate_metrics(train_df[target_var], train_df[f'{target_var}_PRED'], train_df[f'{target_var}_PRED_PROBA'])
-    validation_metrics = _calculate_metrics(validation_df[target_var], validation_df[f'{target_var}_PRED'], validation_df[f'{target_var}_PRED_PROBA'])
-    combined_metrics = {
-        "(Train) ROC AUC": train_metrics['roc_auc'],
-        "(Train) Accuracy": train_metrics['accuracy'],
-        "(Train) F1 Score": train_metrics['f1'],
-        "(Validation) ROC AUC": validation_metrics['roc_auc'],
-        "(Validation) Accuracy": validation_metrics['accuracy'],
-        "(Validation) F1 Score": validation_metrics['f1']
+    threshold = classifier_model.threshold
+    costs = parameters['evaluation']['costs']
+    feature_cache = FeatureMatrixCache(**parameters['feature_cache'])
+    # The worker processes only start if rows missing from the cache are sent to them
+    with ParallelScorer(classifier_model, **parameters['scoring']) as scorer:
+        train_df = _score_rows(scorer, feature_cache, data, data_split['Train'], parameters)
+        validation_df = _score_rows(scorer, feature_cache, data, data_split['Validation'], parameters)
+
+    evaluation_reports = {
+        split: ClassificationReport.from_scores(
+            df[target_var], df[f'{target_var}_PRED_PROBA'], pos_label=classifier_model.classes_[1],
+            decision_threshold=threshold
+        )
+        for split, df in [('Train', train_df), ('Validation', validation_df)]
     }
-    
+
+    combined_metrics = {}
+    _logger = logging.getLogger(__name__)
+    for split, report in evaluation_reports.items():
+        metrics = report.metrics_at(threshold)
+        combined_metrics.update({
+            f"({split}) ROC AUC": metrics['roc_auc'],
+            f"({split}) Accuracy": metrics['accuracy'],
+            f"({split}) F1 Score": metrics['f1'],
+            f"({split}) Average Precision": metrics['average_precision'],
+        })
+        _logger.info(f"============================== {split} Metrics ==============================")
+        _logger.info(f"ROC AUC: {metrics['roc_auc']:.3f}")
+        _logger.info(f"Accuracy: {metrics['accuracy']:.3f}")
+        _logger.info(f"F1 Score: {metrics['f1']:.3f}")
+        _logger.info(f"Average Precision: {metrics['average_precision']:.3f}")
+
+    validation_report = evaluation_reports['Validation']
+    combined_metrics["(Validation) F1-Optimal Threshold"] = validation_report.f1_optimal_threshold()
+    combined_metrics["(Validation) Cost-Optimal Threshold"] = validation_report.cost_optimal_threshold(costs)
+    _logger.info(f"F1-optimal threshold: {combined_metrics['(Validation) F1-Optimal Threshold']:.3f}")
+    _logger.info(f"Cost-optimal threshold: {combined_metrics['(Validation) Cost-Optimal Threshold']:.3f}")
+
+    return combined_metrics, train_df, validation_df, evaluation_reports
+
+
+def cross_validate_model(data: pd.DataFrame, estimator_spec: Dict, parameters: Dict) -> Tuple:
+    """
+    Cross-validates the classifier over K stratified folds of the whole dataset, each fold being fitted end
+    to end (preprocessing included) in a parallel worker process. The preprocessing is fitted on the fold's training
+    part and its matrices are reused from the feature matrix cache across runs. Only the input features and the
+    target are sent to the workers, which send back the held-out probabilities.
+
+    Returns:
+        The fold-level and aggregate (mean and standard deviation) metrics, and the out-of-fold predictions.
+    """
+    target_var = parameters['target']
+    cv_options = parameters['cross_validation']
+    input_features = parameters['features']['numeric'] + parameters['features']['categorical']
+    y = data[target_var].to_numpy()
+    classes = np.unique(y)  # As ordered by the classifiers' `classes_`
+    threshold = parameters['decision_threshold']
+    folds = list(StratifiedKFold(
+        n_splits=cv_options['n_splits'], shuffle=True, random_state=parameters['random_state']
+    ).split(np.zeros(len(data)), y))
+
+    features_df = data[input_features]
+    fold_pred_proba = Parallel(n_jobs=cv_options['n_jobs'])(
+        delayed(_fit_fold)(estimator_spec, features_df, y, fold, parameters) for fold in folds
+    )
+
+    oof_pred_proba, oof_fold = np.empty(len(data)), np.empty(len(data), dtype=int)
+    metrics = {}
+    for k, ((_, validation_idx), pred_proba) in enumerate(zip(folds, fold_pred_proba), start=1):
+        oof_pred_proba[validation_idx] = pred_proba
+        oof_fold[validation_idx] = k
+        metrics[k] = ClassificationReport.from_scores(y[validation_idx], pred_proba, pos_label=classes[1]).metrics_at(threshold)
+
+    combined_metrics = {}
     _logger = logging.getLogger(__name__)
-    _logger.info(f"============================== Train Metrics ==============================")
-    _logger.info(f"ROC AUC: {train_metrics['roc_auc']:.3f}")
-    _logger.info(f"Accuracy: {train_metrics['accuracy']:.3f}")
-    _logger.info(f"F1 Score: {train_metrics['f1']:.3f}")
-    _logger.info(f"============================== Validation Metrics ==============================")
-    _logger.info(f"ROC AUC: {validation_metrics['roc_auc']:.3f}")
-    _logger.info(f"Accuracy: {validation_metrics['accuracy']:.3f}")
-    _logger.info(f"F1 Score: {validation_metrics['f1']:.3f}")
-    
-    return combined_metrics, train_df, validation_df
+    _logger.info(f"============================== {cv_options['n_splits']}-Fold Cross-Validation Metrics ==============================")
+    for name, label in [('roc_auc', 'ROC AUC'), ('accuracy', 'Accuracy'), ('f1', 'F1 Score')]:
+        values = np.array([fold_metrics[name] for fold_metrics in metrics.values()])
+        combined_metrics.update({f"(Fold {k}) {label}": fold_metrics[name] for k, fold_metrics in metrics.items()})
+        combined_metrics[f"(CV Mean) {label}"] = values.mean()
+        combined_metrics[f"(CV Std) {label}"] = values.std()
+        _logger.info(f"{label}: {values.mean():.3f} +/- {values.std():.3f}")
+
+    oof_predictions = pd.DataFrame({
+        parameters['id_column']: data[parameters['id_column']].to_numpy(),
+        target_var: y,
+        'FOLD': oof_fold,
+        f'{target_var}_PRED': classes[(oof_pred_proba > threshold).astype(int)],
+        f'{target_var}_PRED_PROBA': oof_pred_proba,
+    })
+    return combined_metrics, oof_predictions
+
+
+def compile_model(
+    classifier_model: ClassifierModel, data: pd.DataFrame, data_split: Dict[str, np.ndarray], parameters: Dict
+) -> CompiledModel:
+    """
+    Compiles the classifier model into a standalone CompiledModel for scoring workers, checking that it reproduces
+    the pipeline's probabilities on the validation rows.
+    """
+    compiled_model = compile_classifier_model(classifier_model)
+    validation_df = data.iloc[data_split['Validation']]
+    max_error = float(np.abs(
+        compiled_model.predict_scores(validation_df)[0] - classifier_model.predict_scores(validation_df)[0]
+    ).max(initial=0))
+    logging.getLogger(__name__).info(
+        f"Compiled model: {len(compiled_model.arrays.get('feature', []))} tree nodes, largest probability difference "
+        f"on the validation rows {max_error:.2e}"
+    )
+    if max_error > parameters['compiled_model']['tolerance']:
+        raise ValueError(
+            f"The compiled model differs from the pipeline by up to {max_error:.2e} on the validation rows, above the "
+            f"tolerance of {parameters['compiled_model']['tolerance']:.0e}."
+        )
+    return compiled_model
 
 
 def predict_on_test_dataset(
-    classifier_model: Pipeline, test_df: pd.DataFrame, parameters: Dict
+    classifier_model: ClassifierModel, test_df: pd.DataFrame, parameters: Dict
 ) -> pd.DataFrame:
     """
-    Predicts the target variable on the test dataset.
+    Predicts the target variable (thresholded label and probability) on the test dataset, returning only the ID and
+    scores.
     """
-    input_features = parameters['features']['numeric'] + parameters['features']['categorical']
-    test_df[parameters['target']] = classifier_model.predict(test_df[input_features])
-    return test_df
+    target_var = parameters['target']
+    with ParallelScorer(classifier_model, **parameters['scoring']) as scorer:
+        test_pred_proba, test_pred = scorer.predict_scores(test_df[classifier_model.input_features])
+    return pd.DataFrame({
+        parameters['id_column']: test_df[parameters['id_column']].to_numpy(),
+        target_var: test_pred,
+        f'{target_var}_PRED_PROBA': test_pred_proba,
+    })
+
+
+def explain_test_predictions(
+    classifier_model: ClassifierModel, test_df: pd.DataFrame, parameters: Dict
+) -> pd.DataFrame:
+    """
+    Reason codes of the test predictions: for each application, the `explanations.n_reasons` input features
+    contributing most towards a default, and their contributions computed with `explanations.method` (see
+    `ClassifierModel.reason_codes`). Features whose contribution is not positive are left out. Rows are sharded across
+    the scoring worker processes, which only send back their top contributions.
+    """
+    explanation_options = parameters['explanations']
+    with ParallelScorer(classifier_model, **parameters['scoring']) as scorer:
+        positions, contributions = scorer.reason_codes(
+            test_df[classifier_model.input_features], explanation_options['n_reasons'], explanation_options['method']
+        )
+
+    reason_codes_df = pd.DataFrame({parameters['id_column']: test_df[parameters['id_column']].to_numpy()})
+    for i in range(positions.shape[1]):
+        is_reason = contributions[:, i] > 0
+        # Category codes of the input features, -1 (missing) when there is no reason at this rank
+        reason_codes_df[f'REASON_{i + 1}'] = pd.Categorical.from_codes(
+            np.where(is_reason, positions[:, i], -1), categories=classifier_model.input_features
+        )
+        reason_codes_df[f'REASON_{i + 1}_CONTRIBUTION'] = np.where(is_reason, contributions[:, i], np.nan)
+    return reason_codes_df
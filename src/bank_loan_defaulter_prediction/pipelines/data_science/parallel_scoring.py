@@ -0,0 +1,84 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from .classifier_model import ClassifierModel
+
+# State of each worker process (the fitted model and its thread pool limits), set once by `_init_worker`
+_WORKER_STATE = SimpleNamespace(model=None, threadpool_limits=None)
+
+
+# ============================== Auxiliary Functions ==============================
+def _init_worker(classifier_model: ClassifierModel):
+    _WORKER_STATE.model = classifier_model
+    # Parallelism comes from the processes, so each worker is kept to a single native thread to avoid oversubscription
+    _WORKER_STATE.threadpool_limits = threadpool_limits(limits=1)
+
+
+def _score_shard(method: str, shard_df: pd.DataFrame, *args):
+    return getattr(_WORKER_STATE.model, method)(shard_df, *args)
+
+
+def _iter_shards(data_df: pd.DataFrame, batch_size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(data_df), batch_size):
+        yield data_df.iloc[start:start + batch_size]
+
+
+# ============================== Main Classes ==============================
+class ParallelScorer:
+    """
+    Scores data frames with a fitted model by sharding the rows across a pool of worker processes. The model is sent
+    to each worker once when the pool starts, after which only the row shards are sent per task. Results are
+    reassembled in the original row order.
+
+    Attributes:
+        classifier_model (ClassifierModel): The fitted model.
+        n_workers (int): Number of worker processes. 1 scores in-process, -1 uses all available cores.
+        batch_size (int): Maximum number of rows sent to a worker per task.
+    """
+
+    def __init__(self, classifier_model: ClassifierModel, n_workers: int=1, batch_size: int=10000):
+        self.classifier_model = classifier_model
+        self.n_workers = os.cpu_count() if n_workers == -1 else n_workers
+        self.batch_size = batch_size
+        self._executor = None
+
+    def __enter__(self):
+        if self.n_workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.n_workers, initializer=_init_worker, initargs=(self.classifier_model,)
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _score(self, method: str, data_df: pd.DataFrame, *args) -> list:
+        if self._executor is None or len(data_df) <= self.batch_size:
+            return [getattr(self.classifier_model, method)(data_df, *args)]
+        shards = list(_iter_shards(data_df, self.batch_size))
+        # `map` yields results in submission order, so the output is aligned with the input rows
+        shard_args = ([x] * len(shards) for x in args)
+        return list(self._executor.map(_score_shard, [method] * len(shards), shards, *shard_args))
+
+    def predict_scores(self, data_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        results = self._score('predict_scores', data_df)
+        return np.concatenate([x[0] for x in results]), np.concatenate([x[1] for x in results])
+
+    def predict(self, data_df: pd.DataFrame) -> np.ndarray:
+        return np.concatenate(self._score('predict', data_df))
+
+    def predict_proba(self, data_df: pd.DataFrame) -> np.ndarray:
+        return np.concatenate(self._score('predict_proba', data_df))
+
+    def reason_codes(self, data_df: pd.DataFrame, n_reasons: int=3, method: str='shap') -> Tuple[np.ndarray, np.ndarray]:
+        # Only the top contributions of each shard are sent back by the workers
+        results = self._score('reason_codes', data_df, n_reasons, method)
+        return np.concatenate([x[0] for x in results]), np.concatenate([x[1] for x in results])
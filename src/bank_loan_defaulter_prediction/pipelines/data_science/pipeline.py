@@ -1,6 +1,14 @@
 from kedro.pipeline import Pipeline, node, pipeline
 
-from .nodes import evaluate_model, split_data, train_model, predict_on_test_dataset
+from .nodes import (
+    compile_model,
+    cross_validate_model,
+    evaluate_model,
+    explain_test_predictions,
+    predict_on_test_dataset,
+    split_data,
+    train_model,
+)
 
 
 def create_pipeline(**kwargs) -> Pipeline:
@@ -9,26 +17,44 @@ def create_pipeline(**kwargs) -> Pipeline:
             node(
                 func=split_data,
                 inputs=["feature_engineered_train_dataset", "params:model_options"],
-                outputs=["model_input_train", "model_input_validation"],
+                outputs="data_split",
                 name="split_data_node",
             ),
             node(
                 func=train_model,
-                inputs=["model_input_train", "params:model_options"],
+                inputs=["feature_engineered_train_dataset", "data_split", "params:model_options.estimator", "params:model_options"],
                 outputs="classifier_model",
                 name="train_model_node",
             ),
             node(
                 func=evaluate_model,
-                inputs=["classifier_model", "model_input_train", "model_input_validation", "params:model_options"],
-                outputs=["evaluation_metrics", "train_predictions", "validation_predictions"],
+                inputs=["classifier_model", "feature_engineered_train_dataset", "data_split", "params:model_options"],
+                outputs=["evaluation_metrics", "train_predictions", "validation_predictions", "evaluation_reports"],
                 name="evaluate_model_node",
             ),
+            node(
+                func=compile_model,
+                inputs=["classifier_model", "feature_engineered_train_dataset", "data_split", "params:model_options"],
+                outputs="compiled_model",
+                name="compile_model_node",
+            ),
+            node(
+                func=cross_validate_model,
+                inputs=["feature_engineered_train_dataset", "params:model_options.estimator", "params:model_options"],
+                outputs=["cross_validation_metrics", "oof_predictions"],
+                name="cross_validate_model_node",
+            ),
             node(
                 func=predict_on_test_dataset,
                 inputs=["classifier_model", "feature_engineered_test_dataset", "params:model_options"],
                 outputs="test_predictions",
                 name="predict_on_test_node",
             ),
+            node(
+                func=explain_test_predictions,
+                inputs=["classifier_model", "feature_engineered_test_dataset", "params:model_options"],
+                outputs="test_reason_codes",
+                name="explain_test_predictions_node",
+            ),
         ]
     )
@@ -0,0 +1,194 @@
+import json
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from lightgbm.basic import LightGBMError
+from sklearn.model_selection import train_test_split
+
+from ..data_science.estimators import (
+    build_estimator,
+    build_preprocessor,
+    categorical_fit_params,
+    supports_native_categorical,
+)
+from ..data_science.feature_matrix_cache import FeatureMatrixCache
+from ..data_science.metrics_engine import ClassificationReport
+
+logger = logging.getLogger(__name__)
+
+
+# ============================== Auxiliary Functions ==============================
+def _sample_value(space: Any, random_state: np.random.RandomState) -> Any:
+    """
+    Samples one hyperparameter value. A list is a set of choices; a dictionary with `low` and `high` a (log-)uniform
+    range, rounded when `integer` is set.
+    """
+    if isinstance(space, list):
+        return space[random_state.randint(len(space))]
+    if not isinstance(space, dict):
+        return space
+    low, high = space['low'], space['high']
+    if space.get('log', False):
+        value = float(np.exp(random_state.uniform(np.log(low), np.log(high))))
+    else:
+        value = float(random_state.uniform(low, high))
+    return int(round(value)) if space.get('integer', False) else value
+
+
+def _sample_candidates(candidates: Dict, n_candidates: int, random_state: np.random.RandomState) -> List[Dict]:
+    """
+    Samples estimator specs (see `build_estimator`), drawing the estimator family uniformly and then its
+    hyperparameters from its search space.
+    """
+    families = sorted(candidates)
+    estimator_specs = []
+    for _ in range(n_candidates):
+        family = candidates[families[random_state.randint(len(families))]]
+        params = {name: _sample_value(space, random_state) for name, space in family.get('search_space', {}).items()}
+        estimator_specs.append({'class': family['class'], 'params': {**family.get('fixed_params', {}), **params}})
+    return estimator_specs
+
+
+def _within_budget(estimator_specs: List[Dict], deadline: float) -> Iterator[Dict]:
+    """
+    Yields the candidates to submit until the deadline (a `time.perf_counter` value) has passed. The first candidate
+    is always yielded, so that every round ranks at least one.
+    """
+    for i, estimator_spec in enumerate(estimator_specs):
+        if i > 0 and time.perf_counter() > deadline:
+            logger.info(f"Time budget spent, {len(estimator_specs) - i} candidates of the round left unsubmitted")
+            return
+        yield estimator_spec
+
+
+def _evaluate_candidate(
+    estimator_spec: Dict, fit_data: Tuple, fit_rows: np.ndarray, selection_data: Tuple, parameters: Dict
+) -> Tuple[float, float, Optional[str]]:
+    """
+    Fits one candidate on the given rows of the fit data (`fit_data` and `selection_data` each hold a preprocessed
+    matrix and its target), returning its ROC AUC on the selection data, its fit time and, when the estimator failed
+    to fit (e.g. an invalid combination of sampled hyperparameters), the error message with a NaN score. Other
+    errors, such as a misspelt estimator class or parameter, are raised.
+    """
+    start = time.perf_counter()
+    (X_fit, y_fit), (X_selection, y_selection) = fit_data, selection_data
+    estimator = build_estimator(estimator_spec, random_state=parameters['random_state'])
+    if 'n_jobs' in estimator.get_params():
+        # Candidates already run in parallel worker processes, so each one is fitted on a single thread
+        estimator.set_params(n_jobs=1)
+    fit_params = categorical_fit_params(estimator, parameters['features'], parameters['preprocessing'])
+    try:
+        estimator.fit(X_fit[fit_rows], y_fit[fit_rows], **fit_params)
+        pred_proba = estimator.predict_proba(X_selection)[:, 1]
+    except (ValueError, LightGBMError) as e:
+        # Logged by the parent process, as the log records of the worker processes are not collected
+        return np.nan, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    score = ClassificationReport.from_scores(y_selection, pred_proba, pos_label=estimator.classes_[1]).roc_auc
+    return score, time.perf_counter() - start, None
+
+
+# ============================== Main Functions ==============================
+def search_hyperparameters(
+    data: pd.DataFrame, data_split: Dict[str, np.ndarray], parameters: Dict, search_options: Dict
+) -> Tuple[Dict, pd.DataFrame]:
+    """
+    Selects the estimator and hyperparameters of the classifier by successive halving within a wall-clock budget.
+
+    Candidates sampled from the search space are first fitted on a small subsample of the training rows. Each round
+    keeps the best `1 / eta` of them (by ROC AUC on rows held out from the training rows, so that the validation rows
+    stay untouched for `evaluate_model`) and fits them on `eta` times more rows, until a single candidate or all the
+    rows are left. Once the budget is spent, no more candidates are submitted and no new round starts. The candidates
+    of a round are fitted in parallel, on a single thread each, on a preprocessed matrix computed once and shared
+    with the workers.
+
+    Returns:
+        The spec of the best estimator (to be copied to `model_options.estimator`) and the table of all trials.
+    """
+    start = time.perf_counter()
+    deadline = start + search_options['time_budget_minutes'] * 60
+    random_state = np.random.RandomState(parameters['random_state'])
+    target_var = parameters['target']
+    train_df = data.iloc[data_split['Train']]
+    fit_df, selection_df = train_test_split(
+        train_df, stratify=train_df[target_var], test_size=search_options['selection_size'],
+        random_state=parameters['random_state']
+    )
+
+    # The preprocessing does not depend on the candidate, so it is fitted once (or reused from the cache) and the
+    # memory-mapped matrices are shared with the workers
+    input_features = parameters['features']['numeric'] + parameters['features']['categorical']
+    feature_cache = FeatureMatrixCache(**parameters['feature_cache'])
+    preprocessor, X_fit = feature_cache.fit_transform(
+        build_preprocessor(parameters['features'], parameters['preprocessing']), fit_df[input_features]
+    )
+    X_selection = feature_cache.transform(preprocessor, selection_df[input_features])
+    y_fit, y_selection = fit_df[target_var].to_numpy(), selection_df[target_var].to_numpy()
+    # Rows are added in a fixed random order, so that every round's subsample contains the previous one
+    row_order = random_state.permutation(len(fit_df))
+
+    candidates = search_options['candidates']
+    if parameters['preprocessing'] == 'native_categorical':
+        # Category codes are only meaningful to estimators handling categorical features natively
+        candidates = {name: x for name, x in candidates.items() if supports_native_categorical(x['class'])}
+        logger.info(f"Searching over {sorted(candidates)} only, as they support 'native_categorical' preprocessing")
+    estimator_specs = _sample_candidates(candidates, search_options['n_candidates'], random_state)
+    eta = search_options['eta']
+    n_rows = min(search_options['min_train_size'], len(fit_df))
+    trials = []
+    round_idx = 0
+    best_spec = None
+    with Parallel(n_jobs=search_options['n_jobs']) as parallel:
+        while True:
+            results = parallel(
+                delayed(_evaluate_candidate)(
+                    spec, (X_fit, y_fit), row_order[:n_rows], (X_selection, y_selection), parameters
+                )
+                for spec in _within_budget(estimator_specs, deadline)
+            )
+            # Candidates are submitted in order, so those evaluated are the first ones
+            estimator_specs = estimator_specs[:len(results)]
+            for spec, (score, fit_seconds, error) in zip(estimator_specs, results):
+                if error is not None:
+                    logger.warning(f"Candidate {spec} failed to fit: {error}")
+                trials.append({
+                    'round': round_idx,
+                    'train_rows': n_rows,
+                    'estimator': spec['class'],
+                    'params': json.dumps(spec['params'], sort_keys=True),
+                    'roc_auc': score,
+                    'fit_seconds': fit_seconds,
+                })
+            scores = np.array([score for score, _, _ in results])
+            if not np.isfinite(scores).any():
+                if best_spec is None:
+                    raise ValueError(
+                        f"None of the {len(results)} candidates of the first round got a finite ROC AUC, see the "
+                        f"warnings above for their errors."
+                    )
+                logger.warning(
+                    f"No candidate of round {round_idx} could be fitted, keeping the best one of the previous round"
+                )
+                break
+            ranking = np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind='stable')
+            best_spec, best_score = estimator_specs[ranking[0]], scores[ranking[0]]
+            logger.info(
+                f"Round {round_idx}: {len(estimator_specs)} candidates on {n_rows} rows, "
+                f"best ROC AUC {best_score:.4f} ({best_spec['class']})"
+            )
+
+            elapsed_minutes = (time.perf_counter() - start) / 60
+            if len(estimator_specs) == 1 or n_rows == len(fit_df):
+                break
+            if elapsed_minutes > search_options['time_budget_minutes']:
+                logger.info(f"Time budget spent after {elapsed_minutes:.1f} minutes, stopping the search")
+                break
+            estimator_specs = [estimator_specs[i] for i in ranking[:max(1, len(estimator_specs) // eta)]]
+            n_rows = min(n_rows * eta, len(fit_df))
+            round_idx += 1
+
+    logger.info(f"Selected {best_spec['class']} with {best_spec['params']}")
+    return best_spec, pd.DataFrame(trials)
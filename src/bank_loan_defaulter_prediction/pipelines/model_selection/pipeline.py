@@ -0,0 +1,16 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .nodes import search_hyperparameters
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(
+                func=search_hyperparameters,
+                inputs=["feature_engineered_train_dataset", "data_split", "params:model_options", "params:model_selection_options"],
+                outputs=["best_estimator", "model_selection_trials"],
+                name="search_hyperparameters_node",
+            ),
+        ]
+    )
@@ -0,0 +1,47 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from ...drift import DriftSketch, drift_report, log_drift
+
+
+# ============================== Main Functions ==============================
+def build_drift_baseline(
+    data: pd.DataFrame, data_split: Dict[str, np.ndarray], validation_predictions: pd.DataFrame, parameters: Dict
+) -> DriftSketch:
+    """
+    Sketches the distribution of the model features and of the predicted probability on the validation rows, which
+    the classifier was not fitted on, so that the baseline probabilities are as spread as on new applications.
+    """
+    proba_column = f"{parameters['target']}_PRED_PROBA"
+    baseline_df = data.iloc[data_split['Validation']][
+        parameters['features']['numeric'] + parameters['features']['categorical']
+    ]
+    # evaluate_model scores the validation rows in the order of the split
+    baseline_df = baseline_df.assign(**{proba_column: validation_predictions[proba_column].to_numpy()})
+    return DriftSketch.fit(
+        baseline_df, parameters['features']['numeric'] + [proba_column], parameters['features']['categorical'],
+        n_quantiles=parameters['n_quantiles']
+    )
+
+
+def report_drift(drift_baseline: DriftSketch, drift_sketch: DriftSketch, parameters: Dict) -> pd.DataFrame:
+    """
+    PSI and KS statistic of each monitored column of a sketch against the baseline (see `drift_report`).
+    """
+    return drift_report(
+        drift_baseline, drift_sketch, psi_bins=parameters['psi_bins'], psi_threshold=parameters['psi_threshold']
+    )
+
+
+def monitor_test_drift(
+    drift_baseline: DriftSketch, test_df: pd.DataFrame, test_predictions: pd.DataFrame, parameters: Dict
+) -> pd.DataFrame:
+    """
+    Drift report of the test dataset features and predicted probabilities against the baseline.
+    """
+    drift_sketch = drift_baseline.empty_like().update(test_df).update(test_predictions)
+    report_df = report_drift(drift_baseline, drift_sketch, parameters)
+    log_drift(report_df, "Test dataset")
+    return report_df
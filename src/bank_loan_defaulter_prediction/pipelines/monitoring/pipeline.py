@@ -0,0 +1,25 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .nodes import build_drift_baseline, monitor_test_drift
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(
+                func=build_drift_baseline,
+                inputs=[
+                    "feature_engineered_train_dataset", "data_split", "validation_predictions",
+                    "params:monitoring_options"
+                ],
+                outputs="drift_baseline",
+                name="build_drift_baseline_node",
+            ),
+            node(
+                func=monitor_test_drift,
+                inputs=["drift_baseline", "feature_engineered_test_dataset", "test_predictions", "params:monitoring_options"],
+                outputs="test_drift_report",
+                name="monitor_test_drift_node",
+            ),
+        ]
+    )
@@ -1,21 +1,17 @@
 from typing import Dict
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-from sklearn.metrics import roc_curve, roc_auc_score, ConfusionMatrixDisplay
+from sklearn.metrics import ConfusionMatrixDisplay
 
+from ..data_science.metrics_engine import ClassificationReport
 
-def plot_roc_curve(
-    train_predictions: pd.DataFrame, validation_predictions: pd.DataFrame, parameters: Dict
-):
-    target_var = parameters["target"]
-    train_auc = roc_auc_score(y_true=train_predictions[target_var], y_score=train_predictions[f"{target_var}_PRED_PROBA"])
-    train_fpr, train_tpr, _ = roc_curve(y_true=train_predictions[target_var], y_score=train_predictions[f"{target_var}_PRED_PROBA"])
-    validation_auc = roc_auc_score(y_true=validation_predictions[target_var], y_score=validation_predictions[f"{target_var}_PRED_PROBA"])
-    validation_fpr, validation_tpr, _ = roc_curve(y_true=validation_predictions[target_var], y_score=validation_predictions[f"{target_var}_PRED_PROBA"])
+
+def plot_roc_curve(evaluation_reports: Dict[str, ClassificationReport]):
     fig, ax = plt.subplots(figsize=(10, 8), constrained_layout=True)
-    ax.plot(train_fpr, train_tpr, label=f"Train ROC Curve (AUC = {train_auc:.2f})")
-    ax.plot(validation_fpr, validation_tpr, label=f"Validation ROC Curve (AUC = {validation_auc:.2f})")
+    for split, report in evaluation_reports.items():
+        ax.plot(report.fpr, report.tpr, label=f"{split} ROC Curve (AUC = {report.roc_auc:.2f})")
     ax.plot([0, 1], [0, 1], linestyle="--", lw=2, color="black", label="Chance level (AUC=0.5)", alpha=0.8)
     ax.grid()
     ax.legend()
@@ -25,30 +21,48 @@ def plot_roc_curve(
     return fig
 
 
-def plot_confusion_matrix(
-    train_predictions: pd.DataFrame, validation_predictions: pd.DataFrame, parameters: Dict
-):
-    target_var = parameters["target"]
-    fig, axes = plt.subplots(nrows=2, ncols=2, figsize=(10, 8), constrained_layout=True)
-    for col_id, normalize in enumerate([None, 'true']):
-        ConfusionMatrixDisplay.from_predictions(
-            y_true=train_predictions[target_var],
-            y_pred=train_predictions[f"{target_var}_PRED"],
-            ax=axes[0][col_id],
-            normalize=normalize,
-            values_format=",.0f" if normalize is None else ".2f",
-            cmap=plt.cm.Blues,
-            display_labels=["Non-Default", "Default"]
-        )
-        axes[0][col_id].set_title(f"Train Confusion Matrix (normalize={normalize})", fontweight='bold')
-        ConfusionMatrixDisplay.from_predictions(
-            y_true=validation_predictions[target_var],
-            y_pred=validation_predictions[f"{target_var}_PRED"],
-            ax=axes[1][col_id],
-            normalize=normalize,
-            values_format=",.0f" if normalize is None else ".2f",
-            cmap=plt.cm.Blues,
-            display_labels=["Non-Default", "Default"]
+def plot_precision_recall_curve(evaluation_reports: Dict[str, ClassificationReport]):
+    fig, ax = plt.subplots(figsize=(10, 8), constrained_layout=True)
+    for split, report in evaluation_reports.items():
+        ax.plot(
+            np.r_[0, report.recall], np.r_[1, report.precision],
+            label=f"{split} Precision-Recall Curve (AP = {report.average_precision:.2f})"
         )
-        axes[1][col_id].set_title(f"Validation Confusion Matrix (normalize={normalize})", fontweight='bold')
+    ax.grid()
+    ax.legend()
+    ax.set_xlabel("Recall")
+    ax.set_ylabel("Precision")
+    fig.suptitle("Precision-Recall Curve", fontweight='bold')
     return fig
+
+
+def plot_confusion_matrix(evaluation_reports: Dict[str, ClassificationReport]):
+    fig, axes = plt.subplots(nrows=2, ncols=2, figsize=(10, 8), constrained_layout=True)
+    for row_id, (split, report) in enumerate(evaluation_reports.items()):
+        # At the threshold of the model that labelled the predictions
+        confusion_matrix = report.confusion_matrix(report.decision_threshold)
+        for col_id, normalize in enumerate([None, 'true']):
+            ConfusionMatrixDisplay(
+                confusion_matrix=confusion_matrix if normalize is None else confusion_matrix / confusion_matrix.sum(axis=1, keepdims=True),
+                display_labels=["Non-Default", "Default"]
+            ).plot(
+                ax=axes[row_id][col_id],
+                values_format=",.0f" if normalize is None else ".2f",
+                cmap=plt.cm.Blues,
+            )
+            axes[row_id][col_id].set_title(f"{split} Confusion Matrix (normalize={normalize})", fontweight='bold')
+    return fig
+
+
+def tabulate_threshold_metrics(evaluation_reports: Dict[str, ClassificationReport], parameters: Dict) -> pd.DataFrame:
+    """
+    Confusion matrix counts, accuracy, precision, recall, F1 and cost of each split over a grid of thresholds.
+    """
+    thresholds = np.linspace(0, 1, parameters["evaluation"]["threshold_grid_size"])
+    return pd.concat(
+        [
+            report.threshold_table(thresholds, costs=parameters["evaluation"]["costs"]).assign(split=split)
+            for split, report in evaluation_reports.items()
+        ],
+        ignore_index=True,
+    )
@@ -2,23 +2,35 @@ from kedro.pipeline import Pipeline, node, pipeline
 
 from .nodes import (
     plot_roc_curve,
-    plot_confusion_matrix
+    plot_precision_recall_curve,
+    plot_confusion_matrix,
+    tabulate_threshold_metrics
 )
 
 
 def create_pipeline(**kwargs) -> Pipeline:
-    """This is a simple pipeline which generates a pair of plots"""
+    """This pipeline generates plots and tables from the evaluation reports of `evaluate_model`"""
     return pipeline(
         [
             node(
                 func=plot_roc_curve,
-                inputs=["train_predictions", "validation_predictions", "params:model_options"],
+                inputs="evaluation_reports",
                 outputs="viz_roc_curve",
             ),
+            node(
+                func=plot_precision_recall_curve,
+                inputs="evaluation_reports",
+                outputs="viz_precision_recall_curve",
+            ),
             node(
                 func=plot_confusion_matrix,
-                inputs=["train_predictions", "validation_predictions", "params:model_options"],
+                inputs="evaluation_reports",
                 outputs="viz_confusion_matrix",
+            ),
+            node(
+                func=tabulate_threshold_metrics,
+                inputs=["evaluation_reports", "params:model_options"],
+                outputs="threshold_metrics",
             )
         ]
     )
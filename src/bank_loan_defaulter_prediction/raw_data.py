@@ -0,0 +1,153 @@
+"""Typed reading of the raw Kaggle CSV files, shared by the `train_dataset`/`test_dataset` catalog entries
+(RawCSVDataset) and `base.DataLoader`. The CSV is parsed once with an explicit schema by Arrow's multithreaded reader,
+and a Parquet copy is written next to it. Later reads come from that copy for as long as it matches the CSV."""
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+# Types of the raw columns, as named in the Kaggle files. Mislabelled columns keep their raw names: 'Employment
+# Duration' holds home ownership values and 'Home Ownership' the annual income
+RAW_SCHEMA = {
+    'ID': pa.int64(),
+    'Loan Amount': pa.int64(),
+    'Funded Amount': pa.int64(),
+    'Funded Amount Investor': pa.float64(),
+    'Term': pa.int64(),
+    'Batch Enrolled': pa.string(),
+    'Interest Rate': pa.float64(),
+    'Grade': pa.string(),
+    'Sub Grade': pa.string(),
+    'Employment Duration': pa.string(),
+    'Home Ownership': pa.float64(),
+    'Verification Status': pa.string(),
+    'Payment Plan': pa.string(),
+    'Loan Title': pa.string(),
+    'Debit to Income': pa.float64(),
+    'Delinquency - two years': pa.int64(),
+    'Inquires - six months': pa.int64(),
+    'Open Account': pa.int64(),
+    'Public Record': pa.int64(),
+    'Revolving Balance': pa.int64(),
+    'Revolving Utilities': pa.float64(),
+    'Total Accounts': pa.int64(),
+    'Initial List Status': pa.string(),
+    'Total Received Interest': pa.float64(),
+    'Total Received Late Fee': pa.float64(),
+    'Recoveries': pa.float64(),
+    'Collection Recovery Fee': pa.float64(),
+    'Collection 12 months Medical': pa.int64(),
+    'Application Type': pa.string(),
+    'Last week Pay': pa.int64(),
+    'Accounts Delinquent': pa.int64(),
+    'Total Collection Amount': pa.int64(),
+    'Total Current Balance': pa.int64(),
+    'Total Revolving Credit Limit': pa.int64(),
+    'Loan Status': pa.int64(),
+}
+
+CACHE_SUFFIX = '.parquet'  # train.csv is cached as train.csv.parquet
+_CACHE_METADATA_KEY = b'raw_csv_source'
+_HASH_BLOCK_SIZE = 2 ** 24
+
+
+# ============================== Auxiliary Functions ==============================
+def _file_checksum(filepath: Path) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _schema_checksum() -> str:
+    # Changing the raw schema invalidates the existing caches
+    return hashlib.sha256(repr(sorted((k, str(v)) for k, v in RAW_SCHEMA.items())).encode()).hexdigest()
+
+
+def _source_stamp(filepath: Path) -> Dict:
+    stat = filepath.stat()
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': _file_checksum(filepath),
+        'schema': _schema_checksum(),
+    }
+
+
+def _cache_is_valid(filepath: Path, cache_filepath: Path) -> bool:
+    """
+    Whether the cache was written from the current content of the CSV, with the current schema. The checksum of the
+    CSV is only recomputed when its size matches but its modification time does not (e.g. a copied or touched file).
+    """
+    if not cache_filepath.exists():
+        return False
+    metadata = pq.read_schema(cache_filepath).metadata or {}
+    if _CACHE_METADATA_KEY not in metadata:
+        return False
+    cached, stat = json.loads(metadata[_CACHE_METADATA_KEY]), filepath.stat()
+    if cached.get('schema') != _schema_checksum() or cached.get('size') != stat.st_size:
+        return False
+    return cached.get('mtime_ns') == stat.st_mtime_ns or cached.get('sha256') == _file_checksum(filepath)
+
+
+def _parse_csv(filepath: Path) -> pa.Table:
+    """
+    Parses the CSV with the raw schema (columns it does not list are inferred). Empty fields and the usual missing
+    value markers ('NA', 'NaN', 'null', ...) are read as nulls, as `pd.read_csv` does.
+    """
+    return pv.read_csv(
+        filepath,
+        read_options=pv.ReadOptions(use_threads=True),
+        convert_options=pv.ConvertOptions(column_types=RAW_SCHEMA, strings_can_be_null=True),
+    )
+
+
+def _write_cache(table: pa.Table, cache_filepath: Path, stamp: Dict):
+    """
+    Writes the Parquet cache through a temporary file, so that an interrupted write never leaves a partial cache.
+    """
+    metadata = {**(table.schema.metadata or {}), _CACHE_METADATA_KEY: json.dumps(stamp).encode()}
+    tmp_filepath = cache_filepath.with_name(f".{cache_filepath.name}.{os.getpid()}.tmp")
+    try:
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_filepath)
+        os.replace(tmp_filepath, cache_filepath)
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"Could not write the cache {cache_filepath}: {e}")
+        tmp_filepath.unlink(missing_ok=True)
+
+
+# ============================== Main Functions ==============================
+def read_raw_csv(filepath: str, cache: bool=True) -> pd.DataFrame:
+    """
+    Reads a raw Kaggle CSV file into the DataFrame `pd.read_csv` returns (int64, float64 and object columns), from its
+    Parquet cache when it is up to date. Otherwise the CSV is parsed with the raw schema and, if `cache` is set, the
+    cache is (re)written, stamped with the size, modification time and SHA-256 of the CSV.
+
+    Files that do not match the raw schema (e.g. non-numeric values in a numeric column) are read by
+    `pd.read_csv` with inferred dtypes and are not cached.
+    """
+    _logger = logging.getLogger(__name__)
+    filepath = Path(filepath)
+    cache_filepath = filepath.with_name(filepath.name + CACHE_SUFFIX)
+    if cache and _cache_is_valid(filepath, cache_filepath):
+        _logger.info(f"Loading {filepath} from its cache {cache_filepath}")
+        return pq.read_table(cache_filepath, use_threads=True).to_pandas()
+
+    # Stamped before parsing, so that a CSV modified meanwhile does not match its cache
+    stamp = _source_stamp(filepath) if cache else None
+    try:
+        table = _parse_csv(filepath)
+    except pa.ArrowInvalid as e:
+        _logger.warning(f"{filepath} does not match the raw schema ({e}), reading it with inferred dtypes.")
+        return pd.read_csv(filepath)
+    if cache:
+        _write_cache(table, cache_filepath, stamp)
+    return table.to_pandas()
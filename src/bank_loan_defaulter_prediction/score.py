@@ -0,0 +1,109 @@
+"""Fast-start scoring of raw loan application files, outside of the Kedro project bootstrap. It reads the artifacts
+written by `kedro run` and scores the file chunk by chunk as the `batch_scoring` pipeline does, by default with the
+compiled model so that neither Kedro, sklearn nor LightGBM are imported. The module itself only imports the standard
+library: pandas and NumPy are imported once the arguments are parsed, so that `--help` and argument errors return
+immediately. `tests/test_import_time.py` holds its import graph to a time budget.
+
+The compiled model suits small files and frequent invocations; passing the pickled classifier_model with `--model`
+pays for importing sklearn and LightGBM once, and scores large files faster with LightGBM's native predictor.
+
+With `--drift-baseline`, the scored rows are also monitored for drift against the training distribution. The drift
+sketch written with `--drift-sketch` can be merged with those of other partitions scored in parallel.
+
+Usage:
+    bank-loan-defaulter-score data/01_raw/test.csv data/07_model_output/predictions.csv
+    bank-loan-defaulter-score data/01_raw/test.parquet predictions.parquet --model data/06_models/classifier_model.pickle
+    bank-loan-defaulter-score part-0.csv part-0-predictions.csv --drift-baseline data/06_models/drift_baseline.pickle \
+        --drift-report part-0-drift.csv --drift-sketch part-0-drift.pickle
+"""
+import argparse
+import logging
+import pickle
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .drift import DriftSketch
+
+# Drift report options, as in conf/base/parameters_monitoring.yml
+_MONITORING_OPTIONS = {'psi_bins': 10, 'psi_threshold': 0.25}
+
+
+# ============================== Auxiliary Functions ==============================
+def _load_model(filepath: str) -> Any:
+    """
+    Loads the compiled model (`.npz`) or the pickled classifier_model, which imports sklearn and LightGBM.
+    """
+    if Path(filepath).suffix.lower() == '.npz':
+        from .compiled_model import CompiledModel
+        return CompiledModel.load(filepath)
+    with open(filepath, 'rb') as f:
+        return pickle.load(f)
+
+
+# ============================== Main Functions ==============================
+def score_file(
+    preprocessing_plan_filepath: str, model_filepath: str, parameters: Dict, drift_baseline: 'DriftSketch'=None
+) -> Tuple[Dict, Optional['DriftSketch']]:
+    """
+    Scores a raw CSV/Parquet file with the pickled preprocessing plan and the compiled or pickled model, writing the
+    same predictions as the `batch_scoring` pipeline. `parameters` hold the same options as its
+    `batch_scoring_options` (input and output files, chunk size, ID and target columns). Returns the number of rows
+    and chunks scored, and the drift sketch of the scored rows if a drift baseline is given.
+    """
+    # Imported here rather than at module level, to keep the import of the entry point itself instantaneous
+    from .pipelines.batch_scoring.nodes import score_in_chunks
+
+    with open(preprocessing_plan_filepath, 'rb') as f:
+        preprocessing_plan = pickle.load(f)
+    model = _load_model(model_filepath)
+    return score_in_chunks(preprocessing_plan, model, parameters, drift_baseline, _MONITORING_OPTIONS)
+
+
+def main(argv: List[str]=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Raw .csv or .parquet file to be scored")
+    parser.add_argument("output", help="Predictions file, appended chunk by chunk (.csv or .parquet)")
+    parser.add_argument("--preprocessing-plan", default="data/06_models/preprocessing_plan.pickle")
+    parser.add_argument("--model", default="data/06_models/compiled_model.npz", help="Compiled (.npz) or pickled model")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows held in memory at any one time")
+    parser.add_argument("--id-column", default="ID")
+    parser.add_argument("--target", default="LOAN_STATUS", help="Name of the predicted columns")
+    parser.add_argument("--drift-baseline", help="Pickled drift baseline to monitor the scored rows against")
+    parser.add_argument("--drift-report", help="PSI and KS of each monitored column (.csv), with --drift-baseline")
+    parser.add_argument("--drift-sketch", help="Pickled drift sketch of the scored rows, with --drift-baseline")
+    parser.add_argument("--verbose", action="store_true", help="Log the preprocessing and the progress of each chunk")
+    args = parser.parse_args(argv)
+    if (args.drift_report or args.drift_sketch) and not args.drift_baseline:
+        parser.error("--drift-report and --drift-sketch require --drift-baseline")
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+    start = time.perf_counter()
+    drift_baseline = None
+    if args.drift_baseline:
+        with open(args.drift_baseline, 'rb') as f:
+            drift_baseline = pickle.load(f)
+    scoring_options = {
+        'input_filepath': args.input,
+        'output_filepath': args.output,
+        'chunk_size': args.chunk_size,
+        'id_column': args.id_column,
+        'target': args.target,
+    }
+    summary, drift_sketch = score_file(args.preprocessing_plan, args.model, scoring_options, drift_baseline)
+    sys.stderr.write(f"Scored {summary['rows_scored']:,.0f} rows to {args.output} in {time.perf_counter() - start:.2f}s\n")
+    if drift_sketch is not None:
+        from .pipelines.monitoring.nodes import report_drift
+
+        sys.stderr.write(f"Largest PSI {summary['largest_psi']:.3f}, {summary['drifting_columns']:.0f} drifting columns\n")
+        if args.drift_report:
+            report_drift(drift_baseline, drift_sketch, _MONITORING_OPTIONS).to_csv(args.drift_report, index=False)
+        if args.drift_sketch:
+            with open(args.drift_sketch, 'wb') as f:
+                pickle.dump(drift_sketch, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Online scoring of loan applications with the fitted preprocessing plan and classifier_model"""
+
+from .batching import MicroBatcher
+from .record_encoder import RecordEncoder
+from .server import ScoringService
+
+__all__ = ["MicroBatcher", "RecordEncoder", "ScoringService"]
@@ -0,0 +1,162 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds of the histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+LATENCY_MS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+
+# ============================== Main Classes ==============================
+class Histogram:
+    """
+    Fixed-bucket histogram of observed values, reported with cumulative bucket counts as in Prometheus.
+
+    Attributes:
+        buckets (tuple): Sorted upper bounds of the buckets; larger values fall into an implicit '+Inf' bucket.
+        count (int): Number of observed values.
+        sum (float): Sum of the observed values.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float):
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative_counts, total = {}, 0
+        for bound, count in zip([*map(str, self.buckets), '+Inf'], self._counts):
+            total += count
+            cumulative_counts[bound] = total
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "buckets": cumulative_counts,
+        }
+
+
+class MicroBatcher:
+    """
+    Asyncio scheduler coalescing concurrent scoring requests into vectorised calls of `score_fn`, amortising the
+    fixed per-call overhead of the sklearn Pipeline and LightGBM across the requests.
+
+    Batches are dispatched one at a time: while one is being scored (in a worker thread, so that the event loop keeps
+    accepting requests), new requests queue up and form the next batch. Batch sizes therefore adapt to the load. A batch
+    only waits (at most `max_wait_ms`) for companions when the previous one had several records, so that an isolated
+    request under light load is scored immediately. When scoring a batch fails, its records are scored again one at a
+    time, so that an invalid record only fails its own request.
+
+    Attributes:
+        score_fn (Callable): Scores a list of records, returning one result per record in the same order.
+        max_batch_size (int): Maximum number of records per call of `score_fn`.
+        max_wait_ms (float): Maximum time a batch waits to fill up once its first request has arrived.
+    """
+
+    def __init__(self, score_fn: Callable[[List[Any]], List[Any]], max_batch_size: int=64, max_wait_ms: float=2.0):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_histogram = Histogram(LATENCY_MS_BUCKETS)
+        self.latency_histogram = Histogram(LATENCY_MS_BUCKETS)
+        self._queue: asyncio.Queue = None
+        self._worker: asyncio.Task = None
+        self._last_batch_size = 1
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+    async def score(self, record: Any) -> Any:
+        """
+        Queues one record and returns its result once the batch it was part of has been scored.
+        """
+        future = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        await self._queue.put((record, future, start))
+        result = await future
+        self.latency_histogram.observe((time.perf_counter() - start) * 1000)
+        return result
+
+    async def score_many(self, records: List[Any]) -> List[Any]:
+        return list(await asyncio.gather(*[self.score(record) for record in records]))
+
+    async def _collect_batch(self) -> list:
+        batch = [await self._queue.get()]
+        # Requests that queued up while the previous batch was being scored are taken without waiting
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if self._last_batch_size == 1 and len(batch) == 1:
+            return batch
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            self._last_batch_size = len(batch)
+            dispatched = time.perf_counter()
+            for _, _, start in batch:
+                self.queue_wait_histogram.observe((dispatched - start) * 1000)
+            self.batch_size_histogram.observe(len(batch))
+
+            records = [record for record, _, _ in batch]
+            try:
+                outcomes = [(result, None) for result in await loop.run_in_executor(None, self.score_fn, records)]
+            except Exception as e:
+                if len(batch) == 1:
+                    outcomes = [(None, e)]
+                else:
+                    # A single invalid record fails the whole call, so the records are scored again one at a time for
+                    # only the requests of the invalid ones to fail
+                    outcomes = await loop.run_in_executor(None, self._score_one_at_a_time, records)
+            for (_, future, _), (result, error) in zip(batch, outcomes):
+                if future.done():  # The caller may have been cancelled meanwhile
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def _score_one_at_a_time(self, records: List[Any]) -> List[Tuple[Any, Optional[Exception]]]:
+        outcomes = []
+        for record in records:
+            try:
+                outcomes.append((self.score_fn([record])[0], None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self.batch_size_histogram.to_dict(),
+            "queue_wait_ms": self.queue_wait_histogram.to_dict(),
+            "latency_ms": self.latency_histogram.to_dict(),
+        }
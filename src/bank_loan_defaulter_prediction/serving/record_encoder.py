@@ -0,0 +1,156 @@
+from functools import lru_cache
+from typing import Any, Dict, List
+
+import numpy as np
+
+from ..pipelines.data_processing.nodes import RATIO_FEATURES
+from ..pipelines.data_processing.preprocessing_plan import (
+    INITIAL_LIST_STATUS_LABELS,
+    PreprocessingPlan,
+    standardise_column_name,
+)
+from ..pipelines.data_science.classifier_model import ClassifierModel
+from ..pipelines.data_science.estimators import CategoryCodeEncoder
+
+# Records repeat the same keys, so their standardised names are memoised
+_standardise_key = lru_cache(maxsize=1024)(standardise_column_name)
+
+
+# ============================== Auxiliary Functions ==============================
+def _to_float(value: Any) -> float:
+    # Mirrors `pd.to_numeric(errors='coerce')`: anything that cannot be parsed becomes NaN
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _standardise_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    record = {_standardise_key(key): value for key, value in record.items()}
+    # The 'EMPLOYMENT_DURATION' field actually holds the home ownership (see `_standardise_column_names`)
+    record['HOME_OWNERSHIP'] = record.get('EMPLOYMENT_DURATION')
+    return record
+
+
+# ============================== Main Classes ==============================
+class RecordEncoder:
+    """
+    Encodes raw loan application records (dicts keyed by the raw column names of `train.csv`/`test.csv`) straight into
+    the feature matrix expected by the classifier, without going through pandas or the sklearn ColumnTransformer.
+    The preprocessing plan, feature engineering, scaler statistics and one-hot category indices (or category codes,
+    with 'native_categorical' preprocessing) are resolved into plain lookups once, at construction.
+
+    Attributes:
+        numeric_features (list): Numerical features, in the order of the fitted ColumnTransformer.
+        categorical_features (list): Categorical features, in the order of the fitted ColumnTransformer.
+        n_features (int): Number of columns of the encoded feature matrix.
+    """
+
+    def __init__(self, preprocessing_plan: PreprocessingPlan, classifier_model: ClassifierModel):
+        self.preprocessing_plan = preprocessing_plan
+        preprocessor = classifier_model.pipeline.named_steps['preprocessor']
+        transformers = {name: (transformer, columns) for name, transformer, columns in preprocessor.transformers_}
+        if set(transformers) - {'remainder'} != {'numeric', 'categorical'}:
+            raise ValueError(f"Unsupported preprocessor with transformers {sorted(transformers)}.")
+
+        # Numerical features are either standardised ('one_hot' preprocessing) or passed through ('native_categorical')
+        numeric_transformer, self.numeric_features = transformers['numeric']
+        scaler = getattr(numeric_transformer, 'named_steps', {}).get('scaler')
+        self._mean = np.zeros(len(self.numeric_features)) if getattr(scaler, 'mean_', None) is None else scaler.mean_
+        self._scale = np.ones(len(self.numeric_features)) if getattr(scaler, 'scale_', None) is None else scaler.scale_
+
+        categorical_transformer, self.categorical_features = transformers['categorical']
+        offset = len(self.numeric_features)
+        self._category_index: List[Dict[Any, int]] = []
+        if isinstance(categorical_transformer, CategoryCodeEncoder):
+            # One column per feature holding the category code
+            self._fill_value = None
+            self._category_codes = [{category: i for i, category in enumerate(x)} for x in categorical_transformer.categories_]
+            self.n_features = offset + len(self.categorical_features)
+        else:
+            # One column per category
+            self._fill_value = categorical_transformer.named_steps['imputer'].fill_value
+            self._category_codes = None
+            for categories in categorical_transformer.named_steps['onehot'].categories_:
+                self._category_index.append({category: offset + i for i, category in enumerate(categories)})
+                offset += len(categories)
+            self.n_features = offset
+
+        self._fitted_categories = {var: set(values) for var, values in preprocessing_plan.categories.items()}
+        self._base_numeric_features = sorted(
+            {x for x in self.numeric_features if x not in RATIO_FEATURES}
+            | {x for feature in self.numeric_features if feature in RATIO_FEATURES for x in RATIO_FEATURES[feature]}
+        )
+
+    def _normalise_loan_title(self, loan_title: Any) -> Any:
+        if not isinstance(loan_title, str):  # Non-string titles become NaN under `.str.upper()`
+            return None
+        loan_title = loan_title.upper().strip()
+        loan_title = self.preprocessing_plan.loan_title_lookup.get(loan_title, loan_title)
+        return loan_title if loan_title in self._fitted_categories['LOAN_TITLE'] else None
+
+    def _categorical_value(self, var: str, record: Dict[str, Any]) -> Any:
+        """
+        Value of a categorical feature after preprocessing and feature engineering, or None when it is missing.
+        """
+        if var == 'IS_CONSOLIDATION':
+            loan_title = self._normalise_loan_title(record.get('LOAN_TITLE'))
+            if loan_title is None:
+                # Same error as `flag_consolidation` in the batch pipeline
+                raise ValueError(f"Cannot flag the missing loan title {record.get('LOAN_TITLE')!r} as a consolidation.")
+            return int('CONSOLIDATION' in loan_title)
+        if var == 'LOAN_TITLE':
+            return self._normalise_loan_title(record.get(var))
+        value = record.get(var)
+        if _is_missing(value):
+            return None
+        if var == 'INITIAL_LIST_STATUS':
+            value = INITIAL_LIST_STATUS_LABELS.get(value, value)
+            return value if value in INITIAL_LIST_STATUS_LABELS.values() else None
+        if var in self._fitted_categories:
+            return value if value in self._fitted_categories[var] else None
+        return value
+
+    def encode(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Encodes a micro-batch of raw records into a dense feature matrix.
+        """
+        records = [_standardise_record(x) for x in records]
+        X = np.zeros((len(records), self.n_features))
+
+        # Numerical features: parsed, engineered and scaled column-wise
+        base_values = {
+            var: np.array([_to_float(x.get(var)) for x in records], dtype=np.float64) for var in self._base_numeric_features
+        }
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i, feature in enumerate(self.numeric_features):
+                if feature in RATIO_FEATURES:
+                    numerator, denominator = RATIO_FEATURES[feature]
+                    X[:, i] = base_values[numerator] / base_values[denominator]
+                else:
+                    X[:, i] = base_values[feature]
+        X[:, :len(self.numeric_features)] -= self._mean
+        X[:, :len(self.numeric_features)] /= self._scale
+
+        if self._category_codes is not None:
+            # Categorical features: category codes, with missing and unknown categories encoded as -1
+            offset = len(self.numeric_features)
+            for row, record in enumerate(records):
+                for i, (var, category_codes) in enumerate(zip(self.categorical_features, self._category_codes)):
+                    X[row, offset + i] = category_codes.get(self._categorical_value(var, record), -1)
+            return X
+
+        # Categorical features: one-hot encoded, with unknown categories left as all zeros
+        for row, record in enumerate(records):
+            for var, category_index in zip(self.categorical_features, self._category_index):
+                value = self._categorical_value(var, record)
+                column = category_index.get(self._fill_value if value is None else value)
+                if column is not None:
+                    X[row, column] = 1.0
+        return X
@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import json
+import logging
+import pickle
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+from ..pipelines.data_processing.preprocessing_plan import PreprocessingPlan
+from ..pipelines.data_science.classifier_model import ClassifierModel
+from .batching import MicroBatcher
+from .record_encoder import RecordEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class ScoringService:
+    """
+    Scores raw loan application records with the fitted preprocessing plan and classifier_model, both loaded once.
+
+    Attributes:
+        classifier_model (ClassifierModel): The fitted model, whose decision threshold labels the records.
+        encoder (RecordEncoder): Encoder of raw records into the classifier's feature matrix.
+        id_column (str): Field identifying each record in the responses.
+    """
+
+    def __init__(self, preprocessing_plan: PreprocessingPlan, classifier_model: ClassifierModel, id_column: str='ID'):
+        self.classifier_model = classifier_model
+        self.encoder = RecordEncoder(preprocessing_plan, classifier_model)
+        self.id_column = id_column
+        self._classifier = classifier_model.classifier
+
+    @classmethod
+    def from_filepaths(cls, preprocessing_plan_filepath: str, classifier_model_filepath: str, **kwargs) -> "ScoringService":
+        with open(preprocessing_plan_filepath, 'rb') as f:
+            preprocessing_plan = pickle.load(f)
+        with open(classifier_model_filepath, 'rb') as f:
+            classifier_model = pickle.load(f)
+        return cls(preprocessing_plan, classifier_model, **kwargs)
+
+    def score(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Scores a micro-batch of raw records in one vectorised call, returning their ID, probability and label.
+        """
+        if not records:
+            return []
+        X = self.encoder.encode(records)
+        booster = getattr(self._classifier, 'booster_', None)
+        if booster is not None:
+            # LightGBM: the booster skips the sklearn wrapper's per-call overhead, which dominates single-record latency
+            pred_proba = booster.predict(X)
+        else:
+            pred_proba = self._classifier.predict_proba(X)[:, 1]
+        # Labels as Python scalars of the classes' own type (e.g. int or str), which JSON serialises as they are
+        classes = self.classifier_model.classes_.tolist()
+        pred = [classes[i] for i in (pred_proba > self.classifier_model.threshold).astype(int)]
+        return [
+            {"id": record.get(self.id_column), "pred": label, "pred_proba": float(proba)}
+            for record, label, proba in zip(records, pred, pred_proba)
+        ]
+
+
+class _ScoringRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON endpoints:
+        GET  /health       -> {"status": "ok"}
+        GET  /metrics      -> queue depth, batch size and latency histograms of the micro-batcher
+        POST /score        -> one raw record in, one score out
+        POST /score/batch  -> a list of raw records in, a list of scores out
+    """
+    protocol_version = "HTTP/1.1"  # Keep-alive connections, avoiding a TCP handshake per application
+    disable_nagle_algorithm = True  # Otherwise the body, written after the headers, waits on the client's delayed ACK
+    service: ScoringService = None
+    batcher: MicroBatcher = None
+    batcher_loop: asyncio.AbstractEventLoop = None
+
+    def _send_json(self, status: int, body: Any):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _score(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.batcher is None:
+            return self.service.score(records)
+        # Records of concurrent requests are coalesced by the micro-batcher into shared model calls
+        return asyncio.run_coroutine_threadsafe(self.batcher.score_many(records), self.batcher_loop).result()
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {"status": "ok"})
+        elif self.path == '/metrics':
+            self._send_json(200, self.batcher.metrics() if self.batcher is not None else {})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        except json.JSONDecodeError as e:
+            self._send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+
+        try:
+            if self.path == '/score' and isinstance(payload, dict):
+                status, body = 200, self._score([payload])[0]
+            elif self.path == '/score/batch' and isinstance(payload, list) and all(isinstance(x, dict) for x in payload):
+                status, body = 200, self._score(payload)
+            elif self.path in ('/score', '/score/batch'):
+                status, body = 400, {"error": f"{self.path} expects {'a JSON object' if self.path == '/score' else 'a list of JSON objects'}"}
+            else:
+                status, body = 404, {"error": f"Unknown endpoint {self.path}"}
+        except (KeyError, TypeError, ValueError) as e:
+            # Raised by the encoder on records it cannot encode, e.g. a list where a category is expected
+            status, body = 400, {"error": f"Invalid record: {type(e).__name__}: {e}"}
+        except Exception as e:
+            logger.exception(f"Scoring failed on {self.path}")
+            status, body = 500, {"error": f"Scoring failed: {type(e).__name__}: {e}"}
+        self._send_json(status, body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def _start_batcher(service: ScoringService, max_batch_size: int, max_wait_ms: float) -> Dict[str, Any]:
+    """
+    Runs a micro-batcher around the service on an event loop in a background thread.
+    """
+    batcher = MicroBatcher(service.score, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name='MicroBatcher', daemon=True).start()
+    asyncio.run_coroutine_threadsafe(batcher.start(), loop).result()
+    return {"batcher": batcher, "batcher_loop": loop}
+
+
+def serve(
+    service: ScoringService, host: str='127.0.0.1', port: int=8080, max_batch_size: int=64, max_wait_ms: float=2.0
+):
+    """
+    Serves the scoring endpoints until interrupted. With `max_batch_size` above 1, records of concurrent requests are
+    scored together by a micro-batcher.
+    """
+    attributes = {"service": service}
+    if max_batch_size > 1:
+        attributes.update(_start_batcher(service, max_batch_size, max_wait_ms))
+    handler = type('ScoringRequestHandler', (_ScoringRequestHandler,), attributes)
+    with ThreadingHTTPServer((host, port), handler) as httpd:
+        httpd.daemon_threads = True
+        logger.info(f"Scoring service listening on http://{host}:{port}")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Online scoring service for loan applications.")
+    parser.add_argument("--preprocessing-plan", default="data/06_models/preprocessing_plan.pickle")
+    parser.add_argument("--classifier-model", default="data/06_models/classifier_model.pickle")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-size", type=int, default=64, help="1 scores each request on its own")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    serve(
+        ScoringService.from_filepaths(args.preprocessing_plan, args.classifier_model),
+        host=args.host, port=args.port, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms,
+    )
+
+
+if __name__ == "__main__":
+    main()
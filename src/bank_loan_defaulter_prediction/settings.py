@@ -9,11 +9,33 @@ https://docs.kedro.org/en/stable/kedro_project_setup/settings.html."""
 # Hooks are executed in a Last-In-First-Out (LIFO) order.
 # HOOKS = (ProjectHooks(),)
 
+import os  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+from bank_loan_defaulter_prediction.hooks import (  # noqa: E402
+    NodeCacheHooks,
+    ProfilingHooks,
+)
+
+# Nodes with unchanged inputs, parameters and source reuse their outputs from data/10_node_cache (see hooks.py), except
+# nodes reading or writing files themselves, whose inputs only hold the file paths
+# Every run writes a report of its nodes' time, memory and I/O to run_reports/, next to the session store; the call
+# stacks of the nodes listed in PROFILE_NODES (comma separated) are also sampled, e.g. PROFILE_NODES=train_model_node
+# ProfilingHooks is registered last so that it is called first, and its timings include the cache lookups
+HOOKS = (
+    NodeCacheHooks(
+        cache_dir=str(Path(__file__).parents[2] / "data" / "10_node_cache"), max_size_mb=2048,
+        exclude_nodes=["score_in_chunks_node"],
+    ),
+    ProfilingHooks(
+        report_dir=str(Path(__file__).parents[2] / "run_reports"),
+        profile_nodes=[x for x in os.environ.get("PROFILE_NODES", "").split(",") if x],
+    ),
+)
+
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
 
-from pathlib import Path  # noqa: E402
-
 from kedro_viz.integrations.kedro.sqlite_store import SQLiteStore  # noqa: E402
 
 # Class that manages storing KedroSession data.
@@ -37,6 +59,8 @@ CONFIG_LOADER_CLASS = OmegaConfigLoader
 CONFIG_LOADER_ARGS = {
       "base_env": "base",
       "default_run_env": "local",
+      # Concatenates lists, e.g. the catalog's column pruning of ${globals:features}
+      "custom_resolvers": {"merge_lists": lambda *lists: [x for values in lists for x in values]},
 #       "config_patterns": {
 #           "spark" : ["spark*/"],
 #           "parameters": ["parameters*", "parameters*/**", "**/parameters*"],
@@ -2,13 +2,14 @@ import os
 import sys
 from pathlib import Path
 
-import kaggle
 import pandas as pd
 
 sys.path.append(os.path.dirname(__file__))
 from conf import Config
 from py_logger import logger as _logger
 
+from bank_loan_defaulter_prediction.raw_data import read_raw_csv
+
 pd.set_option('display.width', None)
 pd.set_option('display.max_columns', None)
 
@@ -39,7 +40,8 @@ class DataLoader:
     def load(self):
         """
         Loads the training and test data from the download path. If the required files are not found,
-        it downloads the data first.
+        it downloads the data first. The CSV files are parsed with the raw schema, and later loaded from
+        the Parquet copies written next to them until they change.
 
         Returns:
             tuple: A tuple containing the training DataFrame and the test DataFrame.
@@ -52,8 +54,8 @@ class DataLoader:
             self.download_data()
 
         # Load the data
-        train_df = pd.read_csv(os.path.join(self.download_path, 'train.csv'))
-        test_df = pd.read_csv(os.path.join(self.download_path, 'test.csv'))
+        train_df = read_raw_csv(os.path.join(self.download_path, 'train.csv'))
+        test_df = read_raw_csv(os.path.join(self.download_path, 'test.csv'))
         
         return train_df, test_df
     
@@ -64,6 +66,9 @@ class DataLoader:
         Raises:
             ValueError: If neither competition_name nor dataset_name is provided.
         """
+        # Imported here, as importing kaggle authenticates against the API, which loading local files does not need
+        import kaggle
+
         if self.competition_name:
             kaggle.api.competition_download_files(self.competition_name, path=self.download_path)
         elif self.dataset_name:
@@ -0,0 +1,11 @@
+from bank_loan_defaulter_prediction.pipelines.batch_scoring.pipeline import (
+    create_pipeline,
+)
+
+
+def test_unmonitored_pipeline_needs_no_drift_baseline():
+    monitored, unmonitored = create_pipeline(), create_pipeline(monitored=False)
+
+    assert 'drift_baseline' in monitored.inputs()
+    assert 'drift_baseline' not in unmonitored.inputs()
+    assert unmonitored.outputs() == {'batch_scoring_summary'}
@@ -0,0 +1,83 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bank_loan_defaulter_prediction.pipelines.data_processing.compaction import (
+    compact_dataset,
+    infer_compact_dtypes,
+)
+
+
+@pytest.fixture
+def converted_df():
+    return pd.DataFrame({
+        'PUBLIC_RECORD': [0, 1, 2, 0, 1, 127],
+        'REVOLVING_BALANCE': [0, 1, 40_000, 5, 6, 7],
+        'LOAN_AMOUNT': [1000.0, 1500.5, np.nan, 2000.25, 3000.0, 4000.0],
+        'INTEREST_RATE': [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+        'BATCH_ENROLLED': ['BAT1', 'BAT1', 'BAT2', 'BAT1', 'BAT2', 'BAT1'],
+        'ID': ['1', '2', '3', '4', '5', '6'],
+        'GRADE': pd.Categorical(['A', 'B', 'A', 'C', 'B', 'A']),
+    })
+
+
+def test_infers_smallest_dtypes(converted_df):
+    assert infer_compact_dtypes(converted_df) == {
+        'PUBLIC_RECORD': 'int8',
+        'REVOLVING_BALANCE': 'int32',
+        'LOAN_AMOUNT': 'float32',  # Exactly represented, missing values included
+        'INTEREST_RATE': 'float64',  # Not exactly represented as float32
+        'BATCH_ENROLLED': 'category',
+        'ID': 'string[pyarrow]',  # One distinct value per row
+        'GRADE': 'category',
+    }
+
+
+def test_compaction_keeps_values_and_reports_memory(converted_df):
+    compacted_df, report = compact_dataset(converted_df.copy(), infer_compact_dtypes(converted_df), strict=True)
+
+    for col in converted_df.columns:
+        pd.testing.assert_series_equal(
+            compacted_df[col].astype(object), converted_df[col].astype(object), check_dtype=False
+        )
+    assert report.loc['PUBLIC_RECORD', 'dtype_before'] == 'int64'
+    assert report.loc['PUBLIC_RECORD', 'dtype_after'] == 'int8'
+    assert report.loc['TOTAL', 'memory_after_bytes'] < report.loc['TOTAL', 'memory_before_bytes']
+
+
+@pytest.mark.parametrize('values', [
+    [0, 1, 300],  # Out of the fitted range
+    [0.0, 1.5, 2.0],  # Fractional values in an integer column
+])
+def test_fitted_dataset_fails_loudly_on_changed_values(values):
+    batch_df = pd.DataFrame({'PUBLIC_RECORD': values})
+
+    with pytest.raises(ValueError, match='would change'):
+        compact_dataset(batch_df, {'PUBLIC_RECORD': 'int8'}, strict=True)
+
+
+@pytest.mark.parametrize('values, widened_dtype', [
+    ([0, 1, 300], 'int16'),
+    ([0.0, 1.5, 2.0], 'float32'),
+])
+def test_other_datasets_widen_columns_with_a_warning(values, widened_dtype, caplog):
+    batch_df = pd.DataFrame({'PUBLIC_RECORD': values})
+
+    with caplog.at_level(logging.WARNING):
+        compacted_df, _ = compact_dataset(batch_df.copy(), {'PUBLIC_RECORD': 'int8'}, strict=False)
+
+    assert str(compacted_df['PUBLIC_RECORD'].dtype) == widened_dtype
+    np.testing.assert_array_equal(compacted_df['PUBLIC_RECORD'].to_numpy(), np.asarray(values))
+    assert 'Widening it to' in caplog.text
+
+
+@pytest.mark.parametrize('strict', [True, False])
+def test_missing_values_in_integer_columns_are_kept_as_floats(strict):
+    batch_df = pd.DataFrame({'PUBLIC_RECORD': [0.0, np.nan, 2.0]})
+
+    compacted_df, _ = compact_dataset(batch_df.copy(), {'PUBLIC_RECORD': 'int8'}, strict=strict)
+
+    assert str(compacted_df['PUBLIC_RECORD'].dtype) == 'float32'
+    np.testing.assert_array_equal(compacted_df['PUBLIC_RECORD'].to_numpy(), batch_df['PUBLIC_RECORD'].to_numpy())
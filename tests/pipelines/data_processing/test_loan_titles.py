@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bank_loan_defaulter_prediction.pipelines.data_processing.loan_titles import (
+    flag_consolidation,
+    normalise_loan_titles,
+)
+from bank_loan_defaulter_prediction.pipelines.data_processing.preprocessing_plan import (
+    LOAN_TITLE_ALIASES,
+)
+
+
+@pytest.fixture
+def messy_titles():
+    # Case, whitespace and free-text variants of the aliases, as found in the raw column
+    rng = np.random.default_rng(0)
+    base_titles = list(LOAN_TITLE_ALIASES) + sorted(set(LOAN_TITLE_ALIASES.values()))
+    variants = []
+    for i, title in enumerate(base_titles):
+        variants += [title, title.lower(), title.title(), f"  {title} ", f"{title.lower()} {i}"]
+    return pd.Series(rng.choice(variants, size=2000), name='LOAN_TITLE')
+
+
+def _baseline(loan_titles: pd.Series, categories: list) -> tuple:
+    # Previous row-wise implementation from `_preprocess_categorical_variables` and `feature_engineering`
+    loan_titles = loan_titles.str.upper().str.strip().replace(LOAN_TITLE_ALIASES)
+    loan_titles = pd.Series(pd.Categorical(loan_titles, categories=categories), name='LOAN_TITLE')
+    return loan_titles, loan_titles.str.contains('CONSOLIDATION', case=False).astype(int)
+
+
+def test_matches_baseline_on_messy_titles(messy_titles):
+    categories = sorted(set(messy_titles.str.upper().str.strip().replace(LOAN_TITLE_ALIASES)))
+    expected_titles, expected_flags = _baseline(messy_titles, categories)
+
+    titles = normalise_loan_titles(messy_titles, LOAN_TITLE_ALIASES, categories)
+    flags = flag_consolidation(titles)
+
+    pd.testing.assert_series_equal(titles, expected_titles)
+    pd.testing.assert_series_equal(flags, expected_flags)
+    assert flags.dtype == np.int64
+
+
+def test_missing_titles_raise_like_baseline(messy_titles):
+    # Titles outside the vocabulary become missing, which the baseline could not cast to int
+    categories = sorted(set(messy_titles.str.upper().str.strip().replace(LOAN_TITLE_ALIASES)))[1:]
+    titles = normalise_loan_titles(messy_titles, LOAN_TITLE_ALIASES, categories)
+    assert titles.isna().any()
+
+    with pytest.raises(ValueError):
+        _baseline(messy_titles, categories)
+    with pytest.raises(ValueError, match='missing loan titles'):
+        flag_consolidation(titles)
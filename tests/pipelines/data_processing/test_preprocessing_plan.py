@@ -0,0 +1,100 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bank_loan_defaulter_prediction.pipelines.data_processing.preprocessing_plan import (
+    INITIAL_LIST_STATUS_LABELS,
+    LOAN_TITLE_ALIASES,
+    NUMERICAL_VARIABLES,
+    PreprocessingPlan,
+)
+
+
+def _raw_loans(
+    n_rows: int, grades: list, loan_titles: list, application_types: list, random_state: int
+) -> pd.DataFrame:
+    # Raw column names, e.g. 'Loan Amount' for 'LOAN_AMOUNT'
+    rng = np.random.default_rng(random_state)
+    data_df = pd.DataFrame({
+        'ID': np.arange(n_rows),
+        'Batch Enrolled': rng.choice(['BAT1', 'BAT2'], size=n_rows),
+        'Grade': rng.choice(grades, size=n_rows),
+        'Loan Title': rng.choice(loan_titles, size=n_rows),
+        'Initial List Status': rng.choice(['f', 'w'], size=n_rows),
+        'Application Type': rng.choice(application_types, size=n_rows),
+        'Employment Duration': rng.choice(['MORTGAGE', 'RENT', 'OWN'], size=n_rows),
+        'Home Ownership': rng.lognormal(11.2, 0.5, n_rows),
+    })
+    data_df['Sub Grade'] = data_df['Grade'] + rng.integers(1, 6, n_rows).astype(str)
+    for var in NUMERICAL_VARIABLES:
+        is_integer = var in ('LOAN_AMOUNT', 'TERM', 'OPEN_ACCOUNT')
+        values = rng.integers(0, 1000, n_rows) if is_integer else rng.uniform(0, 100, n_rows)
+        data_df[var.replace('_', ' ').title()] = values
+    return data_df
+
+
+def _baseline_preprocess_dataset(data_df: pd.DataFrame, reference_df: pd.DataFrame=None) -> pd.DataFrame:
+    # Previous per-call implementation, re-deriving the categories from the reference dataset on every call
+    data_df.columns = [re.sub(r'[\s-]+', '_', x).upper() for x in data_df.columns]
+    data_df['__HOME_OWNERSHIP__'] = data_df['HOME_OWNERSHIP']
+    data_df['HOME_OWNERSHIP'] = data_df['EMPLOYMENT_DURATION']
+    data_df = data_df.drop(columns=['EMPLOYMENT_DURATION'])
+
+    data_df['LOAN_TITLE'] = data_df['LOAN_TITLE'].str.upper().str.strip().replace(LOAN_TITLE_ALIASES)
+    if reference_df is None:
+        reference_df = data_df.copy()
+    data_df['ID'] = data_df['ID'].astype(str)
+    data_df['BATCH_ENROLLED'] = data_df['BATCH_ENROLLED'].astype(str)
+    data_df['GRADE'] = pd.Categorical(data_df['GRADE'], categories=sorted(set(reference_df['GRADE'])), ordered=True)
+    data_df['SUB_GRADE'] = pd.Categorical(
+        data_df['SUB_GRADE'], categories=sorted(set(reference_df['SUB_GRADE'])), ordered=True
+    )
+    data_df['LOAN_TITLE'] = pd.Categorical(data_df['LOAN_TITLE'], categories=sorted(set(reference_df['LOAN_TITLE'])))
+    data_df['INITIAL_LIST_STATUS'] = pd.Categorical(
+        data_df['INITIAL_LIST_STATUS'].replace(INITIAL_LIST_STATUS_LABELS), categories=['FORWARDED', 'WAITING']
+    )
+    data_df['APPLICATION_TYPE'] = pd.Categorical(
+        data_df['APPLICATION_TYPE'], categories=sorted(set(reference_df['APPLICATION_TYPE']))
+    )
+    for var in NUMERICAL_VARIABLES:
+        data_df[var] = pd.to_numeric(data_df[var], errors='coerce')
+    return data_df
+
+
+@pytest.fixture
+def train_df():
+    loan_titles = ['Debt consolidation', ' debt consolidation loan', 'CC', 'Credit Card', 'Home  ', 'home buying']
+    return _raw_loans(200, list('ABCD'), loan_titles, ['INDIVIDUAL'], random_state=0)
+
+
+@pytest.fixture
+def test_df():
+    # Grades, loan titles and application types unseen in training, and an unparseable numeric value
+    loan_titles = ['Debt Consolidation', 'cc', 'Wedding', 'Vacation loan']
+    test_df = _raw_loans(100, list('ABCEF'), loan_titles, ['INDIVIDUAL', 'JOINT'], random_state=1)
+    test_df['Loan Amount'] = test_df['Loan Amount'].astype(object)
+    test_df.loc[0, 'Loan Amount'] = 'n/a'
+    return test_df
+
+
+def test_convert_matches_baseline_on_train_split(train_df):
+    expected_df = _baseline_preprocess_dataset(train_df.copy())
+
+    plan = PreprocessingPlan.fit(train_df)
+    pd.testing.assert_frame_equal(plan.convert(train_df.copy()), expected_df)
+
+
+def test_convert_matches_baseline_on_test_split_with_unseen_categories(train_df, test_df):
+    reference_df = _baseline_preprocess_dataset(train_df.copy())
+    expected_df = _baseline_preprocess_dataset(test_df.copy(), reference_df)
+
+    plan = PreprocessingPlan.fit(train_df)
+    converted_df = plan.convert(test_df.copy())
+
+    pd.testing.assert_frame_equal(converted_df, expected_df)
+    for var in ['GRADE', 'SUB_GRADE', 'LOAN_TITLE', 'APPLICATION_TYPE']:
+        assert converted_df[var].isna().any()
+    assert np.isnan(converted_df.loc[0, 'LOAN_AMOUNT'])
+
@@ -0,0 +1,98 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from bank_loan_defaulter_prediction.pipelines.data_science.estimators import (
+    build_preprocessor,
+)
+from bank_loan_defaulter_prediction.pipelines.data_science.feature_matrix_cache import (
+    FeatureMatrixCache,
+)
+
+FEATURES = {'numeric': ['LOAN_AMOUNT', 'INTEREST_RATE'], 'categorical': ['GRADE']}
+
+
+@pytest.fixture
+def feature_cache(tmp_path):
+    return FeatureMatrixCache(cache_dir=str(tmp_path / 'feature_matrix_cache'))
+
+
+@pytest.fixture
+def data_df():
+    rng = np.random.default_rng(0)
+    n_rows = 200
+    return pd.DataFrame({
+        'LOAN_AMOUNT': rng.integers(1000, 35000, n_rows).astype(float),
+        'INTEREST_RATE': rng.uniform(5, 25, n_rows),
+        'GRADE': pd.Categorical(rng.choice(list('BCD'), n_rows), categories=list('BCD')),
+    })
+
+
+def _is_cached(X) -> bool:
+    # Dense matrices read back from the cache are memory-mapped, freshly encoded ones are not
+    return isinstance(X, np.memmap)
+
+
+def test_identical_fit_is_reused(feature_cache, data_df):
+    preprocessor = build_preprocessor(FEATURES, 'native_categorical')
+    _, X = feature_cache.fit_transform(preprocessor, data_df)
+    fitted_preprocessor, X_cached = feature_cache.fit_transform(preprocessor, data_df)
+
+    assert not _is_cached(X)
+    assert _is_cached(X_cached)
+    np.testing.assert_array_equal(X_cached, X)
+    assert _is_cached(feature_cache.transform(fitted_preprocessor, data_df))
+
+
+def test_changed_inputs_invalidate_the_cache(feature_cache, data_df):
+    preprocessor = build_preprocessor(FEATURES, 'native_categorical')
+    feature_cache.fit_transform(preprocessor, data_df)
+    changed_df = data_df.copy()
+    changed_df.loc[0, 'LOAN_AMOUNT'] += 1
+
+    _, X = feature_cache.fit_transform(preprocessor, changed_df)
+    assert not _is_cached(X)
+    assert X[0, 0] == changed_df.loc[0, 'LOAN_AMOUNT']
+
+
+def test_changed_preprocessing_invalidates_the_cache(feature_cache, data_df):
+    feature_cache.fit_transform(build_preprocessor(FEATURES, 'native_categorical'), data_df)
+
+    numeric_only = {'numeric': FEATURES['numeric'], 'categorical': []}
+    _, X = feature_cache.fit_transform(build_preprocessor(numeric_only, 'native_categorical'), data_df)
+    assert not _is_cached(X)
+    assert X.shape == (len(data_df), len(FEATURES['numeric']))
+
+
+def test_changed_preprocessing_plan_categories_invalidate_the_cache(feature_cache, data_df):
+    preprocessor = build_preprocessor(FEATURES, 'native_categorical')
+    _, X = feature_cache.fit_transform(preprocessor, data_df)
+    # Same values, but a refitted preprocessing plan learnt an extra category, which shifts the category codes
+    refitted_df = data_df.assign(GRADE=data_df['GRADE'].cat.set_categories(list('ABCD')))
+
+    _, X_refitted = feature_cache.fit_transform(preprocessor, refitted_df)
+    assert not _is_cached(X_refitted)
+    np.testing.assert_array_equal(X_refitted[:, -1], X[:, -1] + 1)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    # Room for two of the three matrices of 100,000 float32 values (about 0.4 MB each)
+    feature_cache = FeatureMatrixCache(cache_dir=str(tmp_path / 'feature_matrix_cache'), max_size_mb=1)
+    frames = [pd.DataFrame({'LOAN_AMOUNT': np.arange(100_000, dtype=float) + i}) for i in range(3)]
+    fitted_preprocessor, _ = feature_cache.fit_transform(StandardScaler(), frames[0])
+    feature_cache.transform(fitted_preprocessor, frames[1])
+
+    # Everything cached so far is older than the next accesses
+    now = time.time()
+    for entry in (tmp_path / 'feature_matrix_cache').iterdir():
+        os.utime(entry, (now - 100, now - 100))
+    assert feature_cache.load(fitted_preprocessor, frames[0]) is not None  # Marks the first matrix as recently used
+    feature_cache.transform(fitted_preprocessor, frames[2])
+
+    assert feature_cache.load(fitted_preprocessor, frames[0]) is not None
+    assert feature_cache.load(fitted_preprocessor, frames[1]) is None
+    assert feature_cache.load(fitted_preprocessor, frames[2]) is not None
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    average_precision_score,
+    confusion_matrix,
+    roc_auc_score,
+    roc_curve,
+)
+
+from bank_loan_defaulter_prediction.pipelines.data_science.metrics_engine import (
+    ClassificationReport,
+)
+
+THRESHOLDS = [0.0, 0.2, 0.3, 0.5, 0.7, 1.0]
+
+
+def _scores(kind: str) -> tuple:
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, 1000)
+    y_score = np.clip(0.3 * y_true + rng.uniform(0, 0.7, 1000), 0, 1)
+    if kind == 'ties':
+        # Scores on a coarse grid, so that most scores are shared by positives and negatives (thresholds included)
+        y_score = np.round(y_score, 1)
+    elif kind == 'constant':
+        y_score = np.full(1000, 0.5)
+    return y_true, y_score
+
+
+@pytest.mark.parametrize('kind', ['distinct', 'ties', 'constant'])
+def test_matches_sklearn(kind):
+    y_true, y_score = _scores(kind)
+    report = ClassificationReport.from_scores(y_true, y_score)
+
+    assert report.roc_auc == pytest.approx(roc_auc_score(y_true, y_score))
+    assert report.average_precision == pytest.approx(average_precision_score(y_true, y_score))
+    fpr, tpr, thresholds = roc_curve(y_true, y_score, drop_intermediate=False)
+    np.testing.assert_allclose(report.fpr, fpr)
+    np.testing.assert_allclose(report.tpr, tpr)
+    np.testing.assert_array_equal(report.cutoffs, thresholds[1:])
+    for threshold in THRESHOLDS:
+        expected = confusion_matrix(y_true, (y_score > threshold).astype(int), labels=[0, 1])
+        np.testing.assert_array_equal(report.confusion_matrix(threshold), expected)
+
+
+def test_matches_sklearn_with_other_labels():
+    y_true, y_score = _scores('ties')
+    labels = np.array(['N', 'Y'])[y_true]
+    report = ClassificationReport.from_scores(labels, y_score, pos_label='Y')
+
+    assert report.roc_auc == pytest.approx(roc_auc_score(labels, y_score))
+    assert report.average_precision == pytest.approx(average_precision_score(labels, y_score, pos_label='Y'))
+
+
+@pytest.mark.filterwarnings('ignore:No positive class found in y_true')
+@pytest.mark.parametrize('label', [0, 1])
+def test_single_class(label):
+    y_true, y_score = np.full(100, label), np.linspace(0, 1, 100)
+    report = ClassificationReport.from_scores(y_true, y_score)
+
+    # ROC AUC is undefined, as `roc_auc_score` reports it
+    with pytest.raises(ValueError, match='Only one class'):
+        _ = report.roc_auc
+    assert report.average_precision == pytest.approx(average_precision_score(y_true, y_score))
+    for threshold in THRESHOLDS:
+        expected = confusion_matrix(y_true, (y_score > threshold).astype(int), labels=[0, 1])
+        np.testing.assert_array_equal(report.confusion_matrix(threshold), expected)
@@ -0,0 +1,94 @@
+import lightgbm
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.pipeline import Pipeline
+
+from bank_loan_defaulter_prediction.pipelines.data_science.classifier_model import (
+    ClassifierModel,
+)
+from bank_loan_defaulter_prediction.pipelines.data_science.estimators import (
+    build_preprocessor,
+    categorical_fit_params,
+)
+from bank_loan_defaulter_prediction.pipelines.data_science.feature_matrix_cache import (
+    to_feature_matrix,
+)
+from bank_loan_defaulter_prediction.pipelines.data_science.model_compiler import (
+    compile_classifier_model,
+)
+
+FEATURES = {'numeric': ['LOAN_AMOUNT', 'INTEREST_RATE'], 'categorical': ['GRADE']}
+GRADES = list('ABCDEFG')
+# Largest difference allowed between the compiled and LightGBM probabilities, as `compiled_model.tolerance`
+TOLERANCE = 1e-6
+N_ESTIMATORS = 500
+
+
+def _loans(n_rows: int, random_state: int) -> pd.DataFrame:
+    rng = np.random.default_rng(random_state)
+    data_df = pd.DataFrame({
+        'LOAN_AMOUNT': rng.integers(1000, 35000, n_rows).astype(float),
+        'INTEREST_RATE': rng.uniform(5, 25, n_rows),
+        'GRADE': pd.Categorical(rng.choice(GRADES, n_rows), categories=GRADES),
+    })
+    # Grades default in no particular order, so that the trees split on sets of categories
+    default_rate = data_df['GRADE'].map(dict(zip(GRADES, [0.1, 0.6, 0.2, 0.7, 0.3, 0.1, 0.5]))).astype(float)
+    default_rate += (data_df['INTEREST_RATE'] - 15) / 50
+    data_df['LOAN_STATUS'] = (rng.uniform(size=n_rows) < default_rate).astype(int)
+    # Missing values in every feature
+    for col in ['LOAN_AMOUNT', 'INTEREST_RATE', 'GRADE']:
+        data_df.loc[rng.choice(n_rows, n_rows // 10, replace=False), col] = np.nan
+    return data_df
+
+
+@pytest.fixture(params=['one_hot', 'native_categorical'])
+def classifier_model(request):
+    preprocessing = request.param
+    train_df, valid_df = _loans(3000, random_state=0), _loans(1000, random_state=1)
+    input_features = FEATURES['numeric'] + FEATURES['categorical']
+    preprocessor = build_preprocessor(FEATURES, preprocessing).fit(train_df[input_features])
+    X_train, X_valid = (to_feature_matrix(preprocessor.transform(x[input_features])) for x in (train_df, valid_df))
+
+    # Deep trees and a high learning rate overfit quickly, so that early stopping keeps fewer trees than fitted
+    classifier = lightgbm.LGBMClassifier(
+        n_estimators=N_ESTIMATORS, learning_rate=0.3, num_leaves=63, min_child_samples=5, verbose=-1, random_state=0
+    )
+    classifier.fit(
+        X_train, train_df['LOAN_STATUS'].to_numpy(), eval_set=[(X_valid, valid_df['LOAN_STATUS'].to_numpy())],
+        callbacks=[lightgbm.early_stopping(10, verbose=False)],
+        **categorical_fit_params(classifier, FEATURES, preprocessing),
+    )
+    model_pipeline = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', classifier)])
+    return ClassifierModel(model_pipeline, input_features)
+
+
+@pytest.fixture
+def scoring_df():
+    scoring_df = _loans(2000, random_state=2)
+    # Unseen grades are scored as missing ones
+    scoring_df['GRADE'] = scoring_df['GRADE'].cat.add_categories(['H'])
+    scoring_df.loc[:49, 'GRADE'] = 'H'
+    return scoring_df
+
+
+def test_compiled_model_matches_lightgbm(classifier_model, scoring_df):
+    classifier = classifier_model.classifier
+    assert 0 < classifier.best_iteration_ < N_ESTIMATORS
+
+    compiled_model = compile_classifier_model(classifier_model)
+    expected = classifier.predict_proba(classifier_model.transform(scoring_df))[:, 1]
+
+    np.testing.assert_allclose(compiled_model.predict_proba(scoring_df)[:, 1], expected, rtol=0, atol=TOLERANCE)
+    # Plain column lists, as sent by the scoring workers, score alike
+    columns = {x: scoring_df[x].astype(object).where(scoring_df[x].notna(), None).tolist() for x in scoring_df}
+    np.testing.assert_allclose(compiled_model.predict_proba(columns)[:, 1], expected, rtol=0, atol=TOLERANCE)
+
+
+def test_compiled_model_uses_categorical_splits(classifier_model):
+    compiled_model = compile_classifier_model(classifier_model)
+    # The codes of 'native_categorical' are split on as sets of categories, the one-hot columns as numbers
+    has_categorical_splits = bool((compiled_model.arrays['categorical_split'] >= 0).any())
+    assert has_categorical_splits == (compiled_model.metadata['categorical_encoding'] == 'codes')
+    # Only the trees up to the best iteration are compiled
+    assert len(compiled_model.arrays['roots']) == classifier_model.classifier.best_iteration_
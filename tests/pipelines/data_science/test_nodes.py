@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bank_loan_defaulter_prediction.pipelines.data_science import nodes
+from bank_loan_defaulter_prediction.pipelines.data_science.feature_matrix_cache import (
+    FeatureMatrixCache,
+)
+
+# Interest rate above which applications tend to default in the synthetic data
+DEFAULT_INTEREST_RATE = 18
+
+
+@pytest.fixture
+def parameters(tmp_path):
+    return {
+        'id_column': 'ID',
+        'target': 'LOAN_STATUS',
+        'validation_size': 0.25,
+        'random_state': 42,
+        'preprocessing': 'one_hot',
+        'decision_threshold': 0.5,
+        'evaluation': {'costs': {'false_positive': 1.0, 'false_negative': 5.0}},
+        'scoring': {'n_workers': 1, 'batch_size': 1000},
+        'feature_cache': {'cache_dir': str(tmp_path / 'feature_matrix_cache')},
+        'features': {'numeric': ['LOAN_AMOUNT', 'INTEREST_RATE'], 'categorical': ['GRADE']},
+    }
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    n_rows = 200
+    interest_rate = rng.uniform(5, 25, n_rows)
+    return pd.DataFrame({
+        'ID': np.arange(n_rows),
+        'LOAN_AMOUNT': rng.integers(1000, 35000, n_rows).astype(float),
+        'INTEREST_RATE': interest_rate,
+        'GRADE': rng.choice(list('ABCD'), n_rows),
+        'LOAN_STATUS': (interest_rate + rng.normal(0, 5, n_rows) > DEFAULT_INTEREST_RATE).astype(int),
+    })
+
+
+def test_evaluate_model_reuses_training_feature_matrix(data, parameters, monkeypatch):
+    estimator_spec = {'class': 'sklearn.linear_model.LogisticRegression'}
+    data_split = nodes.split_data(data, parameters)
+    classifier_model = nodes.train_model(data, data_split, estimator_spec, parameters)
+
+    # The training matrix stored by `train_model` is found with the model's own preprocessor
+    input_features = classifier_model.input_features
+    feature_cache = FeatureMatrixCache(**parameters['feature_cache'])
+    assert feature_cache.load(classifier_model.preprocessor, data[input_features].iloc[data_split['Train']]) is not None
+
+    # Only the validation rows, never encoded before, are sent to the scorer
+    scored_rows = []
+    predict_scores = nodes.ParallelScorer.predict_scores
+
+    def _record_predict_scores(self, data_df):
+        scored_rows.append(len(data_df))
+        return predict_scores(self, data_df)
+
+    monkeypatch.setattr(nodes.ParallelScorer, 'predict_scores', _record_predict_scores)
+    _, train_df, validation_df, _ = nodes.evaluate_model(classifier_model, data, data_split, parameters)
+    assert scored_rows == [len(data_split['Validation'])]
+    np.testing.assert_allclose(
+        train_df['LOAN_STATUS_PRED_PROBA'],
+        classifier_model.predict_scores(data.iloc[data_split['Train']])[0],
+        rtol=1e-6,
+    )
+
+
+def test_evaluate_model_uses_persisted_threshold(data, parameters):
+    data_split = nodes.split_data(data, parameters)
+    classifier_model = nodes.train_model(
+        data, data_split, {'class': 'sklearn.linear_model.LogisticRegression'}, parameters
+    )
+
+    # Re-evaluating after the parameter changed still reports the metrics of the persisted threshold
+    metrics, _, validation_df, reports = nodes.evaluate_model(
+        classifier_model, data, data_split, {**parameters, 'decision_threshold': 0.9}
+    )
+    assert reports['Validation'].decision_threshold == classifier_model.threshold
+    assert metrics['(Validation) Accuracy'] == pytest.approx(
+        (validation_df['LOAN_STATUS_PRED'] == validation_df['LOAN_STATUS']).mean()
+    )
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bank_loan_defaulter_prediction.pipelines.model_selection import nodes
+
+
+@pytest.fixture
+def parameters(tmp_path):
+    return {
+        'target': 'LOAN_STATUS',
+        'random_state': 42,
+        'preprocessing': 'one_hot',
+        'feature_cache': {'cache_dir': str(tmp_path / 'feature_matrix_cache')},
+        'features': {'numeric': ['LOAN_AMOUNT', 'INTEREST_RATE'], 'categorical': ['GRADE']},
+    }
+
+
+@pytest.fixture
+def search_options():
+    return {
+        'time_budget_minutes': 60,
+        'n_candidates': 9,
+        'eta': 3,
+        'min_train_size': 10,
+        'selection_size': 0.2,
+        'n_jobs': 1,  # Candidates evaluated in-process, so that `_evaluate_candidate` can be patched
+        'candidates': {
+            'logistic_regression': {
+                'class': 'sklearn.linear_model.LogisticRegression',
+                'search_space': {'C': {'low': 0.0, 'high': 1.0}},
+            },
+        },
+    }
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    n_rows = 200
+    return pd.DataFrame({
+        'LOAN_AMOUNT': rng.integers(1000, 35000, n_rows).astype(float),
+        'INTEREST_RATE': rng.uniform(5, 25, n_rows),
+        'GRADE': rng.choice(list('ABCD'), n_rows),
+        'LOAN_STATUS': rng.integers(0, 2, n_rows),
+    })
+
+
+@pytest.fixture
+def data_split(data):
+    return {'Train': np.arange(len(data)), 'Validation': np.array([], dtype=int)}
+
+
+def test_successive_halving_keeps_top_fraction(data, data_split, parameters, search_options, monkeypatch):
+    def _score_by_c(estimator_spec, fit_data, fit_rows, selection_data, parameters):
+        # Known scores: the candidate's C
+        return estimator_spec['params']['C'], 0.0, None
+
+    monkeypatch.setattr(nodes, '_evaluate_candidate', _score_by_c)
+    best_spec, trials_df = nodes.search_hyperparameters(data, data_split, parameters, search_options)
+
+    rounds = [trials_df[trials_df['round'] == k] for k in range(trials_df['round'].max() + 1)]
+    assert [len(x) for x in rounds] == [9, 3, 1]
+    assert rounds[0]['train_rows'].iloc[0] == search_options['min_train_size']
+    assert rounds[1]['train_rows'].iloc[0] == search_options['min_train_size'] * search_options['eta']
+    for previous, current in zip(rounds, rounds[1:]):
+        kept = previous.nlargest(len(current), 'roc_auc')
+        assert sorted(current['params']) == sorted(kept['params'])
+    assert best_spec['params']['C'] == trials_df['roc_auc'].max()
+
+
+def test_raises_when_no_first_round_candidate_is_valid(data, data_split, parameters, search_options, monkeypatch):
+    def _fail(estimator_spec, fit_data, fit_rows, selection_data, parameters):
+        return np.nan, 0.0, 'ValueError: invalid hyperparameters'
+
+    monkeypatch.setattr(nodes, '_evaluate_candidate', _fail)
+    with pytest.raises(ValueError, match='first round'):
+        nodes.search_hyperparameters(data, data_split, parameters, search_options)
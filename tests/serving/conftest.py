@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from bank_loan_defaulter_prediction.pipelines.data_processing.nodes import (
+    feature_engineering,
+)
+from bank_loan_defaulter_prediction.pipelines.data_processing.preprocessing_plan import (
+    PreprocessingPlan,
+)
+from bank_loan_defaulter_prediction.pipelines.data_science.classifier_model import (
+    ClassifierModel,
+)
+from bank_loan_defaulter_prediction.pipelines.data_science.estimators import (
+    build_preprocessor,
+)
+from bank_loan_defaulter_prediction.pipelines.data_science.feature_matrix_cache import (
+    to_feature_matrix,
+)
+from bank_loan_defaulter_prediction.raw_data import RAW_SCHEMA
+
+FEATURES = {
+    'numeric': ['LOAN_AMOUNT', 'INTEREST_RATE', 'PUBLIC_RECORD', 'FUNDED_AMOUNT_TO_PRINCIPAL'],
+    'categorical': ['GRADE', 'HOME_OWNERSHIP', 'LOAN_TITLE', 'INITIAL_LIST_STATUS', 'IS_CONSOLIDATION'],
+}
+
+# Values of the raw string columns, with the case and spacing quirks of the raw loan titles
+STRING_VALUES = {
+    'Batch Enrolled': ['BAT1', 'BAT2'],
+    'Grade': list('ABC'),
+    'Sub Grade': ['A1', 'B2', 'C3'],
+    'Employment Duration': ['MORTGAGE', 'RENT', 'OWN'],
+    'Verification Status': ['Verified', 'Not Verified'],
+    'Payment Plan': ['n'],
+    'Loan Title': ['Debt consolidation', 'debt consolidation loan', ' CC ', 'Home improvement', 'Other'],
+    'Initial List Status': ['f', 'w'],
+    'Application Type': ['INDIVIDUAL', 'JOINT'],
+}
+
+
+def _raw_loans(n_rows: int, random_state: int) -> pd.DataFrame:
+    # Raw loan applications with the schema of the Kaggle files
+    rng = np.random.default_rng(random_state)
+    columns = {}
+    for column, dtype in RAW_SCHEMA.items():
+        if column in STRING_VALUES:
+            columns[column] = rng.choice(STRING_VALUES[column], n_rows)
+        elif dtype == pa.int64():
+            columns[column] = rng.integers(1, 100, n_rows)
+        else:
+            columns[column] = rng.uniform(1, 100, n_rows)
+    return pd.DataFrame(columns)
+
+
+@pytest.fixture
+def raw_train_df():
+    return _raw_loans(300, random_state=0)
+
+
+@pytest.fixture
+def raw_scoring_df():
+    raw_scoring_df = _raw_loans(50, random_state=1).astype({'Grade': object, 'Loan Amount': object})
+    # Unseen and missing categories, and missing and unparseable numbers
+    raw_scoring_df.loc[0, 'Grade'] = 'Z'
+    raw_scoring_df.loc[1, 'Grade'] = None
+    raw_scoring_df.loc[2, 'Initial List Status'] = None
+    raw_scoring_df.loc[3, 'Interest Rate'] = np.nan
+    raw_scoring_df.loc[4, 'Loan Amount'] = 'n/a'
+    return raw_scoring_df
+
+
+@pytest.fixture
+def scoring_records(raw_scoring_df):
+    # As received by the scoring service, i.e. parsed from JSON
+    return json.loads(raw_scoring_df.to_json(orient='records', double_precision=15))
+
+
+@pytest.fixture
+def preprocessing_plan(raw_train_df):
+    return PreprocessingPlan.fit(raw_train_df)
+
+
+@pytest.fixture
+def fit_classifier_model(raw_train_df, preprocessing_plan):
+    """
+    Fits a classifier_model on the feature engineered training dataset, as `train_model` does.
+    """
+    def _fit(preprocessing: str='one_hot', classes: tuple=(0, 1)) -> ClassifierModel:
+        train_df = feature_engineering(preprocessing_plan.transform(raw_train_df.copy()))
+        input_features = FEATURES['numeric'] + FEATURES['categorical']
+        preprocessor = build_preprocessor(FEATURES, preprocessing).fit(train_df[input_features])
+        X_train = to_feature_matrix(preprocessor.transform(train_df[input_features]))
+        y_train = np.asarray(classes)[(train_df['INTEREST_RATE'] > 50).astype(int)]
+        classifier = LogisticRegression().fit(X_train, y_train)
+        model_pipeline = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', classifier)])
+        return ClassifierModel(model_pipeline, input_features)
+
+    return _fit
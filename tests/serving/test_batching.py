@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+
+from bank_loan_defaulter_prediction.serving.batching import MicroBatcher
+
+# Bound on every test, so that a batch never flushed fails the test instead of hanging it
+TEST_TIMEOUT_S = 5
+
+
+class _RecordingScorer:
+    """
+    Doubles its records, recording every batch it was called with and failing batches holding a negative record.
+    """
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, records: list) -> list:
+        self.batches.append(list(records))
+        if any(record < 0 for record in records):
+            raise ValueError(f"Cannot score negative records in {records}.")
+        return [2 * record for record in records]
+
+
+def _run(batcher: MicroBatcher, scenario) -> object:
+    async def main():
+        await batcher.start()
+        try:
+            return await asyncio.wait_for(scenario(), TEST_TIMEOUT_S)
+        finally:
+            await batcher.stop()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def scorer():
+    return _RecordingScorer()
+
+
+def test_flushes_full_batches_without_waiting(scorer):
+    # A wait longer than the test timeout: only flushing on size lets the requests complete
+    batcher = MicroBatcher(scorer, max_batch_size=4, max_wait_ms=60_000)
+
+    results = _run(batcher, lambda: batcher.score_many(list(range(8))))
+
+    assert results == [2 * record for record in range(8)]
+    assert scorer.batches == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    assert batcher.metrics()['batch_size']['count'] == 2
+
+
+def test_flushes_partial_batch_on_timeout(scorer):
+    max_wait_ms = 100
+    batcher = MicroBatcher(scorer, max_batch_size=64, max_wait_ms=max_wait_ms)
+
+    async def scenario():
+        start = time.perf_counter()
+        first = asyncio.ensure_future(batcher.score_many([1, 2]))
+        # Arrives while the batch is waiting for companions, so joins it
+        await asyncio.sleep(max_wait_ms / 1000 / 4)
+        results = await asyncio.gather(first, batcher.score(3))
+        return results, time.perf_counter() - start
+
+    (first_results, last_result), elapsed = _run(batcher, scenario)
+
+    assert first_results == [2, 4]
+    assert last_result == 6
+    assert scorer.batches == [[1, 2, 3]]
+    # The batch was dispatched not full, once its wait was over
+    assert elapsed >= 0.9 * max_wait_ms / 1000
+
+
+def test_isolated_request_is_scored_without_waiting(scorer):
+    batcher = MicroBatcher(scorer, max_batch_size=64, max_wait_ms=60_000)
+
+    assert _run(batcher, lambda: batcher.score(5)) == 10
+    assert scorer.batches == [[5]]
+
+
+def test_failing_record_only_fails_its_own_request(scorer):
+    batcher = MicroBatcher(scorer, max_batch_size=4, max_wait_ms=60_000)
+
+    async def scenario():
+        return await asyncio.gather(*[batcher.score(record) for record in [1, -1, 3, 4]], return_exceptions=True)
+
+    results = _run(batcher, scenario)
+
+    assert results[0] == 2
+    assert isinstance(results[1], ValueError)
+    assert results[2:] == [6, 8]
+    # The failed batch is scored again one record at a time
+    assert scorer.batches == [[1, -1, 3, 4], [1], [-1], [3], [4]]
+    assert batcher.metrics()['batch_size']['count'] == 1
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from bank_loan_defaulter_prediction.pipelines.data_processing.nodes import (
+    feature_engineering,
+)
+from bank_loan_defaulter_prediction.serving.record_encoder import RecordEncoder
+
+
+@pytest.mark.parametrize('preprocessing', ['one_hot', 'native_categorical'])
+def test_matches_batch_pipeline(
+    preprocessing, preprocessing_plan, fit_classifier_model, raw_scoring_df, scoring_records
+):
+    classifier_model = fit_classifier_model(preprocessing)
+    encoder = RecordEncoder(preprocessing_plan, classifier_model)
+
+    # Batch pipeline: preprocessing plan, feature engineering and the fitted ColumnTransformer
+    features_df = feature_engineering(preprocessing_plan.transform(raw_scoring_df.copy()))
+    expected = classifier_model.transform(features_df)
+    expected = expected.toarray() if sparse.issparse(expected) else expected
+
+    # The batch pipeline encodes float32 matrices
+    np.testing.assert_allclose(encoder.encode(scoring_records), expected, rtol=1e-6, atol=1e-6)
+    # One record at a time, as scored online
+    np.testing.assert_allclose(encoder.encode(scoring_records[:1]), expected[:1], rtol=1e-6, atol=1e-6)
+
+
+def test_unseen_loan_title_raises_as_in_batch_pipeline(
+    preprocessing_plan, fit_classifier_model, raw_scoring_df, scoring_records
+):
+    encoder = RecordEncoder(preprocessing_plan, fit_classifier_model())
+    raw_scoring_df.loc[0, 'Loan Title'] = 'Wedding'
+
+    with pytest.raises(ValueError, match='missing loan title'):
+        feature_engineering(preprocessing_plan.transform(raw_scoring_df.copy()))
+    with pytest.raises(ValueError, match='missing loan title'):
+        encoder.encode([{**scoring_records[0], 'Loan Title': 'Wedding'}])
@@ -0,0 +1,17 @@
+import json
+
+import pytest
+
+from bank_loan_defaulter_prediction.serving.server import ScoringService
+
+
+@pytest.mark.parametrize('classes', [(0, 1), ('N', 'Y')])
+def test_labels_are_serialised_as_the_classes(classes, preprocessing_plan, fit_classifier_model, scoring_records):
+    service = ScoringService(preprocessing_plan, fit_classifier_model(classes=classes))
+
+    # The first records hold missing numbers, which the logistic regression cannot score
+    scores = service.score(scoring_records[5:])
+
+    assert {type(x['pred']) for x in scores} == {type(classes[0])}
+    assert {x['pred'] for x in scores} <= set(classes)
+    assert json.loads(json.dumps(scores)) == scores
@@ -0,0 +1,77 @@
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bank_loan_defaulter_prediction.drift import DriftSketch, drift_report
+
+# Floor of the bin proportions in the PSI
+PSI_EPSILON = 1e-4
+
+
+@pytest.fixture
+def baseline_df():
+    # Ten distinct numerical values, each a tenth of the rows, so that each decile holds exactly one of them
+    return pd.DataFrame({
+        'INTEREST_RATE': np.repeat(np.arange(10.0), 100),
+        'GRADE': np.tile(['A', 'B'], 500),
+    })
+
+
+def _psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    expected, actual = np.maximum(expected, PSI_EPSILON), np.maximum(actual, PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def test_merged_chunk_sketches_match_one_sketch_over_all_rows(baseline_df):
+    rng = np.random.default_rng(0)
+    data_df = pd.DataFrame({
+        'INTEREST_RATE': rng.normal(6, 3, 10_000),
+        'GRADE': rng.choice(['A', 'B', 'C', None], 10_000),
+    })
+    data_df.loc[rng.choice(10_000, 500, replace=False), 'INTEREST_RATE'] = np.nan
+    baseline = DriftSketch.fit(baseline_df, ['INTEREST_RATE'], ['GRADE'])
+
+    expected = baseline.empty_like().update(data_df)
+    chunks = [baseline.empty_like().update(data_df.iloc[i:i + 1500]) for i in range(0, len(data_df), 1500)]
+    merged = reduce(DriftSketch.merge, chunks)
+
+    for column in expected.columns:
+        np.testing.assert_array_equal(merged.counts[column], expected.counts[column])
+    pd.testing.assert_frame_equal(drift_report(baseline, merged), drift_report(baseline, expected))
+
+
+def test_merge_rejects_sketches_of_other_baselines(baseline_df):
+    baseline = DriftSketch.fit(baseline_df, ['INTEREST_RATE'], ['GRADE'])
+    shifted_df = baseline_df.assign(INTEREST_RATE=baseline_df['INTEREST_RATE'] * 2)
+    other = DriftSketch.fit(shifted_df, ['INTEREST_RATE'], ['GRADE'])
+
+    with pytest.raises(ValueError, match='same baseline bins'):
+        baseline.empty_like().merge(other.empty_like())
+
+
+def test_no_drift_on_the_baseline_distribution(baseline_df):
+    baseline = DriftSketch.fit(baseline_df, ['INTEREST_RATE'], ['GRADE'])
+    report_df = drift_report(baseline, baseline.empty_like().update(baseline_df)).set_index('column')
+
+    assert report_df['psi'].tolist() == [0.0, 0.0]
+    assert report_df.loc['INTEREST_RATE', 'ks'] == 0.0
+    assert not report_df['drift'].any()
+
+
+def test_psi_and_ks_of_known_shifts(baseline_df):
+    baseline = DriftSketch.fit(baseline_df, ['INTEREST_RATE'], ['GRADE'])
+    # Only the lower half of the numerical values, and only grade A
+    data_df = pd.DataFrame({'INTEREST_RATE': np.repeat(np.arange(5.0), 100), 'GRADE': ['A'] * 500})
+    report_df = drift_report(baseline, baseline.empty_like().update(data_df), psi_bins=10).set_index('column')
+
+    # Deciles: 10% each in the baseline, 20% in each of the lower five and none in the upper five
+    expected_psi = _psi(np.full(10, 0.1), np.array([0.2] * 5 + [0.0] * 5))
+    assert report_df.loc['INTEREST_RATE', 'psi'] == pytest.approx(expected_psi)
+    # The cumulative distributions differ the most at the median: 0.5 against 1
+    assert report_df.loc['INTEREST_RATE', 'ks'] == pytest.approx(0.5)
+    # Categories A and B (and empty unseen and missing buckets): 50/50 in the baseline, 100/0 in the data
+    assert report_df.loc['GRADE', 'psi'] == pytest.approx(_psi(np.array([0.5, 0.5]), np.array([1.0, 0.0])))
+    assert np.isnan(report_df.loc['GRADE', 'ks'])
+    assert report_df['drift'].all()
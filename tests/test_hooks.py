@@ -0,0 +1,135 @@
+import os
+import textwrap
+import uuid
+
+import numpy as np
+import pytest
+from kedro.pipeline import node
+
+from bank_loan_defaulter_prediction.hooks import NodeCacheHooks, _fingerprint_module
+
+
+@pytest.fixture
+def node_package(tmp_path, monkeypatch):
+    """
+    A package, importable under a unique name, whose node scales its input with a helper module and which holds a
+    module the node does not import.
+    """
+    name = f"node_package_{uuid.uuid4().hex}"
+    package_dir = tmp_path / name
+    package_dir.mkdir()
+    sources = {
+        '__init__.py': "",
+        'helpers.py': "def scale(x, factor):\n    return x * factor\n",
+        'nodes.py': """
+            from .helpers import scale
+
+            CALLS = []
+
+
+            def scale_node(x, options):
+                CALLS.append(len(x))
+                return scale(x, options['factor'])
+        """,
+        'unrelated.py': "VALUE = 1\n",
+    }
+    for filename, source in sources.items():
+        (package_dir / filename).write_text(textwrap.dedent(source))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    nodes = __import__(f"{name}.nodes", fromlist=['scale_node'])
+    _fingerprint_module.cache_clear()
+    yield package_dir, nodes
+    _fingerprint_module.cache_clear()
+
+
+def _edit(filepath, source):
+    filepath.write_text(filepath.read_text() + source)
+    # Source fingerprints are computed once per process
+    _fingerprint_module.cache_clear()
+
+
+def _run(hooks, scale_node, x, factor=2):
+    inputs = {'x': x, 'params:options': {'factor': factor}}
+    hooks.before_node_run(node=scale_node, inputs=inputs)
+    try:
+        return scale_node.func(*inputs.values())
+    finally:
+        hooks.after_node_run(node=scale_node)
+
+
+@pytest.fixture
+def scale_node(node_package):
+    _, nodes = node_package
+    return node(nodes.scale_node, inputs=['x', 'params:options'], outputs='y', name='scale_node')
+
+
+def test_identical_rerun_hits_cache(tmp_path, node_package, scale_node):
+    _, nodes = node_package
+    hooks = NodeCacheHooks(cache_dir=str(tmp_path / 'cache'))
+    x = np.arange(10)
+    first, second = _run(hooks, scale_node, x), _run(hooks, scale_node, x)
+    np.testing.assert_array_equal(first, x * 2)
+    np.testing.assert_array_equal(second, first)
+    assert nodes.CALLS == [10]
+    # The original node function is restored after each run
+    assert scale_node.func is nodes.scale_node
+
+
+@pytest.mark.parametrize('change', ['inputs', 'parameters'])
+def test_changed_inputs_or_parameters_miss_cache(tmp_path, node_package, scale_node, change):
+    _, nodes = node_package
+    hooks = NodeCacheHooks(cache_dir=str(tmp_path / 'cache'))
+    _run(hooks, scale_node, np.arange(10))
+    if change == 'inputs':
+        outputs = _run(hooks, scale_node, np.arange(11))
+        np.testing.assert_array_equal(outputs, np.arange(11) * 2)
+    else:
+        outputs = _run(hooks, scale_node, np.arange(10), factor=3)
+        np.testing.assert_array_equal(outputs, np.arange(10) * 3)
+    assert len(nodes.CALLS) == 2
+
+
+def test_source_change_of_imported_module_misses_cache(tmp_path, node_package, scale_node):
+    package_dir, nodes = node_package
+    hooks = NodeCacheHooks(cache_dir=str(tmp_path / 'cache'))
+    _run(hooks, scale_node, np.arange(10))
+    _edit(package_dir / 'helpers.py', "\n# Changed\n")
+    _run(hooks, scale_node, np.arange(10))
+    assert len(nodes.CALLS) == 2
+
+
+def test_source_change_of_unrelated_module_hits_cache(tmp_path, node_package, scale_node):
+    package_dir, nodes = node_package
+    hooks = NodeCacheHooks(cache_dir=str(tmp_path / 'cache'))
+    _run(hooks, scale_node, np.arange(10))
+    _edit(package_dir / 'unrelated.py', "VALUE = 2\n")
+    _run(hooks, scale_node, np.arange(10))
+    assert len(nodes.CALLS) == 1
+
+
+def test_excluded_nodes_are_never_cached(tmp_path, node_package, scale_node):
+    _, nodes = node_package
+    hooks = NodeCacheHooks(cache_dir=str(tmp_path / 'cache'), exclude_nodes=['scale_node'])
+    _run(hooks, scale_node, np.arange(10))
+    _run(hooks, scale_node, np.arange(10))
+    assert len(nodes.CALLS) == 2
+    assert not (tmp_path / 'cache').exists()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, node_package, scale_node):
+    # Each output takes about 0.8 MB, so two of them fit in the budget
+    hooks = NodeCacheHooks(cache_dir=str(tmp_path / 'cache'), max_size_mb=2)
+    x_a, x_b, x_c = (np.full(100_000, i, dtype=np.float64) for i in range(3))
+    paths = {}
+    for key, x in [('a', x_a), ('b', x_b)]:
+        _run(hooks, scale_node, x)
+        paths[key] = hooks._cache_path(scale_node, {'x': x, 'params:options': {'factor': 2}})
+    os.utime(paths['a'], (1_000, 1_000))
+    os.utime(paths['b'], (2_000, 2_000))
+
+    _run(hooks, scale_node, x_a)  # A hit marks 'a' as recently used, leaving 'b' the least recently used
+    _run(hooks, scale_node, x_c)
+    paths['c'] = hooks._cache_path(scale_node, {'x': x_c, 'params:options': {'factor': 2}})
+    assert paths['a'].exists()
+    assert not paths['b'].exists()
+    assert paths['c'].exists()
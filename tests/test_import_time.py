@@ -0,0 +1,78 @@
+"""Import-time budget of the fast-start scoring entry point (`bank_loan_defaulter_prediction.score`). Each probe is
+imported in a fresh interpreter under `python -X importtime`, and fails when its cumulative import time exceeds its
+budget or when it imports a module it must not (Kedro, sklearn, LightGBM, ...): the entry point itself only imports the
+standard library, and scoring with the compiled model only adds pandas, NumPy and the project's preprocessing.
+
+Budgets can be scaled on slower machines with the `IMPORT_TIME_BUDGET_SCALE` environment variable, e.g. 2.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_PATH = Path(__file__).parents[1] / "src"
+# Runs per probe, the fastest being kept
+N_REPEATS = 5
+
+# Imported by each probe, with its budget (ms) and the top-level packages it must not import
+PROBES = {
+    "entry point": {
+        "imports": ["bank_loan_defaulter_prediction.score"],
+        "budget_ms": 100,
+        "forbidden": ["pandas", "numpy", "pyarrow", "kedro", "sklearn", "lightgbm", "scipy", "kaggle"],
+    },
+    "compiled scoring": {
+        "imports": [
+            "bank_loan_defaulter_prediction.pipelines.batch_scoring.nodes",
+            "bank_loan_defaulter_prediction.pipelines.data_processing.preprocessing_plan",
+            "bank_loan_defaulter_prediction.compiled_model",
+        ],
+        "budget_ms": 1000,
+        "forbidden": ["kedro", "sklearn", "lightgbm", "scipy", "joblib", "kaggle"],
+    },
+}
+
+
+def _import_times(modules: list) -> dict:
+    """
+    Cumulative import time (us) and nesting depth of every module imported in a fresh interpreter, from
+    `-X importtime`. Modules already imported at interpreter startup are not reported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "; ".join(f"import {x}" for x in modules)],
+        capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join([str(SRC_PATH), os.environ.get("PYTHONPATH", "")])},
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two spaces per level
+        times[name.strip()] = (int(cumulative), (len(name) - len(name.lstrip()) - 1) // 2)
+    return times
+
+
+@pytest.mark.parametrize("probe", PROBES)
+def test_import_time_within_budget(probe):
+    spec = PROBES[probe]
+    # Modules of the interpreter startup (site, encodings, ...) are not charged to the probes
+    startup = set(_import_times([]))
+    runs = [
+        {name: x for name, x in _import_times(spec["imports"]).items() if name not in startup} for _ in range(N_REPEATS)
+    ]
+    totals = [sum(us for us, depth in x.values() if depth == 0) for x in runs]
+    times = runs[totals.index(min(totals))]
+
+    forbidden = sorted({name.split(".")[0] for name in times} & set(spec["forbidden"]))
+    assert not forbidden, f"{probe} imports forbidden packages: {', '.join(forbidden)}"
+
+    total_ms = min(totals) / 1000
+    budget_ms = spec["budget_ms"] * float(os.environ.get("IMPORT_TIME_BUDGET_SCALE", "1"))
+    slowest = sorted(((us, name) for name, (us, depth) in times.items() if depth == 0), reverse=True)[:10]
+    assert total_ms <= budget_ms, (
+        f"{probe} imports in {total_ms:.0f} ms, over its budget of {budget_ms:.0f} ms. Slowest top-level imports: "
+        + ", ".join(f"{name} ({us / 1000:.1f} ms)" for us, name in slowest)
+    )